@@ -0,0 +1,43 @@
+import streamlit as st
+
+from vocab_core import timing
+from vocab_core.assets import background_url
+
+
+# ----------------- Page Style -----------------
+#"C:\Users\Asus\PycharmProjects\My_German_Vocab_Game\German_Vocab_Game\images\moroccan-flower-dark.png"
+@timing.timed("set_background")
+def set_background(image_file):
+    """
+    Sets the page background. The image is served as a resized static file,
+    so only its URL (not megabytes of base64) is sent with every rerun.
+    """
+    url = background_url(image_file)
+    if url is None:
+        return
+    css = f"""
+    <style>
+    [data-testid="stAppViewContainer"] {{
+        background-image: url("{url}");
+        background-size: cover;
+        background-position: center;
+        background-repeat: no-repeat;
+    }}
+    </style>
+    """
+    st.markdown(css, unsafe_allow_html=True)
+
+def sidebar():
+    st.set_page_config(page_title="Game Panel", layout="wide")
+
+    sidebar_style = """
+    <style>
+    /* Sidebar background */
+    section[data-testid="stSidebar"] {
+        background-color: #000000;  /* Dark gray */
+        color: white;              /* Text color */
+    }
+    </style>
+    """
+
+    st.markdown(sidebar_style, unsafe_allow_html=True)
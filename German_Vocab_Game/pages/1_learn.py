@@ -1,19 +1,19 @@
 import streamlit as st
-import random
-import main_page as gs
-import pandas as pd
-gs.set_background("images\\learn_page_bg.jpg")
-gs.sidebar()
+import page_style
+from vocab_core import engine
+from vocab_core import library as gs
+from vocab_core import timing
+timing.begin_run("Learn")
+page_style.set_background("images\\learn_page_bg.jpg")
+page_style.sidebar()
 
 st.markdown("<h1 style='text-align: center; font-weight: bold;'>Learn New Vocabulary</h1>",unsafe_allow_html=True)
 
-# Load vocabulary files and filter out unwanted ones
-vocab_files = gs.load_vocab_files()
+# Load the vocabulary file list from the catalog (system and backup files are left out by type)
+vocab_files = gs.deck_files()
 
 print("vocab_files",vocab_files)
 
-vocab_files = [f for f in vocab_files if f['name'] not in ['diary_backup.csv', 'score_history.csv', 'achievements.csv']]
-
 # Display the available vocabulary files to the user
 st.write("\nAvailable vocabulary files to learn from:")
 file_options = []
@@ -21,66 +21,59 @@ file_options = []
 for i, file_info in enumerate(vocab_files, start=1):
     access = "Read-only"
     file_options.append(f"{file_info['name']} ({access})")
-    st.write(f"{i}. {file_info['name']} ({access})")
+    st.write(f"{i}. {file_info['name']} ({file_info['rows']} words, {access})")
 
 # Add a placeholder option at the top of the selectbox
 file_choice = st.selectbox("Select a file:", ["Select a file"] + file_options)
 
-# Check if the user has made a valid selection and load the vocab data
+# Check if the user has made a valid selection; the widgets are drawn from the catalog entry,
+# the deck itself is only loaded once there are words to show
 if file_choice != "Select a file":
     # Extract the file name and access level from the selected choice
     selected_name = file_choice.split(' (')[0]  # Extract just the file name
     selected_file_info = next(file_info for file_info in vocab_files if file_info["name"] == selected_name)
 
-    # Load the vocab data from the selected file
     vocab_path = selected_file_info['path']
-    vocab_data = gs.load_csv(vocab_path)
+    word_total = selected_file_info['rows']
 
-    # Check if the vocab data is empty
-    if not vocab_data.empty:
+    # Check if the vocab file is empty
+    if word_total:
         st.write(f"You selected: {file_choice}")
         options = ["Learn random words from a file", "Learn in order from a file", "Learn based on a word class"]
         selected_option = st.selectbox("Choose an option:", options)
 
         if selected_option == "Learn random words from a file":
-            word_num = st.slider("How many words would you like to learn?", min_value=0, max_value=vocab_data.shape[0], step=1)
-            selected_words = random.sample(range(vocab_data.shape[0]), word_num)
-            show = pd.DataFrame()
-            for i in selected_words:
-                show = pd.concat([show, vocab_data.iloc[[i]]], axis=0)
-            if show.shape[0] > 0:
+            word_num = st.slider("How many words would you like to learn?", min_value=0, max_value=word_total, step=1)
+            keep_mix = st.checkbox("Keep the word class mix of the file")
+            if word_num > 0:
+                show = engine.Deck(vocab_path).sample(word_num, stratify=keep_mix)  # Only read here, so the compact deck
                 st.dataframe(show)
 
         elif selected_option == "Learn in order from a file":
-            start = st.number_input(f"Enter the starting index from which you would like to learn from the selected file", min_value=0, max_value=vocab_data.shape[0]-1)
-            end = st.number_input(f"Enter the ending index up to which you would like to learn from the selected file", min_value=start, max_value=vocab_data.shape[0]-1)
-            ordered_data = vocab_data.iloc[start:end+1]
+            start = st.number_input(f"Enter the starting index from which you would like to learn from the selected file", min_value=0, max_value=word_total-1)
+            end = st.number_input(f"Enter the ending index up to which you would like to learn from the selected file", min_value=start, max_value=word_total-1)
+            ordered_data = engine.Deck(vocab_path).words(start, end+1)
             st.dataframe(ordered_data)
 
         elif selected_option == "Learn based on a word class":
-            # Define a list of possible word classes (these should match what's in your vocab_data)
-            word_classes = vocab_data['word_class'].dropna().str.strip().str.lower().unique().tolist()
+            # The word classes of the file and their sizes come from the catalog
+            class_counts = selected_file_info['word_classes']
 
             # Create a radio button to select a word class
-            word_class = st.radio("Select a word class:", word_classes)
-
-            # Filter the vocab_data based on the selected word class
-            filtered_vocab = vocab_data[vocab_data['word_class'] == word_class].reset_index(drop=True)
+            word_class = st.radio("Select a word class:", list(class_counts))
 
-            if filtered_vocab.empty:
+            if not class_counts.get(word_class):
                 st.warning(f"No words found for the class '{word_class}'. Please try another class.")
             else:
-                word_num = st.slider(f"How many words would you like to learn from the class '{word_class}'?",min_value=0, max_value=filtered_vocab.shape[0], step=1)
-                selected_words = random.sample(range(filtered_vocab.shape[0]), word_num)
-                show = pd.DataFrame()
+                word_num = st.slider(f"How many words would you like to learn from the class '{word_class}'?",min_value=0, max_value=class_counts[word_class], step=1)
 
-                for i in selected_words:
-                    show = pd.concat([show, filtered_vocab.iloc[[i]]], axis=0)
-
-                if show.shape[0] > 0:
+                if word_num > 0:
+                    show = engine.Deck(vocab_path).sample(word_num, word_class)
                     st.dataframe(show)
 
     else:
         st.write(f"No data available in the selected file: {file_choice}")
 else:
     st.write("Please select a file from the dropdown.")
+
+timing.end_run()
@@ -1,8 +1,16 @@
 import streamlit as st
-import main_page as gs
+import page_style
+from vocab_core import library as gs
+from vocab_core import timing
 import pandas as pd
-gs.set_background("images\diary_page_bg.jpg")
-gs.sidebar()
+from vocab_core.diary_store import diff_frames
+from vocab_core.schema import WORD_CLASSES, expand_deck
+from vocab_core.search_index import filter_rows
+timing.begin_run("Diary")
+page_style.set_background("images\diary_page_bg.jpg")
+page_style.sidebar()
+
+PAGE_SIZES = [25, 50, 100, 250]  # Rows per page offered by the diary editor
 st.markdown("<h1 style='text-align: center; font-weight: bold;'>📝 This is your personal Diary</h1>",unsafe_allow_html=True)
 
 # Load all vocab files
@@ -11,49 +19,150 @@ print(vocab_files)
 
 # Initialize paths and dataframes
 vocab_diary = None
-vocab_backup = None
 diary_path = None
-backup_path = None
 
-# Find paths for diary and backup
+# Find the diary (kept compact; only the visible page is expanded for editing)
 for f in vocab_files:
-    if f['name'] == 'diary.csv':
+    if f['editable']:
         diary_path = f['path']
-        vocab_diary = gs.load_csv(diary_path)
-    elif f['name'] == 'diary_backup.csv':
-        backup_path = f['path']
-        vocab_backup = gs.load_csv(backup_path)
+        vocab_diary = gs.load_csv(diary_path, compact=True)
 
 # Show warning if diary is not found
 if vocab_diary is None:
     st.warning("⚠️ 'diary.csv' not found.")
 else:
-    # Show editable diary
+    store = gs.diary_store(diary_path)
+    journal = store.journal
+
+    # Unsaved edits, per page: page key -> (rows as first shown, rows as last edited)
+    page_edits = st.session_state.setdefault("diary_page_edits", {})
+
+    def pending_changes():
+        changes = []
+        for original, edited in page_edits.values():
+            changes += diff_frames(original, edited, "english")
+        return changes
+
+    def discard_edits():
+        page_edits.clear()
+        st.session_state.diary_visit = st.session_state.get("diary_visit", 0) + 1
+
+    changes = pending_changes()
+
+    # Remember which version of the diary the pending edits are based on
+    if not changes:
+        st.session_state.diary_version = store.version()
+
+    # Search all decks and the diary
+    query = st.text_input("🔎 Search words (English or German, in all files)", key="word_search")
+    if query:
+        results = gs.search_vocab(query)
+        suggestions = gs.complete_word(query)
+        if suggestions:
+            st.caption("Suggestions: " + ", ".join(suggestions))
+        if results.empty:
+            st.info(f"No words found for '{query}'.")
+        else:
+            st.dataframe(results, use_container_width=True, hide_index=True)
+
+    # Show editable diary, one page at a time
     st.subheader("Editable Diary")
-    edited_diary = st.data_editor(
-        vocab_diary,
+    class_col, filter_col, size_col = st.columns([1, 2, 1])
+    with class_col:
+        classes = ["All"] + [c for c in WORD_CLASSES if (vocab_diary["word_class"] == c).any()]
+        word_class = st.selectbox("Word class", classes, key="diary_class")
+    with filter_col:
+        diary_filter = st.text_input("Filter (English or German)", key="diary_filter")
+    with size_col:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, index=1, key="diary_page_size")
+
+    positions = filter_rows(vocab_diary, None if word_class == "All" else word_class, diary_filter)
+    page_count = max(1, -(-len(positions) // page_size))
+    page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1,
+                           step=1, key="diary_page")
+    start = (page - 1) * page_size
+    st.caption(f"Showing rows {min(start + 1, len(positions))}-{min(start + page_size, len(positions))} "
+               f"of {len(positions)} (diary: {len(vocab_diary)} words)")
+
+    # A page is edited against a frozen copy: the rows as first shown, with this page's earlier
+    # edits on top. Each visit gets a fresh editor key so its widget state starts from that copy.
+    page_key = (word_class, diary_filter, page_size, int(page), None if changes else st.session_state.diary_version)
+    if st.session_state.get("diary_page_key") != page_key:
+        st.session_state.diary_page_key = page_key
+        st.session_state.diary_visit = st.session_state.get("diary_visit", 0) + 1
+        view_key = page_key[:4]
+        if view_key in page_edits:
+            st.session_state.diary_page_base = page_edits[view_key][1]
+        else:
+            st.session_state.diary_page_base = expand_deck(vocab_diary.iloc[positions[start:start + page_size]])
+    view_key = page_key[:4]
+
+    edited_page = st.data_editor(
+        st.session_state.diary_page_base,
         num_rows="dynamic",
         use_container_width=True,
-        key="diary_editor"
+        key=f"diary_editor_{st.session_state.diary_visit}"
     )
+    original_page = page_edits[view_key][0] if view_key in page_edits else st.session_state.diary_page_base
+    if diff_frames(original_page, edited_page, "english"):
+        page_edits[view_key] = (original_page, edited_page)
+    else:
+        page_edits.pop(view_key, None)
+    changes = pending_changes()
 
-    # Save button
-    if st.button("💾 Save Changes"):
-        # Backup current diary before saving new version
-        if backup_path:
-            gs.save_csv(vocab_diary, backup_path)
-            st.info("🔄 Backup saved to 'diary_backup.csv'")
-        else:
-            st.warning("⚠️ Could not save backup. 'diary_backup.csv' not found.")
+    if changes:
+        st.caption(f"✏️ {len(changes)} unsaved change(s) on {len(page_edits)} page(s).")
 
-        # Save updated diary
-        gs.save_csv(edited_diary, diary_path)
-        st.success("✅ Diary saved successfully!")
+    # Save button: only the rows that were added, changed or deleted are written (and journalled)
+    save_col, discard_col = st.columns(2)
+    with save_col:
+        if st.button("💾 Save Changes", disabled=not changes):
+            with timing.timer("save_diary"):
+                summary = store.apply(changes, expected_version=st.session_state.diary_version)
+            discard_edits()
+            if summary["merged"]:
+                st.info("ℹ️ The diary was changed in another session meanwhile; your changes were merged into it.")
+            st.success(f"✅ Diary saved successfully! ({summary['inserted']} added, "
+                       f"{summary['updated']} changed, {summary['deleted']} deleted)")
+    with discard_col:
+        if st.button("🗑️ Discard Changes", disabled=not changes):
+            discard_edits()
+            st.rerun()
 
-    # Undo button
-    if st.button("↩️ Undo Last Change"):
-        if vocab_backup is not None:
-            gs.save_csv(vocab_backup, diary_path)
-            st.success("✅ Reverted to last backup from 'diary_backup.csv'")
+    # Undo / Redo buttons, backed by the change journal
+    undo_col, redo_col = st.columns(2)
+    with undo_col:
+        if st.button("↩️ Undo Last Change", disabled=bool(changes) or not journal.can_undo()):
+            if journal.undo(store):
+                st.success("✅ Last change undone.")
+            else:
+                st.warning("⚠️ There is nothing to undo.")
+    with redo_col:
+        if st.button("↪️ Redo", disabled=bool(changes) or not journal.can_redo()):
+            if journal.redo(store):
+                st.success("✅ Change applied again.")
+            else:
+                st.warning("⚠️ There is nothing to redo.")
+
+    # Point-in-time restore
+    with st.expander("🕒 Change history"):
+        history = journal.history()
+        if history.empty:
+            st.info("No changes recorded yet.")
         else:
-            st.warning("⚠️ No backup found to revert.")
+            st.dataframe(history, use_container_width=True, hide_index=True)
+            restore_time = st.selectbox(
+                "Restore the diary as it was after:",
+                history["time"],
+                format_func=lambda t: t.strftime("%Y-%m-%d %H:%M:%S"),
+                index=len(history) - 1)
+            if st.button("Restore", disabled=bool(changes)):
+                # The shown time is rounded, so allow a millisecond to include the selected change itself
+                summary = journal.restore(store, restore_time.timestamp() + 0.001)
+                if summary is None:
+                    st.warning("⚠️ That point is older than the kept history.")
+                else:
+                    st.success(f"✅ Diary restored ({summary['inserted']} added, "
+                               f"{summary['updated']} changed, {summary['deleted']} deleted). You can undo this.")
+
+timing.end_run()
@@ -1,22 +1,28 @@
 import streamlit as st
-import main_page as gs
+import page_style
+from vocab_core import library as gs
+from vocab_core import timing
+from vocab_core.engine import Scores
+from vocab_core.score_stats import average_score
 import pandas as pd
 
-gs.set_background("images\\achieve_page_bg.jpg")
-gs.sidebar()
+timing.begin_run("Achievements")
+page_style.set_background("images\\achieve_page_bg.jpg")
+page_style.sidebar()
 
 st.title("Score & Achievements")
 
-# Load scores
-score_file = gs.load_csv(gs.VOCAB_FOLDER + "/score_history.csv", expected_columns=["Date", "ScorePercent", "TotalQuestions"])
+# Load the running score statistics (kept up to date by every logged score)
+scores = Scores(gs.VOCAB_FOLDER)
+stats = scores.stats()
 
-if score_file.empty:
+if stats["games"] == 0:
     st.info("No scores recorded yet.")
 else:
     # Stats
-    best_score = score_file["ScorePercent"].max()
-    avg_score = round(score_file["ScorePercent"].mean(), 1)
-    total_games = len(score_file)
+    best_score = stats["best"]
+    avg_score = average_score(stats)
+    total_games = stats["games"]
 
     #st.subheader("Statistics")
     st.write(f"🏆 Best Score: {best_score}%")
@@ -24,15 +30,21 @@ else:
     st.write(f"🎮 Total Games Played: {total_games}")
 
     # Example achievement: 5 full marks in a row
-    scores = score_file["ScorePercent"].tolist()
-    streak = 0
-    max_streak = 0
-    for s in scores:
-        if s == 100:
-            streak += 1
-            max_streak = max(max_streak, streak)
-        else:
-            streak = 0
-    st.write(f"🔥 Max Full Marks Streak: {max_streak}")
-    st.subheader("Score History")
-    st.dataframe(score_file)
\ No newline at end of file
+    st.write(f"🔥 Max Full Marks Streak: {stats['max_streak']}")
+
+    achievements = scores.achievements()
+    if not achievements.empty:
+        st.subheader("Achievements")
+        st.dataframe(achievements, hide_index=True)
+
+    st.subheader("Daily Progress")
+    daily = pd.DataFrame.from_dict(stats["days"], orient="index").sort_index(ascending=False)
+    daily["average"] = (daily["score_sum"] / daily["games"]).round(1)
+    st.dataframe(daily[["games", "average", "best"]])
+
+    # The full history is only read when asked for
+    if st.checkbox("Show full score history"):
+        st.subheader("Score History")
+        st.dataframe(scores.history())
+
+timing.end_run()
@@ -0,0 +1,77 @@
+import streamlit as st
+import page_style
+from vocab_core import timing
+from vocab_core.deck_cache import deck_cache
+
+timing.begin_run("Performance")
+page_style.set_background("images\\galaxy.jpg")
+page_style.sidebar()
+
+st.title("⏱️ Performance")
+
+
+def in_ms(frame):
+    """
+    Copy of a timing table with its seconds columns in milliseconds.
+    """
+    columns = [col for col in frame.columns if col not in ("name", "label", "run", "calls", "start")]
+    return frame.assign(**{col: (frame[col] * 1000).round(2) for col in columns})
+
+
+# Recording switch (off by default, or on from the start with VOCAB_TIMING=1)
+recording = st.toggle("Record timings", value=timing.enabled(),
+                      help="Times loading, saving, grading, sampling and page reruns. Costs nothing while off.")
+if recording != timing.enabled():
+    timing.enable(recording)
+if not recording:
+    st.info("Timing is off. Switch it on and use the other pages, then come back here.")
+
+runs = timing.runs()
+if runs.empty:
+    st.info("No page reruns recorded yet.")
+else:
+    # Per rerun breakdown: where the time of one run of a page went
+    st.subheader("Rerun breakdown (ms)")
+    labels = dict(zip(runs["run"], runs["label"]))
+    totals = dict(zip(runs["run"], runs["seconds"]))
+    run_id = st.selectbox("Rerun:", runs["run"],
+                          format_func=lambda r: f"#{r} {labels[r]} ({totals[r] * 1000:.1f} ms)")
+    parts = in_ms(timing.breakdown(run_id))
+    if parts.empty:
+        st.write("No timed calls in this rerun.")
+    else:
+        st.bar_chart(parts.set_index("name")["total"])
+        st.dataframe(parts, use_container_width=True, hide_index=True)
+    st.caption("The rest of a rerun goes to rendering and code that is not timed; nested calls overlap.")
+
+    # Percentiles of whole reruns, per page
+    st.subheader("Reruns per page (ms)")
+    st.dataframe(in_ms(timing.summary(runs.rename(columns={"label": "name"}))), use_container_width=True, hide_index=True)
+
+calls = timing.summary()
+if not calls.empty:
+    st.subheader("Timed calls (ms)")
+    st.dataframe(in_ms(calls), use_container_width=True, hide_index=True)
+
+    st.subheader("Slowest calls (ms)")
+    slowest = timing.slowest(20)
+    slowest.insert(1, "label", slowest["run"].map(dict(zip(runs["run"], runs["label"]))) if not runs.empty else None)
+    st.dataframe(in_ms(slowest.drop(columns="start")), use_container_width=True, hide_index=True)
+
+# cProfile of one rerun
+st.subheader("Profile")
+if st.button("🔬 Profile the next rerun", disabled=not recording):
+    timing.profile_next_run()
+    st.info("The next rerun of any page is profiled. Open the page you want to look at, then come back here.")
+profile = timing.last_profile()
+if profile is not None:
+    st.caption(f"Last profiled rerun: {profile['label']}")
+    st.code(profile["text"])
+    st.download_button("Download profile (.prof)", profile["data"], file_name="rerun.prof")
+
+st.caption(f"Deck cache: {deck_cache.stats()}")
+if st.button("🧹 Clear timings"):
+    timing.reset()
+    st.rerun()
+
+timing.end_run()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The tests import vocab_core the way the apps do, from German_Vocab_Game/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
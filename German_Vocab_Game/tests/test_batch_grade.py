@@ -0,0 +1,29 @@
+import json
+
+import pandas as pd
+
+from vocab_core.batch_grade import AnswerKey, grade_chunk, read_submissions
+
+DECK = pd.DataFrame({"english": ["house", "to go"], "german": ["Haus", "gehen"], "word_class": ["noun", "verb"],
+                     "article": ["das", None], "past_tense": [None, "ging"], "perfect_tense": [None, "ist gegangen"]})
+
+
+def test_json_values_that_are_not_objects_are_reported_as_invalid(tmp_path):
+    lines = [{"student": "anna", "answers": {"house": "Haus", "to go": {"german": "gehen", "tense": "ging"}}},
+             [], "x", {"student": "ben", "answers": ["Haus"]}]
+    path = tmp_path / "class.jsonl"
+    path.write_text("\n".join(json.dumps(line) for line in lines), encoding="utf-8")
+
+    submissions = list(read_submissions(str(path)))
+    results = grade_chunk(submissions, AnswerKey(DECK))
+    assert [r["student"] for r in results] == ["anna", "class.jsonl:2", "class.jsonl:3", "ben"]
+    assert [r["invalid"] for r in results] == ["", "not a JSON object", "not a JSON object", "answers is not a JSON object"]
+    assert results[0]["unknown_fields"] == "tense"
+    assert (results[0]["correct"], results[0]["total"]) == (2, 2)
+    assert [r["total"] for r in results[1:]] == [0, 0, 0]
+
+
+def test_a_json_file_that_is_not_an_object_is_invalid(tmp_path):
+    (tmp_path / "carl.json").write_text("[1, 2]", encoding="utf-8")
+
+    assert list(read_submissions(str(tmp_path))) == [{"student": "carl", "answers": {}, "invalid": "not a JSON object"}]
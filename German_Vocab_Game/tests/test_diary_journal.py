@@ -0,0 +1,114 @@
+import time
+
+import pandas as pd
+
+from vocab_core.diary_journal import DiaryJournal
+from vocab_core.diary_store import CsvDiaryStore, SqliteDiaryStore
+from vocab_core.library import load_csv, save_csv
+
+COLUMNS = ["word_class", "english", "article", "german", "past_tense", "perfect_tense", "plural"]
+START = [["noun", "house", "das", "Haus", "", "", "Häuser"],
+         ["verb", "to go", "", "gehen", "ging", "ist gegangen", ""]]
+
+
+def csv_store(tmp_path, **journal_options):
+    path = str(tmp_path / "diary.csv")
+    save_csv(pd.DataFrame(START, columns=COLUMNS), path)
+    return CsvDiaryStore(path, "english", load_csv, save_csv, DiaryJournal(path, "english", **journal_options))
+
+
+def sqlite_store(tmp_path):
+    tmp_path.mkdir()
+    path = str(tmp_path / "diary.sqlite")
+    store = SqliteDiaryStore(path, "english")
+    store.replace_all(pd.DataFrame(START, columns=COLUMNS))
+    store.journal = DiaryJournal(path, "english")
+    return store
+
+
+def rows(store):
+    return store.read_raw().fillna("").values.tolist()
+
+
+def edit(store, n):
+    # n small change sets: insert a word, then alternate updates and deletes
+    for i in range(n):
+        if i % 3 == 0:
+            store.apply([{"op": "insert", "row": dict(zip(COLUMNS, ["noun", f"word {i}", "der", f"Wort{i}", "", "", ""]))}])
+        elif i % 3 == 1:
+            store.apply([{"op": "update", "key": f"word {i - 1}", "fields": {"german": f"Wort{i}!"}}])
+        else:
+            store.apply([{"op": "delete", "key": "house" if i == 2 else f"word {i - 5}"}])
+
+
+def test_undo_redo_round_trip(tmp_path):
+    for store in (csv_store(tmp_path / "csv"), sqlite_store(tmp_path / "sqlite")):
+        states = [sorted(rows(store))]
+        for i in range(6):
+            edit_one = [{"op": "insert", "row": dict(zip(COLUMNS, ["noun", f"w{i}", "", f"W{i}", "", "", ""]))}]
+            if i % 2:
+                edit_one.append({"op": "update", "key": "to go", "fields": {"past_tense": f"ging{i}"}})
+            if i == 3:
+                edit_one.append({"op": "delete", "key": "house"})
+            store.apply(edit_one)
+            states.append(sorted(rows(store)))
+
+        # Undo everything, checking every state on the way back, then redo it all
+        # (rows an undo puts back are appended, so only the content is compared)
+        for expected in reversed(states[:-1]):
+            assert store.journal.undo(store) is not None
+            assert sorted(rows(store)) == expected
+        assert not store.journal.can_undo() and store.journal.undo(store) is None
+        for expected in states[1:]:
+            assert store.journal.redo(store) is not None
+            assert sorted(rows(store)) == expected
+        assert not store.journal.can_redo()
+
+
+def test_new_change_after_undo_drops_redo(tmp_path):
+    store = csv_store(tmp_path)
+    edit(store, 3)
+    store.journal.undo(store)
+    store.apply([{"op": "update", "key": "to go", "fields": {"plural": "-"}}])
+
+    assert not store.journal.can_redo()
+    assert store.journal.history()["entry"].tolist() == [1, 2, 3]
+    assert store.journal.history()["undone"].tolist() == [False, False, False]
+
+
+def test_restore_to_a_point_in_time_across_checkpoints(tmp_path):
+    store = csv_store(tmp_path, checkpoint_every=2)
+    moments = []
+    for i in range(7):
+        store.apply([{"op": "insert", "row": dict(zip(COLUMNS, ["noun", f"w{i}", "", f"W{i}", "", "", ""]))}])
+        time.sleep(0.01)
+        moments.append((time.time(), rows(store)))
+        time.sleep(0.01)
+
+    # Rows a restore or an undo puts back are appended, so only the content is compared
+    for when, expected in [moments[0], moments[3], moments[4]]:
+        assert store.journal.restore(store, when) is not None
+        assert sorted(rows(store)) == sorted(expected)
+        # The restore is a change set of its own and can be undone
+        store.journal.undo(store)
+        assert sorted(rows(store)) == sorted(moments[-1][1])
+
+
+def test_restore_before_the_history_returns_none(tmp_path):
+    before = time.time() - 3600
+    store = csv_store(tmp_path)
+    edit(store, 2)
+
+    assert store.journal.restore(store, before) is None
+
+
+def test_rotation_keeps_undo_within_the_kept_history(tmp_path):
+    store = csv_store(tmp_path, checkpoint_every=2, keep_checkpoints=2)
+    edit(store, 9)
+
+    # Only the entries after the oldest kept checkpoint can be undone
+    undone = 0
+    while store.journal.undo(store) is not None:
+        undone += 1
+    assert 0 < undone < 9
+    assert store.journal.history()["undone"].all()
@@ -0,0 +1,67 @@
+import pandas as pd
+
+from vocab_core.diary_merge import bulk_upsert
+
+COLUMNS = ["english", "word_class", "german", "past_tense", "perfect_tense"]
+
+
+def diary():
+    return pd.DataFrame([
+        ["to go", "verb", "gehen", None, None],
+        ["house", "noun", "Haus", None, None],
+        ["to see", "verb", "sehen", "sah", "hat gesehen"],
+    ], columns=COLUMNS)
+
+
+def test_new_words_are_appended_and_empty_cells_filled():
+    batch = pd.DataFrame([
+        ["  To Go ", "verb", "gehen", "ging", "ist gegangen"],
+        ["tree", "noun", "Baum", None, None],
+    ], columns=COLUMNS)
+    merged, summary = bulk_upsert(diary(), batch, "english")
+
+    assert summary == {"inserted": 1, "updated": 1, "filled": 2}
+    assert list(merged.index) == [0, 1, 2, 3]
+    assert merged.loc[0, "english"] == "to go"  # The diary keeps its own spelling of the key
+    assert merged.loc[0, ["past_tense", "perfect_tense"]].tolist() == ["ging", "ist gegangen"]
+    assert merged.loc[3, ["english", "german"]].tolist() == ["tree", "Baum"]
+
+
+def test_filled_cells_are_never_overwritten():
+    batch = pd.DataFrame([["to see", "verb", "schauen", "schaute", ""]], columns=COLUMNS)
+    merged, summary = bulk_upsert(diary(), batch, "english")
+
+    assert summary == {"inserted": 0, "updated": 0, "filled": 0}
+    assert merged.loc[2].tolist() == ["to see", "verb", "sehen", "sah", "hat gesehen"]
+
+
+def test_rows_with_the_same_key_are_combined():
+    batch = pd.DataFrame([
+        ["tree", "noun", "Baum", None, None],
+        ["Tree", None, None, "x", None],
+        ["", "noun", "Leer", None, None],  # No key: ignored
+    ], columns=COLUMNS)
+    merged, summary = bulk_upsert(diary(), batch, "english")
+
+    assert summary["inserted"] == 1
+    assert merged.iloc[-1].tolist()[:4] == ["tree", "noun", "Baum", "x"]
+    assert "Leer" not in merged["german"].tolist()
+
+
+def test_insert_mask_limits_inserts_but_not_fills():
+    batch = pd.DataFrame([
+        ["tree", "noun", "Baum", None, None],
+        ["to go", "verb", None, "ging", None],
+    ], columns=COLUMNS)
+    merged, summary = bulk_upsert(diary(), batch, "english", fill_columns=["past_tense"], insert_mask=[False, False])
+
+    assert summary == {"inserted": 0, "updated": 1, "filled": 1}
+    assert len(merged) == 3
+    assert merged.loc[0, "past_tense"] == "ging"
+
+
+def test_empty_batch_leaves_the_diary_alone():
+    merged, summary = bulk_upsert(diary().set_index(pd.Index([5, 6, 7])), pd.DataFrame(columns=COLUMNS), "english")
+
+    assert summary == {"inserted": 0, "updated": 0, "filled": 0}
+    assert list(merged.index) == [0, 1, 2]
@@ -0,0 +1,71 @@
+import pandas as pd
+
+from vocab_core.diary_store import SqliteDiaryStore
+
+COLUMNS = ["word_class", "english", "german"]
+
+
+def new_store(tmp_path):
+    store = SqliteDiaryStore(str(tmp_path / "diary.sqlite"), "english")
+    store.replace_all(pd.DataFrame([
+        ["verb", "to go", "gehen"],
+        ["noun", "house", "Haus"],
+        ["noun", "tree", "Baum"],
+    ], columns=COLUMNS))
+    return store
+
+
+def test_row_level_changes(tmp_path):
+    store = new_store(tmp_path)
+    version = store.version()
+    summary = store.apply([
+        {"op": "insert", "row": {"word_class": "noun", "english": "dog", "german": "Hund"}},
+        {"op": "update", "key": "HOUSE ", "fields": {"german": "das Haus"}},
+        {"op": "delete", "key": "tree"},
+        {"op": "insert", "row": {"word_class": "verb", "english": "To Go", "german": "laufen"}},  # Key exists
+    ], expected_version=version)
+
+    assert {k: summary[k] for k in ("inserted", "updated", "deleted", "skipped")} == \
+        {"inserted": 1, "updated": 1, "deleted": 1, "skipped": 1}
+    assert summary["merged"] is False
+    assert summary["version"] == store.version() == version + 1
+    assert store.read_frame().values.tolist() == [
+        ["verb", "to go", "gehen"], ["noun", "house", "das Haus"], ["noun", "dog", "Hund"]]
+    assert store.get("Dog") == {"word_class": "noun", "english": "dog", "german": "Hund"}
+
+
+def test_stale_expected_version_merges_row_level(tmp_path):
+    store = new_store(tmp_path)
+    read_version = store.version()
+
+    # Another session changes the diary after we read it
+    other = SqliteDiaryStore(store.path)
+    other.apply([{"op": "delete", "key": "tree"}, {"op": "update", "key": "to go", "fields": {"german": "gehen!"}}])
+
+    summary = store.apply([
+        {"op": "update", "key": "tree", "fields": {"german": "der Baum"}},  # Gone: skipped
+        {"op": "update", "key": "house", "fields": {"german": "das Haus"}},
+    ], expected_version=read_version)
+
+    assert summary["merged"] is True
+    assert summary["updated"] == 1 and summary["skipped"] == 1
+    assert summary["version"] == read_version + 2
+    # Both sessions' changes survive
+    assert store.read_frame().values.tolist() == [["verb", "to go", "gehen!"], ["noun", "house", "das Haus"]]
+
+
+def test_new_columns_are_added(tmp_path):
+    store = new_store(tmp_path)
+    store.apply([{"op": "update", "key": "to go", "fields": {"past_tense": "ging"}}])
+
+    assert store.columns == COLUMNS + ["past_tense"]
+    assert SqliteDiaryStore(store.path).get("to go")["past_tense"] == "ging"
+    assert store.read_frame(["english", "past_tense"]).values.tolist()[0] == ["to go", "ging"]
+
+
+def test_empty_change_set_writes_nothing(tmp_path):
+    store = new_store(tmp_path)
+    version = store.version()
+
+    assert store.apply([])["version"] is None
+    assert store.version() == version
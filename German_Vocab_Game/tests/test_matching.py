@@ -0,0 +1,80 @@
+import random
+
+import pandas as pd
+
+from vocab_core.matching import ALMOST, CORRECT, WRONG, AnswerMatcher, bounded_levenshtein, default_matcher
+
+
+def levenshtein(a, b):
+    # Textbook dynamic programme, row by row
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def random_pairs(rng, count, max_length, alphabet="abcäöüß"):
+    for _ in range(count):
+        a = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        if rng.random() < 0.5:
+            # A few random edits of a, so small distances are common
+            b = list(a)
+            for _ in range(rng.randint(0, 3)):
+                position = rng.randint(0, len(b))
+                edit = rng.choice("ids")
+                if edit == "i":
+                    b.insert(position, rng.choice(alphabet))
+                elif b and position < len(b):
+                    if edit == "d":
+                        del b[position]
+                    else:
+                        b[position] = rng.choice(alphabet)
+            b = "".join(b)
+        else:
+            b = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, max_length)))
+        yield a, b
+
+
+def test_bounded_levenshtein_matches_brute_force():
+    rng = random.Random(0)
+    for a, b in random_pairs(rng, 5000, 12):
+        distance = levenshtein(a, b)
+        for k in range(5):
+            assert bounded_levenshtein(a, b, k) == min(distance, k + 1), (a, b, k)
+
+
+def test_bounded_levenshtein_on_words_longer_than_a_machine_word():
+    rng = random.Random(1)
+    for a, b in random_pairs(rng, 200, 150, alphabet="ab"):
+        distance = levenshtein(a, b)
+        for k in (0, 1, 3, 200):
+            assert bounded_levenshtein(a, b, k) == min(distance, k + 1), (a, b, k)
+
+
+def test_matcher_verdicts():
+    cases = [
+        ("Gehen", "gehen", CORRECT),
+        (" STRASSE ", "Straße", CORRECT),      # Casefolding: ß matches ss
+        ("Maedchen", "Mädchen", CORRECT),      # Transliterated umlaut
+        ("Madchen", "Mädchen", ALMOST),        # One edit
+        ("Mädchn", "Mädchen", ALMOST),
+        ("Madchn", "Mädchen", WRONG),          # Two edits
+        ("es", "er", WRONG),                   # Too short for a typo
+        ("", "Haus", WRONG),
+    ]
+    for given, expected, verdict in cases:
+        assert default_matcher.match(given, expected) == verdict, (given, expected)
+
+    given, expected, verdicts = zip(*cases)
+    assert default_matcher.match_series(pd.Series(given), pd.Series(expected)).tolist() == list(verdicts)
+
+
+def test_strict_matcher():
+    strict = AnswerMatcher(max_typos=0, transliterate=False)
+
+    assert strict.match("Maedchen", "Mädchen") == WRONG
+    assert strict.match("Mädchn", "Mädchen") == WRONG
+    assert strict.match("MÄDCHEN", "Mädchen") == CORRECT
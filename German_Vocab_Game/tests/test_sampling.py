@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+from vocab_core.sampling import sample_frame, sample_positions
+
+
+def labels(**counts):
+    return pd.Series([label for label, count in counts.items() for _ in range(count)])
+
+
+def test_strata_get_proportional_shares():
+    strata = labels(noun=50, verb=30, adjective=20)
+    positions = sample_positions(len(strata), 10, seed=1, strata=strata)
+
+    assert len(positions) == len(set(positions)) == 10
+    assert strata.iloc[positions].value_counts().to_dict() == {"noun": 5, "verb": 3, "adjective": 2}
+
+
+def test_remainders_go_to_the_largest_fractions():
+    strata = labels(noun=5, verb=3, adjective=2)
+    for k in range(1, 11):
+        shares = strata.iloc[sample_positions(10, k, seed=k, strata=strata)].value_counts()
+        exact = k * strata.value_counts() / 10
+        assert shares.sum() == k
+        # Every stratum gets its share rounded down or up, never further off
+        assert ((shares.reindex(exact.index, fill_value=0) - exact).abs() < 1).all()
+
+
+def test_missing_labels_form_their_own_stratum():
+    strata = pd.Series(["noun"] * 6 + [None] * 4)
+    positions = sample_positions(10, 5, seed=3, strata=strata)
+
+    assert strata.iloc[positions].isna().sum() == 2
+
+
+def test_every_row_once_when_k_is_at_least_n():
+    strata = labels(noun=3, verb=2)
+    positions = sample_positions(5, 50, seed=0, strata=strata)
+
+    assert sorted(positions) == [0, 1, 2, 3, 4]
+    assert sorted(sample_positions(5, 50, seed=0)) == [0, 1, 2, 3, 4]
+
+
+def test_with_replacement_k_may_exceed_n():
+    assert len(sample_positions(3, 10, replace=True, seed=0)) == 10
+    assert len(sample_positions(3, 10, replace=True, seed=0, strata=labels(a=2, b=1))) == 10
+
+
+def test_a_seed_repeats_the_draw():
+    strata = labels(noun=40, verb=60)
+    first = sample_positions(100, 20, seed=7, strata=strata)
+
+    assert np.array_equal(first, sample_positions(100, 20, seed=7, strata=strata))
+    assert len(sample_positions(0, 5, seed=7)) == 0
+
+
+def test_sample_frame_keeps_the_column_mix():
+    df = pd.DataFrame({"word_class": labels(noun=30, verb=10), "english": [f"w{i}" for i in range(40)]})
+    sample = sample_frame(df, 8, seed=2, stratify_by="word_class")
+
+    assert sample["word_class"].value_counts().to_dict() == {"noun": 6, "verb": 2}
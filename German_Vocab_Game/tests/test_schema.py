@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from vocab_core import schema
+from vocab_core.schema import split_tenses
+
+CASES = [
+    ("['ging', 'ist gegangen']", "ging", "ist gegangen"),
+    ("['aß', 'hat gegessen']", "aß", "hat gegessen"),
+    ("[\"fror\", 'ist gefroren']", "fror", "ist gefroren"),
+    ("[\"dacht'\", \"hat's gedacht\"]", "dacht'", "hat's gedacht"),
+    ("  [ 'brachte' ,'hat gebracht' ] ", "brachte", "hat gebracht"),
+    ("['wusste', None]", "wusste", None),
+    ("[None, 'ist gewesen']", None, "ist gewesen"),
+    ("['war']", "war", None),
+    ("['', '']", None, None),
+    ("[]", None, None),
+    ("ging, gegangen", None, None),  # Not a list
+    ("", None, None),
+    (np.nan, None, None),
+    (["sang", "hat gesungen"], "sang", "hat gesungen"),  # Already a list
+]
+
+
+@pytest.fixture(params=["regex", "arrow"])
+def parser(request, monkeypatch):
+    if request.param == "arrow":
+        pytest.importorskip("pyarrow")
+    else:
+        monkeypatch.setattr(schema, "has_pyarrow", lambda: False)
+    return request.param
+
+
+def test_irregular_forms(parser):
+    values = pd.Series([value for value, _, _ in CASES], index=range(10, 10 + len(CASES)), dtype=object)
+    past, perfect = split_tenses(values)
+
+    assert past.name == "past_tense" and perfect.name == "perfect_tense"
+    assert list(past.index) == list(values.index)
+    for (value, expected_past, expected_perfect), got_past, got_perfect in zip(CASES, past, perfect):
+        assert (None if pd.isna(got_past) else got_past) == expected_past, value
+        assert (None if pd.isna(got_perfect) else got_perfect) == expected_perfect, value
+
+
+def test_both_engines_agree():
+    pytest.importorskip("pyarrow")
+    values = pd.Series([value for value, _, _ in CASES] * 50, dtype=object)
+    arrow = split_tenses(values)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(schema, "has_pyarrow", lambda: False)
+        regex = split_tenses(values)
+
+    for a, r in zip(arrow, regex):
+        pd.testing.assert_series_equal(a.fillna("<na>"), r.fillna("<na>"), check_dtype=False)
+
+
+def test_cached_decks_are_expanded_once_and_edits_stay_private(tmp_path, monkeypatch):
+    from vocab_core import library
+
+    path = str(tmp_path / "deck.csv")
+    library.save_csv(pd.DataFrame({"english": ["go", "eat"], "german": ["gehen", "essen"], "word_class": ["verb", "verb"]}), path)
+    first = library.load_csv(path)
+    monkeypatch.setattr(schema, "expand_deck", lambda df: pytest.fail("a cache hit expanded the deck again"))
+    first.loc[0, "german"] = "laufen"
+
+    again = library.load_csv(path)
+    assert again.loc[0, "german"] == "gehen"
+    assert library.load_csv(path, compact=True).loc[0, "german"] == "gehen"
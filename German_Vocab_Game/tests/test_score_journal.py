@@ -0,0 +1,125 @@
+import json
+import os
+import random
+import threading
+import time
+
+from vocab_core import score_journal
+from vocab_core.score_journal import ScoreJournal
+from vocab_core.score_stats import ScoreStats, add_score, stats_from_history
+
+
+def results(count, seed=0):
+    rng = random.Random(seed)
+    return [(rng.choice([40.0, 80.0, 100.0, 100.0]), rng.randint(5, 50),
+             f"2025-03-{1 + i * 28 // count:02d} 10:{i % 60:02d}:00") for i in range(count)]
+
+
+def comparable(stats):
+    # Sums built one score at a time may differ from pandas' sums in the last bits
+    stats = dict(stats, score_sum=round(stats["score_sum"], 6))
+    stats["days"] = {day: dict(values, score_sum=round(values["score_sum"], 6)) for day, values in stats["days"].items()}
+    stats.pop("snapshot")
+    return stats
+
+
+def assert_stats_match_history(journal):
+    assert comparable(journal.stats.load()) == comparable(stats_from_history(journal.read()))
+
+
+def test_append_many_then_compaction_matches_the_history(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_journal, "COMPACT_BYTES", 2048)
+    journal = ScoreJournal(str(tmp_path))
+
+    written = journal.append_many(results(300), wait=True)
+    assert len(written) == 300
+    # The journal was merged into the snapshot
+    assert not os.path.exists(journal.journal_path)
+    assert len(journal.read()) == 300
+    assert_stats_match_history(journal)
+
+    journal.append(100.0, 10)
+    journal.append_many(results(20, seed=1))  # Below the threshold: stays in the journal
+    history = journal.read()
+    assert len(history) == 321
+    assert history["ScorePercent"].iloc[300] == 100.0
+    assert journal.count_rows()[0] == 321
+    assert_stats_match_history(journal)
+
+
+def test_append_many_with_nothing_writes_nothing(tmp_path):
+    journal = ScoreJournal(str(tmp_path))
+
+    assert journal.append_many([]) == []
+    assert not os.path.exists(journal.journal_path)
+    assert journal.stats.load()["games"] == 0
+
+
+def test_stale_stats_are_rebuilt(tmp_path):
+    journal = ScoreJournal(str(tmp_path))
+    journal.append_many(results(10))
+
+    # A stats file that does not match the history, e.g. copied from another checkout
+    with open(journal.stats.path, "w", encoding="utf-8") as f:
+        json.dump({"games": 0, "score_sum": 0.0, "best": None, "current_streak": 0, "max_streak": 0, "days": {}}, f)
+    assert ScoreStats(str(tmp_path)).load()["games"] == 10
+    assert_stats_match_history(journal)
+
+
+def test_compaction_records_the_snapshot_so_loads_skip_it(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_journal, "COMPACT_BYTES", 2048)
+    journal = ScoreJournal(str(tmp_path))
+    journal.append_many(results(300), wait=True)
+
+    with open(journal.stats.path, encoding="utf-8") as f:
+        assert json.load(f)["snapshot"] == [os.path.getsize(journal.snapshot_path), 300]
+
+    counted = []
+    count_lines = score_journal._count_lines
+    monkeypatch.setattr(score_journal, "_count_lines", lambda path: counted.append(path) or count_lines(path))
+    for _ in range(3):
+        assert journal.stats.load()["games"] == 300
+    assert journal.snapshot_path not in counted
+
+
+def test_a_reader_during_an_append_does_not_rebuild(tmp_path, monkeypatch):
+    journal = ScoreJournal(str(tmp_path))
+    journal.append_many(results(5))
+    rebuilt = []
+    monkeypatch.setattr(ScoreStats, "rebuild", lambda self: rebuilt.append(self))
+
+    # The writer has written its line but not the stats yet when the reader comes in
+    loaded = []
+    reader = threading.Thread(target=lambda: loaded.append(ScoreStats(str(tmp_path)).load()))
+    with journal.lock():
+        with open(journal.journal_path, "a", encoding="utf-8") as f:
+            f.write("2025-03-30 10:00:00,100.0,5\n")
+        reader.start()
+        time.sleep(0.2)
+        assert not loaded  # Waiting for the writer
+        stats = journal.stats._read()
+        add_score(stats, "2025-03-30 10:00:00", 100.0)
+        journal.stats.save(stats)
+    reader.join()
+
+    assert loaded[0]["games"] == 6
+    assert not rebuilt
+
+
+def test_compaction_moves_a_csv_history_into_parquet(tmp_path, monkeypatch):
+    monkeypatch.setattr(score_journal, "COMPACT_BYTES", 2048)
+    legacy = score_journal.pd.DataFrame(
+        [(date, percent, total) for percent, total, date in results(50, seed=2)], columns=score_journal.SCORE_COLUMNS)
+    legacy.to_csv(tmp_path / score_journal.SCORE_FILE, index=False)
+    journal = ScoreJournal(str(tmp_path))
+    assert len(journal.read()) == 50
+
+    journal.append_many(results(100), wait=True)
+    assert journal.snapshot_path.endswith(score_journal.COLUMNAR_FILE)
+    assert os.path.exists(journal.csv_path + score_journal.MIGRATED_SUFFIX)
+    assert not os.path.exists(journal.csv_path)
+    history = journal.read()
+    assert len(history) == 150
+    assert history["ScorePercent"].head(50).tolist() == legacy["ScorePercent"].tolist()
+    assert journal.count_rows()[0] == 150
+    assert_stats_match_history(journal)
@@ -0,0 +1,4 @@
+"""
+Shared, UI-free helpers used by both the Streamlit pages and the console game.
+Nothing in this package imports streamlit or prints to the screen.
+"""
@@ -0,0 +1,77 @@
+import os
+import shutil
+import threading
+
+# ----------------- Constants -----------------
+STATIC_FOLDER = "static"           # Served by Streamlit at app/static/ (see .streamlit/config.toml)
+STATIC_URL = "app/static"          # URL prefix Streamlit uses for files in STATIC_FOLDER
+BACKGROUND_WIDTH = 1920            # Backgrounds are scaled down to at most this width (screen resolution)
+BACKGROUND_QUALITY = 70            # Compression quality for the re-encoded variants
+
+# Prepared variants: source path -> (source mtime, URL of the variant)
+_variants = {}
+_variants_lock = threading.Lock()
+
+
+def image_path(image_file):
+    """
+    Turns a path written with Windows backslashes (e.g. "images\\main_page_bg.jpg")
+    into one that works on every operating system.
+    """
+    return os.path.normpath(image_file.replace("\\", "/"))
+
+
+def background_url(image_file, width=BACKGROUND_WIDTH):
+    """
+    Returns the URL of a screen-sized, recompressed copy of image_file.
+    The copy is rendered into the static folder once and reused until the source image changes.
+    Returns None if the image does not exist.
+    """
+    source = image_path(image_file)
+    if not os.path.exists(source):
+        return None
+    mtime = os.stat(source).st_mtime_ns
+
+    with _variants_lock:
+        cached = _variants.get(source)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        file_name = _render_variant(source, width)
+        url = f"{STATIC_URL}/{file_name}"
+        _variants[source] = (mtime, url)
+    return url
+
+
+def _render_variant(source, width):
+    """
+    Writes the resized variant of source into STATIC_FOLDER and returns its file name.
+    Uses Pillow when it is installed; otherwise the original file is copied unchanged,
+    which still keeps it out of the page HTML.
+    """
+    os.makedirs(STATIC_FOLDER, exist_ok=True)
+    stem, ext = os.path.splitext(os.path.basename(source))
+
+    try:
+        from PIL import Image, features
+    except ImportError:
+        file_name = f"{stem}{ext}"
+        target = os.path.join(STATIC_FOLDER, file_name)
+        if not _is_fresh(target, source):
+            shutil.copyfile(source, target)
+        return file_name
+
+    fmt, ext = ("WEBP", ".webp") if features.check("webp") else ("JPEG", ".jpg")
+    file_name = f"{stem}_{width}{ext}"
+    target = os.path.join(STATIC_FOLDER, file_name)
+    if not _is_fresh(target, source):
+        with Image.open(source) as img:
+            img = img.convert("RGB")
+            if img.width > width:
+                img = img.resize((width, round(img.height * width / img.width)), Image.LANCZOS)
+            img.save(target, fmt, quality=BACKGROUND_QUALITY, optimize=True)
+    return file_name
+
+
+def _is_fresh(target, source):
+    # A variant is reusable if it was written after the source image last changed
+    return os.path.exists(target) and os.stat(target).st_mtime_ns >= os.stat(source).st_mtime_ns
@@ -0,0 +1,260 @@
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from vocab_core import library
+from vocab_core.grading import PLACEHOLDERS, grade_frames
+from vocab_core.normalize import normalize_series
+from vocab_core.schema import COLUMNS, KEY_COLUMN, expand_deck
+from vocab_core.score_journal import ScoreJournal
+from vocab_core.timing import timed
+
+# ----------------- Constants -----------------
+ANSWER_FIELDS = COLUMNS[2:]            # Deck columns a submission can answer (word_class and english are given)
+CHUNK_SIZE = 1000                      # Submissions graded together in one vectorized pass (one worker task)
+RESULTS_FILE = "grading_results.csv"   # Default output: one row per submission
+RESULT_COLUMNS = ["student", "score_percent", "correct", "almost", "total", "unknown", "unknown_fields", "invalid", "date"]
+
+# Submissions are JSON objects, one per line of a JSONL file or stream, or one per .json file:
+#   {"student": "anna", "date": "2025-03-01 09:00:00",
+#    "answers": {"house": "Haus", "to go": {"german": "gehen", "past_tense": "ging", "perfect_tense": "ist gegangen"}}}
+# A plain string answers the German word; an object answers the deck columns it names.
+# Columns a submission leaves out, or the deck leaves empty for the word, are not graded; column names
+# that are not deck columns are reported in unknown_fields. "date" is optional (default: now).
+# Valid JSON that is not an object, or answers that are not an object, are reported in invalid and graded as empty.
+
+
+# ----------------- Submissions -----------------
+def read_submissions(source):
+    """
+    Yields the submissions of source: a JSONL file, "-" for a JSONL stream on stdin, or a directory
+    of .json files (one submission each; the student defaults to the file name) and .jsonl files.
+    Submissions without a student are named after their file and line. JSON values that are not
+    objects are yielded as empty submissions with the reason in "invalid".
+    """
+    if source == "-":
+        yield from _read_lines(sys.stdin, "stdin")
+    elif os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            path = os.path.join(source, name)
+            if name.endswith(".jsonl"):
+                with open(path, encoding="utf-8") as f:
+                    yield from _read_lines(f, name)
+            elif name.endswith(".json"):
+                with open(path, encoding="utf-8") as f:
+                    yield _submission(json.load(f), os.path.splitext(name)[0])
+    else:
+        with open(source, encoding="utf-8") as f:
+            yield from _read_lines(f, os.path.basename(source))
+
+
+def _read_lines(lines, source):
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            submission = json.loads(line)
+        except ValueError as e:
+            raise ValueError(f"{source}, line {number}: {e}") from None
+        yield _submission(submission, f"{source}:{number}")
+
+
+def _submission(value, student):
+    # The submission of a parsed JSON value, named student unless it names itself
+    if not isinstance(value, dict):
+        return {"student": student, "answers": {}, "invalid": "not a JSON object"}
+    value.setdefault("student", student)
+    if not isinstance(value.get("answers") or {}, dict):
+        value["answers"], value["invalid"] = {}, "answers is not a JSON object"
+    return value
+
+
+def clean_answers(responses):
+    """
+    Prepares answer cells for grading the way the console reads typed answers (normalize_string and
+    check_char_input), then normalizes them like normalize_series: answers check_char_input would
+    reject (digits, symbols, blanks) and placeholders typed as answers count as no answer and are
+    graded wrong. Cells a submission left out become placeholders, which are not graded.
+    Many students give the same answers, so every distinct answer is cleaned once.
+    """
+    cleaned = {}
+    for col in responses.columns:
+        codes, uniques = pd.factorize(responses[col])
+        text = pd.Series(uniques, dtype=object).astype(str).str.normalize("NFC").str.strip()
+        valid = text.str.match(library.VALID_WORD.pattern) & ~text.isin(PLACEHOLDERS)
+        # Code -1 (left out) picks the trailing placeholder
+        values = np.append(text.str.casefold().where(valid, "").to_numpy(object), PLACEHOLDERS[0])
+        cleaned[col] = values[codes]
+    return pd.DataFrame(cleaned, index=responses.index)
+
+
+# ----------------- Grading -----------------
+class AnswerKey:
+    """
+    The answers of a deck (one row per word, the ANSWER_FIELDS columns, normalized once with
+    normalize_series), looked up by English word, normalized the same way. The first row of a word wins.
+    Fields the deck leaves empty (e.g. the article of a verb) are placeholders, so they are not graded.
+    """
+    def __init__(self, deck):
+        answers = expand_deck(deck).reset_index(drop=True).reindex(columns=ANSWER_FIELDS)
+        self.answers = pd.DataFrame({col: normalize_series(answers[col]).replace("", PLACEHOLDERS[0])
+                                     for col in ANSWER_FIELDS})
+        keys = normalize_series(deck[KEY_COLUMN]).reset_index(drop=True).drop_duplicates()
+        self.keys = pd.Index(keys.to_numpy())
+        self.positions = keys.index.to_numpy()
+
+    def lookup(self, words):
+        """
+        Row positions of the given English words, -1 for words that are not in the deck.
+        """
+        codes, uniques = pd.factorize(pd.Series(words, dtype=object))  # Each distinct word is normalized once
+        found = self.keys.get_indexer(normalize_series(pd.Series(uniques, dtype=object)))[codes]
+        return np.where(found >= 0, self.positions[found], -1)
+
+
+def grade_chunk(submissions, key):
+    """
+    Grades a list of submissions against an AnswerKey in one pass: every answered word of every
+    submission becomes one row of a single sheet, graded with grade_frames (umlaut spellings count
+    as correct, small typos as almost correct), then counted per submission.
+    Every word with something to grade counts as one question; words that are not in the deck are
+    counted as unknown, and answer fields that are not deck columns are listed in unknown_fields.
+    Submissions read as invalid (see read_submissions) have nothing to grade and keep their reason.
+    Returns one result per submission (see RESULT_COLUMNS).
+    """
+    owners, words, cells, unknown_fields = [], [], [], []
+    for owner, submission in enumerate(submissions):
+        ignored = set()
+        for word, answer in (submission.get("answers") or {}).items():
+            if isinstance(answer, dict):
+                ignored.update(field for field in answer if field not in ANSWER_FIELDS)
+            else:
+                answer = {"german": answer}
+            owners.append(owner)
+            words.append(word)
+            cells.append(answer)
+        unknown_fields.append(", ".join(sorted(ignored)))
+    owners = np.asarray(owners, dtype=np.intp)
+    positions = key.lookup(words)
+    known = positions >= 0
+
+    responses = pd.DataFrame.from_records(cells, columns=ANSWER_FIELDS)[known].reset_index(drop=True)
+    columns = [col for col in ANSWER_FIELDS if responses[col].notna().any()]  # Only what someone answered
+    responses = clean_answers(responses[columns])
+    answers = key.answers.iloc[positions[known]].reset_index(drop=True)
+    result = grade_frames(answers, responses, columns, normalized=True)
+
+    n = len(submissions)
+    asked = result.graded.any(axis=1).to_numpy()  # Words with at least one answer to grade
+    graded = owners[known][asked]
+    total = np.bincount(graded, minlength=n)
+    correct = np.bincount(graded, weights=result.row_correct.to_numpy()[asked], minlength=n).astype(int)
+    almost = np.bincount(graded, weights=result.row_almost.to_numpy()[asked], minlength=n).astype(int)
+    unknown = np.bincount(owners[~known], minlength=n)
+    return [{"student": str(submission.get("student", "")),
+             "score_percent": round(correct[i] / total[i] * 100, 1) if total[i] else 0,
+             "correct": int(correct[i]), "almost": int(almost[i]), "total": int(total[i]),
+             "unknown": int(unknown[i]), "unknown_fields": unknown_fields[i],
+             "invalid": submission.get("invalid", ""), "date": submission.get("date")}
+            for i, submission in enumerate(submissions)]
+
+
+_key = None  # AnswerKey of the deck, in each worker process
+
+
+def _start_worker(deck_path):
+    global _key
+    _key = AnswerKey(library.load_csv(deck_path, compact=True))
+
+
+def _grade_in_worker(submissions):
+    return grade_chunk(submissions, _key)
+
+
+def _chunks(submissions, size):
+    chunk = []
+    for submission in submissions:
+        chunk.append(submission)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+@timed("grade_submissions")
+def grade_submissions(deck_path, submissions, workers=None, chunk_size=CHUNK_SIZE):
+    """
+    Grades submissions (e.g. from read_submissions) against the deck at deck_path, chunk_size at a
+    time, spread over a pool of worker processes that each load the deck once (workers=None uses
+    every core). A single chunk, or workers=1, is graded in this process.
+    Returns one result per submission, in input order.
+    """
+    chunks = list(_chunks(submissions, chunk_size))
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        key = AnswerKey(library.load_csv(deck_path, compact=True))
+        return [result for chunk in chunks for result in grade_chunk(chunk, key)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker, initargs=(deck_path,)) as pool:
+        return [result for results in pool.map(_grade_in_worker, chunks) for result in results]
+
+
+# ----------------- Output -----------------
+def log_scores(results, folder=library.VOCAB_FOLDER):
+    """
+    Writes the score of every graded submission to the score history of folder in one append
+    (see ScoreJournal.append_many). Submissions with no known words are left out.
+    Returns the number of scores written.
+    """
+    entries = ScoreJournal(folder).append_many(
+        [(result["score_percent"], result["total"], result["date"]) for result in results if result["total"]],
+        wait=True)
+    return len(entries)
+
+
+def results_frame(results):
+    """
+    The results as a DataFrame (see RESULT_COLUMNS).
+    """
+    return pd.DataFrame(results, columns=RESULT_COLUMNS)
+
+
+if __name__ == "__main__":
+    # python -m vocab_core.batch_grade <deck file> <submissions.jsonl | folder | -> [--workers 8] [--out results.csv]
+    parser = argparse.ArgumentParser(prog="python -m vocab_core.batch_grade",
+                                     description="Grades many answer sheets against a deck and logs the scores.")
+    parser.add_argument("deck", help="deck file the answers are graded against")
+    parser.add_argument("submissions", help="JSONL file, folder of .json/.jsonl files, or - for JSONL on stdin")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="submissions per worker task")
+    parser.add_argument("--out", default=RESULTS_FILE, help="per-student results (CSV)")
+    parser.add_argument("--scores", default=library.VOCAB_FOLDER, help="folder of the score history to log to")
+    parser.add_argument("--no-history", action="store_true", help="do not log the scores to the score history")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.deck):
+        parser.error(f"deck not found: {args.deck}")
+    start = time.perf_counter()
+    try:
+        results = grade_submissions(args.deck, read_submissions(args.submissions), args.workers, args.chunk_size)
+    except (OSError, ValueError) as e:
+        parser.exit(1, f"Cannot read the submissions: {e}\n")
+    frame = results_frame(results)
+    frame.to_csv(args.out, index=False)
+    logged = 0 if args.no_history else log_scores(results, args.scores)
+    print(f"Graded {len(frame):,} submissions in {time.perf_counter() - start:.2f} s"
+          f" (mean score {frame['score_percent'].mean() if len(frame) else 0:.1f}%)")
+    print(f"Results written to {args.out}" + (f", {logged:,} scores logged to {args.scores}" if logged else ""))
+    flagged = int((frame["unknown_fields"] != "").sum())
+    if flagged:
+        print(f"{flagged:,} submissions answer fields that are not deck columns (see unknown_fields);"
+              f" the deck columns are {', '.join(ANSWER_FIELDS)}")
+    invalid = int((frame["invalid"] != "").sum())
+    if invalid:
+        print(f"{invalid:,} submissions could not be graded: not a JSON object, or answers that are not one (see invalid)")
@@ -0,0 +1,340 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.schema import COLUMNS
+from vocab_core.storage import write_table
+
+# ----------------- Constants -----------------
+DEFAULT_SIZES = [1_000, 10_000, 100_000]  # Deck sizes benchmarked by default (1_000_000 on request)
+REPEAT = 5                                # Timed runs per benchmark and size; the best one is compared
+TOLERANCE = 0.25                          # Slower than the baseline by more than 25% is a regression
+MIN_DELTA = 0.005                         # ...and by more than 5 ms (tiny timings are mostly noise)
+TEST_WORDS = 50                           # Words in one test sheet, as on the test page
+RESULTS_FILE = "benchmark_results.json"   # Default output of "run"
+
+# Word class mix of the synthetic decks, roughly that of german_words_1000.csv
+WORD_CLASS_MIX = {"noun": 0.45, "verb": 0.25, "adjective": 0.2, "adverb": 0.1}
+ARTICLES = ["der", "die", "das"]
+# Building blocks of the synthetic German words (with umlauts and ß) and their English glosses
+GERMAN_SYLLABLES = ["an", "bau", "ber", "blü", "dä", "fahr", "früh", "gar", "grö", "hau", "kü", "lauf",
+                    "mäd", "nacht", "ö", "rei", "schl", "stra", "süß", "tür", "über", "wald", "zeit", "zu"]
+ENGLISH_SYLLABLES = ["al", "bar", "cor", "dan", "el", "fin", "gor", "hal", "in", "jor", "kel", "lin",
+                     "mor", "nel", "or", "pel", "quin", "ros", "sel", "tor", "ul", "var", "wen", "yor"]
+
+
+# ----------------- Synthetic Decks -----------------
+def synthetic_deck(size, seed=0):
+    """
+    A canonical deck of size made-up words: WORD_CLASS_MIX of classes, German words with umlauts
+    and ß, articles and plurals for nouns, past and perfect tenses for verbs. English words are
+    unique, so the deck can also serve as a diary.
+    """
+    rng = np.random.default_rng(seed)
+    classes = rng.choice(list(WORD_CLASS_MIX), size=size, p=list(WORD_CLASS_MIX.values()))
+    stems = _words(rng, GERMAN_SYLLABLES, size)
+    english = _words(rng, ENGLISH_SYLLABLES, size) + pd.Series(_suffixes(size))
+
+    is_noun, is_verb = classes == "noun", classes == "verb"
+    german = stems.where(~is_noun, stems.str.capitalize()).where(~is_verb, stems + "en")
+    deck = pd.DataFrame({
+        "word_class": classes,
+        "english": english,
+        "article": pd.Series(rng.choice(ARTICLES, size=size)).where(is_noun),
+        "german": german,
+        "past_tense": (stems + "te").where(is_verb),
+        "perfect_tense": ("hat ge" + stems + "t").where(is_verb),
+        "plural": (german + "e").where(is_noun),
+    })
+    return deck[COLUMNS].astype(object)
+
+
+def _words(rng, syllables, size):
+    # Two or three syllables per word
+    parts = rng.choice(syllables, size=(size, 3))
+    words = pd.Series(parts[:, 0]) + pd.Series(parts[:, 1])
+    three = rng.random(size) < 0.5
+    return words.where(~three, words + pd.Series(parts[:, 2]))
+
+
+def _suffixes(size):
+    # Base-26 letter code of every row number, which makes the English words unique
+    letters = np.array(list("abcdefghijklmnopqrstuvwxyz"))
+    suffixes = np.full(size, "", dtype=object)
+    remaining = np.arange(size)
+    while True:
+        suffixes = letters[remaining % 26].astype(object) + suffixes
+        remaining = remaining // 26
+        if not remaining.any():
+            return suffixes
+
+
+def misspell(answers, share, seed=0):
+    """
+    Copy of a Series of answers where a share of them has a typo (last letter dropped)
+    and as many are plainly wrong, like the responses to a test sheet.
+    """
+    rng = np.random.default_rng(seed)
+    draw = rng.random(len(answers))
+    responses = answers.copy()
+    typo, wrong = draw < share, (draw >= share) & (draw < 2 * share)
+    responses[typo] = answers[typo].str[:-1]
+    responses[wrong] = "falsch"
+    return responses
+
+
+# ----------------- Benchmarks -----------------
+def benchmarks(folder, size):
+    """
+    The timed operations for one deck size, as (name, setup) pairs: setup() prepares the inputs
+    (not timed) and returns the function that is timed, or (function, reset) when every run
+    changes files that reset() puts back (not timed either). Names follow the entry points whose
+    data path they measure. Files are only written by the setups of the benchmarks that run.
+    """
+    from vocab_core import library, question_bank
+    from vocab_core.engine import Deck, TestSession, add_to_diary, plan_range
+    from vocab_core.grading import PLACEHOLDERS
+    from vocab_core.score_journal import SCORE_COLUMNS, SCORE_FILE, ScoreJournal
+    from vocab_core.score_stats import ScoreStats, stats_from_history
+
+    deck_path = os.path.join(folder, f"deck_{size}.csv")
+    prepared = {}
+
+    def synthetic():
+        # The deck, written to deck_path once for all benchmarks of this size
+        if "deck" not in prepared:
+            prepared["deck"] = synthetic_deck(size)
+            write_table(prepared["deck"], deck_path)
+        return prepared["deck"]
+
+    def load_csv_cold():
+        synthetic()
+
+        def run():
+            deck_cache.invalidate(deck_path)
+            library.load_csv(deck_path)
+        return run
+
+    def load_csv_cached():
+        synthetic()
+        library.load_csv(deck_path)
+        return lambda: library.load_csv(deck_path)
+
+    def save_csv():
+        deck = synthetic()
+        return lambda: library.save_csv(deck, deck_path)
+
+    def build_bank():
+        # What the first Test.test_random of a deck version expands into questions
+        deck = synthetic()
+        return lambda: question_bank.build_bank(deck)
+
+    def grade_sheet():
+        # Grading a sheet of every word with every answer filled in (the test page grades TEST_WORDS at a time)
+        synthetic()
+        plan = plan_range(Deck(deck_path), 0, size)
+        answers = plan.answer_sheet()
+        sheet = plan.question_sheet(answers)
+        responses = answers.where(sheet != PLACEHOLDERS[0], sheet)
+        responses = responses.assign(german=misspell(responses["german"].astype(object), 0.05))
+        return lambda: TestSession(plan).grade_sheet(answers, responses)
+
+    def add_from_test():
+        # Adding the correct answers of one test to a diary of this size through the diary store
+        # (merge, row-level write and journal entry); reset writes the diary back
+        deck = synthetic()
+        rng = np.random.default_rng(1)
+        known = deck.iloc[rng.choice(size, size=min(TEST_WORDS, size), replace=False)]
+        new = synthetic_deck(TEST_WORDS, seed=1).assign(english=lambda d: "new " + d["english"])
+        results = pd.concat([known, new], ignore_index=True)
+        batch = results[["english", "word_class", "german", "past_tense", "perfect_tense"]]
+
+        diary_path = os.path.join(folder, f"diary_{size}", library.DIARY_FILE)
+        os.makedirs(os.path.dirname(diary_path), exist_ok=True)
+
+        def run():
+            add_to_diary(diary_path, batch, diary=deck, fill_columns=["past_tense", "perfect_tense"])
+
+        def reset():
+            library.save_csv(deck, diary_path)
+
+        reset()
+        run()  # The first change set also writes the journal's base checkpoint, which a used diary already has
+        reset()
+        return run, reset
+
+    def scores():
+        # A score history with one entry per word of the deck, and its statistics
+        scores_folder = os.path.join(folder, f"scores_{size}")
+        if "scores" not in prepared:
+            os.makedirs(scores_folder, exist_ok=True)
+            rng = np.random.default_rng(2)
+            seconds = np.sort(rng.integers(0, 5 * 365 * 86400, size))
+            dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(seconds, unit="s")
+            history = pd.DataFrame({
+                "Date": dates.strftime("%Y-%m-%d %H:%M:%S"),
+                "ScorePercent": rng.choice([40.0, 60.0, 80.0, 100.0], size=size),
+                "TotalQuestions": rng.integers(5, 50, size),
+            }, columns=SCORE_COLUMNS)
+            history.to_csv(os.path.join(scores_folder, SCORE_FILE), index=False)
+            ScoreStats(scores_folder).rebuild()
+            prepared["scores"] = scores_folder
+        return prepared["scores"]
+
+    def log_score():
+        journal = ScoreJournal(scores())
+        return lambda: journal.append(80.0, TEST_WORDS)
+
+    def achievements():
+        # What the Achievements page reads, and the full rebuild from the history
+        stats = ScoreStats(scores())
+        return stats.load
+
+    def achievements_rebuild():
+        journal = ScoreJournal(scores())
+        return lambda: stats_from_history(journal.read())
+
+    return [(f.__name__, f) for f in (load_csv_cold, load_csv_cached, save_csv, build_bank, grade_sheet,
+                                      add_from_test, log_score, achievements, achievements_rebuild)]
+
+
+def time_call(func, repeat=REPEAT, reset=None):
+    """
+    Runs func repeat times and returns the wall-clock seconds of every run.
+    reset (if given) is called after every run, outside the timing.
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+        if reset is not None:
+            reset()
+    return runs
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeat=REPEAT, only=None, log=print):
+    """
+    Times every benchmark (or those named in only) at every deck size in a temporary folder.
+    Returns the results record: environment info plus one entry per benchmark and size
+    with the best, median and all run times in seconds.
+    """
+    results = []
+    with tempfile.TemporaryDirectory(prefix="vocab_bench_") as folder:
+        for size in sizes:
+            for name, setup in benchmarks(folder, size):
+                if only and name not in only:
+                    continue
+                timed = setup()
+                func, reset = timed if isinstance(timed, tuple) else (timed, None)
+                runs = time_call(func, repeat, reset)
+                results.append({"name": name, "size": size, "best": min(runs),
+                                "median": statistics.median(runs), "runs": runs})
+                if log:
+                    log(f"{name:<22} {size:>9,} words  best {_ms(min(runs)):>10}  median {_ms(statistics.median(runs)):>10}")
+            deck_cache.clear()
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.platform(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+# ----------------- Comparison -----------------
+def compare(baseline, current, tolerance=TOLERANCE, min_delta=MIN_DELTA):
+    """
+    Compares two results records benchmark by benchmark (best times, matched on name and size).
+    Returns a DataFrame with baseline, current, ratio and regression (slower than the baseline
+    by more than tolerance and by more than min_delta seconds).
+    """
+    def table(record):
+        frame = pd.DataFrame(record["results"], columns=["name", "size", "best"])
+        return frame.set_index(["name", "size"])["best"]
+
+    both = pd.concat({"baseline": table(baseline), "current": table(current)}, axis=1, join="inner")
+    both["ratio"] = both["current"] / both["baseline"]
+    both["regression"] = (both["ratio"] > 1 + tolerance) & (both["current"] - both["baseline"] > min_delta)
+    return both.reset_index()
+
+
+def load_results(path):
+    """
+    Reads a results record written by "run".
+    """
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_results(record, path):
+    """
+    Writes a results record as JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=1)
+
+
+def report(comparison):
+    """
+    Prints a comparison and returns the number of regressions.
+    """
+    for row in comparison.itertuples():
+        flag = "REGRESSION" if row.regression else ""
+        print(f"{row.name:<22} {row.size:>9,} words  {_ms(row.baseline):>10} -> {_ms(row.current):>10}"
+              f"  x{row.ratio:5.2f}  {flag}")
+    regressions = int(comparison["regression"].sum())
+    print(f"{regressions} regression(s) in {len(comparison)} benchmarks")
+    return regressions
+
+
+def _ms(seconds):
+    return f"{seconds * 1000:.2f} ms"
+
+
+if __name__ == "__main__":
+    # python -m vocab_core.benchmark run [--sizes 1000 10000 1000000] [--out results.json] [--baseline base.json]
+    # python -m vocab_core.benchmark compare <baseline.json> <results.json>
+    # python -m vocab_core.benchmark generate <size> <deck file>
+    parser = argparse.ArgumentParser(prog="python -m vocab_core.benchmark",
+                                     description="Benchmarks the deck, grading, diary and score data paths.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="time all benchmarks and write the results as JSON")
+    run.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="deck sizes in words")
+    run.add_argument("--repeat", type=int, default=REPEAT, help="timed runs per benchmark")
+    run.add_argument("--only", nargs="+", help="names of the benchmarks to run")
+    run.add_argument("--out", default=RESULTS_FILE, help="results file")
+    run.add_argument("--baseline", help="results file to compare with; exits with 1 on regressions")
+    run.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    check = commands.add_parser("compare", help="compare two results files; exits with 1 on regressions")
+    check.add_argument("baseline")
+    check.add_argument("current")
+    check.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed slowdown (0.25 = 25%%)")
+    generate = commands.add_parser("generate", help="write a synthetic deck (CSV, Feather or npz)")
+    generate.add_argument("size", type=int)
+    generate.add_argument("path")
+    args = parser.parse_args()
+
+    if args.command == "generate":
+        write_table(synthetic_deck(args.size), args.path)
+        print(f"Wrote {args.size:,} words to {args.path}")
+    elif args.command == "run":
+        record = run_benchmarks(args.sizes, args.repeat, args.only)
+        save_results(record, args.out)
+        print(f"Results written to {args.out}")
+        if args.baseline:
+            sys.exit(1 if report(compare(load_results(args.baseline), record, args.tolerance)) else 0)
+    else:
+        sys.exit(1 if report(compare(load_results(args.baseline), load_results(args.current), args.tolerance)) else 0)
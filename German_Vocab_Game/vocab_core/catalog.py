@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import threading
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.file_lock import atomic_write
+from vocab_core.schema import COLUMNS, SCHEMA_VERSION, is_deck_table, load_deck
+from vocab_core.storage import is_deck_file, read_columns
+
+# ----------------- Constants -----------------
+CATALOG_FILE = "catalog.json"  # Manifest of the vocabulary folder, next to the decks
+CATALOG_VERSION = 1            # Layout of the manifest; older manifests are rebuilt
+BACKUP_SUFFIX = "_backup"      # Deck-shaped files named <name>_backup.* are backups, not decks
+
+# File kinds
+DECK = "deck"      # Read-only vocabulary deck
+DIARY = "diary"    # The user's editable diary
+BACKUP = "backup"  # Copy of a deck or the diary, not offered for learning
+SYSTEM = "system"  # Score history, achievements and other non-deck tables
+LEARNABLE = (DECK, DIARY)  # Kinds offered by the learn and test pickers
+
+
+def content_hash(file_path):
+    """
+    Hash of the file contents (plus the -wal file of a SQLite deck, where recent writes live).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (file_path, file_path + "-wal"):
+        if os.path.exists(part):
+            with open(part, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+    return digest.hexdigest()
+
+
+def file_kind(file_path, diary_file):
+    """
+    DECK, DIARY, BACKUP or SYSTEM, decided by the file's columns rather than its name:
+    tables without English and German columns are system files (scores, achievements).
+    """
+    if not is_deck_table(read_columns(file_path)):
+        return SYSTEM
+    stem = os.path.splitext(os.path.basename(file_path))[0]
+    if stem == os.path.splitext(diary_file)[0]:
+        return DIARY
+    if stem.endswith(BACKUP_SUFFIX):
+        return BACKUP
+    return DECK
+
+
+def describe(file_path, diary_file):
+    """
+    Manifest entry of one file: kind, row count, word class histogram, schema version
+    (0 for decks still in a legacy layout), content hash and mtime.
+    """
+    kind = file_kind(file_path, diary_file)
+    entry = {"name": os.path.basename(file_path), "kind": kind, "rows": None, "word_classes": {}, "schema_version": None}
+    if kind != SYSTEM:
+        deck = load_deck(file_path, compact=True)  # Also warms the deck cache for the page that opens it
+        counts = deck["word_class"].value_counts(sort=False)
+        entry["rows"] = len(deck)
+        entry["word_classes"] = {str(c): int(n) for c, n in counts.items() if n}
+        entry["schema_version"] = SCHEMA_VERSION if read_columns(file_path) == COLUMNS else 0
+    # Taken after reading: opening a SQLite deck can touch its -wal file
+    stamp(entry, file_path)
+    entry["hash"] = content_hash(file_path)
+    return entry
+
+
+def stamp(entry, file_path):
+    """
+    Records the file's current signature and mtime in its entry.
+    """
+    entry["signature"] = list(deck_cache.file_signature(file_path))
+    entry["mtime"] = os.stat(file_path).st_mtime
+
+
+# ----------------- Catalog -----------------
+class Catalog:
+    """
+    Manifest of the decks in a folder, saved as catalog.json, so file pickers and range widgets
+    can be drawn without loading any deck. Each refresh lists the folder, but only files whose
+    signature (mtime, size) changed are looked at again, and only those whose content hash
+    changed are read; the manifest is written only when something changed.
+    """
+    def __init__(self, folder, diary_file, catalog_file=CATALOG_FILE):
+        self.folder = folder
+        self.diary_file = diary_file
+        self.path = os.path.join(folder, catalog_file)
+        self._entries = None  # file name -> entry
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Brings the manifest up to date with the folder and returns its entries, sorted by name.
+        Every entry also carries the file's "path" and "editable" (True for the diary).
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        with self._lock:
+            entries = self._load() if self._entries is None else self._entries
+            current, changed = {}, False
+            for item in os.scandir(self.folder):
+                if not item.is_file() or not is_deck_file(item.name):
+                    continue
+                entry = entries.get(item.name)
+                if entry is None or tuple(entry["signature"]) != deck_cache.file_signature(item.path):
+                    if entry is not None and entry["hash"] == content_hash(item.path):
+                        entry = dict(entry)
+                        stamp(entry, item.path)  # Touched but not changed (e.g. a SQLite checkpoint)
+                    else:
+                        entry = describe(item.path, self.diary_file)
+                    changed = True
+                current[item.name] = entry
+            changed = changed or current.keys() != entries.keys()
+            self._entries = current
+            if changed:
+                self._save(current)
+        return [dict(entry, path=os.path.join(self.folder, name), editable=entry["kind"] == DIARY)
+                for name, entry in sorted(current.items())]
+
+    def decks(self):
+        """
+        Entries of the files that can be learned and tested from: the decks and the diary.
+        """
+        return [entry for entry in self.refresh() if entry["kind"] in LEARNABLE]
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}  # Unreadable manifest: rebuilt by this refresh
+        if manifest.get("version") != CATALOG_VERSION or manifest.get("schema_version") != SCHEMA_VERSION:
+            return {}
+        return manifest.get("entries", {})
+
+    def _save(self, entries):
+        manifest = {"version": CATALOG_VERSION, "schema_version": SCHEMA_VERSION, "entries": entries}
+        with atomic_write(self.path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+
+_catalogs = {}  # (absolute folder, diary file) -> Catalog
+_catalogs_lock = threading.Lock()
+
+
+def catalog_for(folder, diary_file):
+    """
+    Returns the shared Catalog of a folder, so every page and session reuses one manifest.
+    """
+    key = (os.path.abspath(folder), diary_file)
+    with _catalogs_lock:
+        if key not in _catalogs:
+            _catalogs[key] = Catalog(folder, diary_file)
+        return _catalogs[key]
@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+# ----------------- Constants -----------------
+MAX_CACHE_BYTES = 256 * 1024 * 1024  # Total memory the cached decks may use (256 MB)
+MAX_CACHE_ENTRIES = 32               # Maximum number of parsed decks kept at once
+
+
+# ----------------- Deck Cache -----------------
+class DeckCache:
+    """
+    Process-wide cache of parsed vocabulary files.
+    Entries are keyed by the absolute file path plus a "variant" (how the file was parsed),
+    and are only reused while the file's modification time and size are unchanged.
+    Least recently used decks are evicted once the entry or memory limit is reached.
+    """
+    def __init__(self, max_bytes=MAX_CACHE_BYTES, max_entries=MAX_CACHE_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # (path, variant) -> (signature, frame, size in bytes)
+        self._lock = threading.RLock()  # Streamlit runs every session in its own thread
+
+    @staticmethod
+    def file_signature(file_path):
+        """
+        Returns (mtime in nanoseconds, size in bytes) of a file.
+        A change in either means the cached copy is stale.
+        SQLite files in WAL mode also include their -wal file, where recent writes live.
+        """
+        stat = os.stat(file_path)
+        wal_path = file_path + "-wal"
+        if os.path.exists(wal_path):
+            wal = os.stat(wal_path)
+            return stat.st_mtime_ns, stat.st_size, wal.st_mtime_ns, wal.st_size
+        return stat.st_mtime_ns, stat.st_size
+
+    def get(self, file_path, loader, variant=None):
+        """
+        Returns a copy of the parsed deck for file_path.
+        loader(file_path) is only called when the file is not cached or has changed on disk.
+        Callers get their own copy so they can edit it without touching the cached deck. With pandas'
+        copy-on-write (always on in pandas 3) that copy is shallow, so a hit costs about the same for
+        any deck size: the data is only copied by the edits themselves.
+        """
+        key = (os.path.abspath(file_path), variant)
+        signature = self.file_signature(file_path)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == signature:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return _private_copy(entry[1])
+
+        # Parse outside the lock so a slow file does not block other sessions
+        df = loader(file_path)
+        size = int(df.memory_usage(index=True, deep=True).sum())
+
+        with self._lock:
+            self.misses += 1
+            self._discard(key)
+            if size <= self.max_bytes:
+                self._entries[key] = (signature, df, size)
+                self.total_bytes += size
+                self._evict()
+        return _private_copy(df)
+
+    def invalidate(self, file_path):
+        """
+        Drops every cached variant of file_path. Called whenever the file is written.
+        """
+        path = os.path.abspath(file_path)
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == path]:
+                self._discard(key)
+
+    def clear(self):
+        """
+        Empties the whole cache.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def stats(self):
+        """
+        Returns a small dictionary describing the cache state.
+        """
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.total_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _discard(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def _evict(self):
+        # Drop least recently used decks until both limits are respected
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self.total_bytes -= size
+
+
+def _private_copy(df):
+    # A frame the caller can edit without touching the cached one
+    copy_on_write = int(pd.__version__.split(".")[0]) >= 3 or pd.options.mode.copy_on_write is True
+    return df.copy(deep=not copy_on_write)
+
+
+# Shared instance used by main_page.py, the Streamlit pages and the console game
+deck_cache = DeckCache()
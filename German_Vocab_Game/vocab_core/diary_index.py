@@ -0,0 +1,72 @@
+from vocab_core.normalize import normalize_key, normalize_series
+
+
+# ----------------- Diary Index -----------------
+class DiaryIndex:
+    """
+    Hash index over one column of the diary (normally the English word).
+    Maps the normalized key of every entry to its row position, so existence checks and
+    lookups cost O(1) instead of normalizing and scanning the whole column.
+    The diary frame is expected to keep a plain 0..n-1 index (use reset_index after deleting rows).
+    """
+    def __init__(self, diary, column):
+        self.column = column
+        self.rebuild(diary)
+
+    def rebuild(self, diary):
+        """
+        Recomputes all keys from the diary frame (one vectorized pass).
+        """
+        self._keys = normalize_series(diary[self.column]).tolist() if self.column in diary.columns else [""] * len(diary)
+        self._reindex()
+
+    def find(self, word):
+        """
+        Returns the row position of the first entry matching word, or None.
+        """
+        return self._positions.get(normalize_key(word))
+
+    def __contains__(self, word):
+        return normalize_key(word) in self._positions
+
+    def __len__(self):
+        return len(self._keys)
+
+    def append(self, word):
+        """
+        Registers a row added at the end of the diary. Returns its position.
+        """
+        position = len(self._keys)
+        key = normalize_key(word)
+        self._keys.append(key)
+        self._positions.setdefault(key, position)
+        return position
+
+    def rename(self, position, new_word):
+        """
+        Updates the key of the row at position after its indexed column was changed.
+        """
+        old_key = self._keys[position]
+        new_key = normalize_key(new_word)
+        if new_key == old_key:
+            return
+        self._keys[position] = new_key
+        if self._positions.get(old_key) == position or self._positions.get(new_key, position + 1) > position:
+            self._reindex()
+
+    def delete(self, word):
+        """
+        Forgets every row matching word and shifts the later positions down.
+        Returns the positions that were removed, so the caller can drop them from the frame.
+        """
+        key = normalize_key(word)
+        if key not in self._positions:
+            return []
+        removed = [i for i, k in enumerate(self._keys) if k == key]
+        self._keys = [k for k in self._keys if k != key]
+        self._reindex()
+        return removed
+
+    def _reindex(self):
+        # Walk backwards so the first occurrence of a duplicated key wins
+        self._positions = {key: i for i, key in reversed(list(enumerate(self._keys))) if key}
@@ -0,0 +1,225 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+from vocab_core.diary_store import apply_changes, diff_by_key
+from vocab_core.file_lock import FileLock, atomic_write
+
+# ----------------- Constants -----------------
+JOURNAL_FOLDER = "journal"          # Sub-folder (next to the diary) holding its change journal
+CHECKPOINT_EVERY = 100              # A compressed snapshot of the diary is taken every this many changes
+MAX_JOURNAL_BYTES = 1024 * 1024     # Journal size above which the oldest history is dropped
+KEEP_CHECKPOINTS = 5                # Snapshots kept; history older than the oldest one is dropped
+
+
+# ----------------- Diary Journal -----------------
+class DiaryJournal:
+    """
+    Undo/redo history of the diary.
+    Every committed change set is appended to a JSON-lines journal together with its inverse
+    (the row-level changes that undo it), so an edit costs a few bytes instead of a diary copy.
+    A gzip-compressed CSV snapshot (checkpoint) is taken every checkpoint_every entries; a
+    point-in-time restore starts from the last checkpoint before that time and replays the journal.
+    The journal is trimmed from the oldest checkpoint on once it holds more than keep_checkpoints
+    checkpoints or grows past max_bytes.
+
+    The state file keeps "head" (the entry the diary currently reflects, 0 = none), "last" (the
+    newest entry, > head after an undo) and the checkpoints as [entry, time] pairs.
+    """
+    def __init__(self, diary_path, key_column, checkpoint_every=CHECKPOINT_EVERY,
+                 max_bytes=MAX_JOURNAL_BYTES, keep_checkpoints=KEEP_CHECKPOINTS):
+        folder, file_name = os.path.split(diary_path)
+        self.folder = os.path.join(folder, JOURNAL_FOLDER)
+        self.stem = os.path.splitext(file_name)[0]
+        self.journal_path = os.path.join(self.folder, self.stem + ".jsonl")
+        self.state_path = os.path.join(self.folder, self.stem + ".json")
+        self.key_column = key_column
+        self.checkpoint_every = checkpoint_every
+        self.max_bytes = max_bytes
+        self.keep_checkpoints = keep_checkpoints
+        self._lock = FileLock(self.journal_path)
+
+    # ----------------- State -----------------
+    def _load_state(self):
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        return {"head": 0, "last": 0, "checkpoints": []}
+
+    def _save_state(self, state):
+        with atomic_write(self.state_path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(state))
+
+    def _entries(self):
+        if not os.path.exists(self.journal_path):
+            return []
+        with open(self.journal_path, encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def _write_entries(self, entries):
+        with atomic_write(self.journal_path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+    def _entry(self, seq):
+        return next((entry for entry in self._entries() if entry["seq"] == seq), None)
+
+    def _checkpoint_path(self, seq):
+        return os.path.join(self.folder, f"{self.stem}.{seq}.csv.gz")
+
+    def _checkpoint(self, state, seq, when, frame):
+        with atomic_write(self._checkpoint_path(seq)) as temp_path:
+            frame.to_csv(temp_path, index=False, encoding="utf-8", compression="gzip")
+        state["checkpoints"] = [c for c in state["checkpoints"] if c[0] != seq] + [[seq, when]]
+        state["checkpoints"].sort()
+
+    # ----------------- Recording -----------------
+    def ensure_base(self, snapshot):
+        """
+        Takes the first checkpoint (the diary before any journalled change) if there is none yet.
+        snapshot is a callable returning the current diary frame.
+        """
+        with self._lock:
+            state = self._load_state()
+            if not state["checkpoints"]:
+                self._checkpoint(state, state["head"], time.time(), snapshot())
+                self._save_state(state)
+
+    def record(self, changes, inverse, snapshot):
+        """
+        Appends a committed change set and its inverse. Entries that were undone are discarded
+        (no redo after a new change). snapshot returns the diary after the change and is only
+        called when a checkpoint is due.
+        """
+        if not inverse:
+            return  # Nothing actually changed
+        with self._lock:
+            state = self._load_state()
+            if state["last"] > state["head"]:
+                self._truncate(state)
+            seq = state["head"] + 1
+            entry = {"seq": seq, "time": time.time(), "changes": changes, "inverse": inverse}
+            os.makedirs(self.folder, exist_ok=True)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            state["head"] = state["last"] = seq
+            if seq % self.checkpoint_every == 0:
+                self._checkpoint(state, seq, entry["time"], snapshot())
+            self._rotate(state, entry, snapshot)
+            self._save_state(state)
+
+    def _truncate(self, state):
+        # Drops the undone entries and the checkpoints taken after them
+        self._write_entries([entry for entry in self._entries() if entry["seq"] <= state["head"]])
+        for seq, _ in state["checkpoints"]:
+            if seq > state["head"]:
+                os.remove(self._checkpoint_path(seq))
+        state["checkpoints"] = [c for c in state["checkpoints"] if c[0] <= state["head"]]
+        state["last"] = state["head"]
+
+    def _rotate(self, state, entry, snapshot):
+        too_big = os.path.getsize(self.journal_path) > self.max_bytes
+        if too_big and (not state["checkpoints"] or state["checkpoints"][-1][0] != entry["seq"]):
+            self._checkpoint(state, entry["seq"], entry["time"], snapshot())
+        dropped = False
+        while len(state["checkpoints"]) > self.keep_checkpoints or (too_big and len(state["checkpoints"]) > 1):
+            os.remove(self._checkpoint_path(state["checkpoints"].pop(0)[0]))
+            dropped = True
+            too_big = False  # Re-checked after the rewrite below
+        if dropped:
+            oldest = state["checkpoints"][0][0]
+            self._write_entries([e for e in self._entries() if e["seq"] > oldest])
+
+    def clear(self):
+        """
+        Deletes the whole history (journal, state and checkpoints).
+        """
+        with self._lock:
+            state = self._load_state()
+            for seq, _ in state["checkpoints"]:
+                if os.path.exists(self._checkpoint_path(seq)):
+                    os.remove(self._checkpoint_path(seq))
+            for path in (self.journal_path, self.state_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    # ----------------- Undo / Redo / Restore -----------------
+    def can_undo(self):
+        state = self._load_state()
+        return state["head"] > 0 and state["head"] > self._oldest_seq(state)
+
+    def can_redo(self):
+        state = self._load_state()
+        return state["last"] > state["head"]
+
+    def _oldest_seq(self, state):
+        # Entries up to the oldest checkpoint have been dropped by rotation
+        return state["checkpoints"][0][0] if state["checkpoints"] else 0
+
+    def undo(self, store):
+        """
+        Undoes the last change set on store. Returns the undone entry, or None if there is nothing to undo.
+        """
+        with store.lock(), self._lock:  # Same lock order as store.apply: diary first, then journal
+            state = self._load_state()
+            entry = self._entry(state["head"]) if state["head"] > self._oldest_seq(state) else None
+            if entry is None:
+                return None
+            store.apply(entry["inverse"], record=False)
+            state["head"] -= 1
+            self._save_state(state)
+            return entry
+
+    def redo(self, store):
+        """
+        Re-applies the last undone change set on store. Returns the entry, or None if there is nothing to redo.
+        """
+        with store.lock(), self._lock:
+            state = self._load_state()
+            entry = self._entry(state["head"] + 1) if state["last"] > state["head"] else None
+            if entry is None:
+                return None
+            store.apply(entry["changes"], record=False)
+            state["head"] += 1
+            self._save_state(state)
+            return entry
+
+    def history(self):
+        """
+        Returns the journalled changes as a DataFrame (entry, time, number of rows, undone or not).
+        """
+        state = self._load_state()
+        rows = [(entry["seq"], pd.Timestamp(entry["time"], unit="s"), len(entry["changes"]), entry["seq"] > state["head"])
+                for entry in self._entries()]
+        return pd.DataFrame(rows, columns=["entry", "time", "rows", "undone"])
+
+    def state_at(self, when):
+        """
+        Rebuilds the diary as it was at time when (seconds since the epoch): the last checkpoint
+        before that time plus the journalled changes up to it. Returns None if when is older than
+        the kept history.
+        """
+        state = self._load_state()
+        usable = [c for c in state["checkpoints"] if c[1] <= when and c[0] <= state["head"]]
+        if not usable:
+            return None
+        seq = usable[-1][0]
+        frame = pd.read_csv(self._checkpoint_path(seq), encoding="utf-8", compression="gzip")
+        changes = [change for entry in self._entries()
+                   if seq < entry["seq"] <= state["head"] and entry["time"] <= when
+                   for change in entry["changes"]]
+        frame, _ = apply_changes(frame, changes, self.key_column)
+        return frame
+
+    def restore(self, store, when):
+        """
+        Restores the diary on store to its state at time when. The restore is itself journalled,
+        so it can be undone. Returns the summary of the applied changes, or None if when is too old.
+        """
+        target = self.state_at(when)
+        if target is None:
+            return None
+        return store.apply(diff_by_key(store.read_raw(), target, self.key_column))
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from vocab_core.normalize import normalize_series
+
+
+# ----------------- Bulk Upsert -----------------
+def bulk_upsert(diary, batch, key, fill_columns=None, insert_mask=None):
+    """
+    Merges a batch of result rows into the diary with a single keyed join.
+    - Rows whose normalized key is not in the diary are appended (only where insert_mask is True, if given).
+    - Rows whose key already exists only fill in diary cells that are empty (e.g. missing verb tenses).
+    Several batch rows with the same key are combined first, taking the first non-empty value per column.
+    Returns (merged diary, summary) where summary counts "inserted" rows, "updated" rows and "filled" cells.
+    The new rows are at the end of the merged diary, which keeps a plain 0..n-1 index.
+    """
+    summary = {"inserted": 0, "updated": 0, "filled": 0}
+    merged = diary.reset_index(drop=True)
+    if batch.empty:
+        return merged, summary
+    if fill_columns is None:
+        fill_columns = [col for col in batch.columns if col != key and col in merged.columns]
+
+    # Treat empty strings as missing so they never overwrite or fill anything
+    batch = batch.reset_index(drop=True)
+    batch = batch.mask(batch == "")
+    batch_keys = normalize_series(batch[key])
+    usable = (batch_keys != "").to_numpy()
+    batch, batch_keys = batch[usable], batch_keys[usable]
+
+    # One row per key: first non-empty value of every column
+    combined = batch.groupby(batch_keys.to_numpy(), sort=False).first()
+    if insert_mask is not None:
+        wants_insert = pd.Series(np.asarray(insert_mask)[usable]).groupby(batch_keys.to_numpy(), sort=False).any()
+    else:
+        wants_insert = pd.Series(True, index=combined.index)
+
+    # Keyed join: position of every batch key in the diary (-1 when missing)
+    diary_keys = normalize_series(merged[key]) if key in merged.columns else pd.Series("", index=merged.index)
+    first_rows = diary_keys.drop_duplicates()
+    positions = pd.Index(first_rows.to_numpy()).get_indexer(combined.index)
+    positions = np.where(positions >= 0, first_rows.index.to_numpy()[positions], -1)
+    existing = positions >= 0
+
+    # Fill-ins for words that are already in the diary
+    updated = np.zeros(int(existing.sum()), dtype=bool)
+    target_rows = positions[existing]
+    for col in fill_columns:
+        if col not in combined.columns:
+            continue
+        if col not in merged.columns:
+            merged[col] = np.nan
+        if merged[col].dtype != object:
+            merged[col] = merged[col].astype(object)
+        new_values = combined[col].to_numpy()[existing]
+        current = merged[col].to_numpy()[target_rows]
+        fill = ~pd.isna(new_values) & (pd.isna(current) | (current == ""))
+        if fill.any():
+            merged.iloc[target_rows[fill], merged.columns.get_loc(col)] = new_values[fill]
+            summary["filled"] += int(fill.sum())
+            updated |= fill
+    summary["updated"] = int(updated.sum())
+
+    # Inserts for new words, written in one concat
+    new_rows = combined[~existing & wants_insert.reindex(combined.index, fill_value=False).to_numpy()]
+    if not new_rows.empty:
+        new_rows = new_rows.reindex(columns=merged.columns)
+        merged = pd.concat([merged, new_rows], ignore_index=True)
+        summary["inserted"] = len(new_rows)
+    return merged, summary
@@ -0,0 +1,516 @@
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+import pandas as pd
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.diary_index import DiaryIndex
+from vocab_core.file_lock import FileLock
+from vocab_core.normalize import normalize_key, normalize_series
+from vocab_core.storage import SQLITE_EXT, read_table
+
+# ----------------- Constants -----------------
+KEY_FIELD = "_key"          # Hidden column holding the normalized key (unique index)
+MIGRATED_SUFFIX = ".migrated"  # The CSV diary is renamed to diary.csv.migrated after migrating
+
+
+# ----------------- Change Sets -----------------
+# A change set is a list of row-level operations:
+#   {"op": "insert", "row": {column: value, ...}}
+#   {"op": "update", "key": word, "fields": {column: value, ...}}
+#   {"op": "delete", "key": word}
+# Keys are compared after normalize_key, like everywhere else in the diary.
+
+def diff_frames(original, edited, key_column):
+    """
+    Compares an edited copy of the diary with the original and returns the change set.
+    Rows are matched by index label (as returned by st.data_editor): labels only in the original
+    were deleted, labels only in the edited frame were added, and shared labels with any
+    different cell were updated.
+    """
+    changes = []
+    deleted = original.index.difference(edited.index, sort=False)
+    added = edited.index.difference(original.index, sort=False)
+    shared = original.index.intersection(edited.index, sort=False)
+
+    for label in deleted:
+        changes.append({"op": "delete", "key": original.at[label, key_column]})
+
+    columns = [col for col in edited.columns if col in original.columns]
+    before = original.loc[shared, columns]
+    after = edited.loc[shared, columns]
+    differs = (before != after) & ~(before.isna() & after.isna())
+    for label in differs.index[differs.any(axis=1)]:
+        row_changes = differs.loc[label]
+        fields = {col: _cell(after.at[label, col]) for col in row_changes.index[row_changes]}
+        changes.append({"op": "update", "key": original.at[label, key_column], "fields": fields})
+
+    new_columns = [col for col in edited.columns if col not in original.columns]
+    for label in shared:
+        fields = {col: _cell(edited.at[label, col]) for col in new_columns if not _is_missing(edited.at[label, col])}
+        if fields:
+            changes.append({"op": "update", "key": original.at[label, key_column], "fields": fields})
+
+    for label in added:
+        row = {col: _cell(value) for col, value in edited.loc[label].items()}
+        if not _is_missing(row.get(key_column)):
+            changes.append({"op": "insert", "row": row})
+    return changes
+
+
+def apply_changes(df, changes, key_column, index=None):
+    """
+    Applies a change set to an in-memory diary frame (with a plain 0..n-1 index).
+    index is the frame's DiaryIndex; it is built if not given and kept up to date.
+    Inserts of words that already exist, and updates or deletes of missing words, are skipped
+    (counted in summary["skipped"]). Returns (new frame, summary).
+    """
+    if index is None:
+        index = DiaryIndex(df, key_column)
+    summary = _empty_summary()
+    pending = []  # Inserted rows, concatenated once
+
+    def flush(frame):
+        if pending:
+            frame = pd.concat([frame, pd.DataFrame(pending)], ignore_index=True)
+            pending.clear()
+        return frame
+
+    for change in changes:
+        op = change["op"]
+        if op == "insert":
+            row = change["row"]
+            if _is_missing(row.get(key_column)) or row[key_column] in index:
+                summary["skipped"] += 1
+                continue
+            index.append(row[key_column])
+            pending.append(dict(row))
+            summary["inserted"] += 1
+        elif op == "update":
+            position = index.find(change["key"])
+            new_key = change["fields"].get(key_column)
+            if position is None or (new_key is not None and index.find(new_key) not in (None, position)):
+                summary["skipped"] += 1  # Missing word, or renamed to a word that already exists
+                continue
+            if position >= len(df):
+                pending[position - len(df)].update(change["fields"])
+            else:
+                for col, value in change["fields"].items():
+                    if col not in df.columns:
+                        df[col] = None
+                    if df[col].dtype != object:
+                        df[col] = df[col].astype(object)
+                    df.at[position, col] = value
+            if key_column in change["fields"]:
+                index.rename(position, change["fields"][key_column])
+            summary["updated"] += 1
+        elif op == "delete":
+            df = flush(df)
+            removed = index.delete(change["key"])
+            if removed:
+                df = df.drop(index=removed).reset_index(drop=True)
+                summary["deleted"] += len(removed)
+            else:
+                summary["skipped"] += 1
+    return flush(df), summary
+
+
+def _empty_summary():
+    # The stores set "merged" when the diary changed since the caller read it,
+    # and "version" to the diary version their write produced
+    return {"inserted": 0, "updated": 0, "deleted": 0, "skipped": 0, "merged": False, "version": None}
+
+
+def invert_changes(changes, key_column, lookup):
+    """
+    Returns the change set that undoes changes. lookup(word) returns the current row of word
+    as a dictionary (or None) before any of the changes are applied.
+    Changes that would have no effect (inserting an existing word, touching a missing one) get no inverse.
+    """
+    rows = {}  # Rows touched so far: normalized key -> row after the changes seen so far (None = deleted)
+
+    def current(word):
+        key = normalize_key(word)
+        return rows[key] if key in rows else lookup(word)
+
+    inverse = []
+    for change in changes:
+        op = change["op"]
+        if op == "insert":
+            row = change["row"]
+            if _is_missing(row.get(key_column)) or current(row[key_column]) is not None:
+                continue
+            rows[normalize_key(row[key_column])] = dict(row)
+            inverse.append({"op": "delete", "key": row[key_column]})
+        elif op == "update":
+            row = current(change["key"])
+            fields = change["fields"]
+            new_key = fields.get(key_column, change["key"])
+            renamed_onto = normalize_key(new_key) != normalize_key(change["key"]) and current(new_key) is not None
+            if row is None or renamed_onto:
+                continue
+            rows[normalize_key(change["key"])] = None
+            rows[normalize_key(new_key)] = {**row, **fields}
+            inverse.append({"op": "update", "key": new_key, "fields": {col: row.get(col) for col in fields}})
+        elif op == "delete":
+            row = current(change["key"])
+            if row is None:
+                continue
+            rows[normalize_key(change["key"])] = None
+            inverse.append({"op": "insert", "row": row})
+    inverse.reverse()
+    return inverse
+
+
+def diff_by_key(current, target, key_column):
+    """
+    Returns the change set turning the diary current into target, matching rows by normalized key
+    instead of by index label (e.g. to restore an older version of the diary).
+    Cells are compared as text, so parsed verb tense lists and their CSV form count as equal.
+    """
+    def keyed(df):
+        keys = normalize_series(df[key_column])
+        keep = (~keys.duplicated() & (keys != "")).to_numpy()
+        return df[keep].set_axis(keys[keep].to_numpy()).map(_text)
+
+    return diff_frames(keyed(current), keyed(target), key_column)
+
+
+def _text(value):
+    return None if _is_missing(value) else str(value)
+
+
+def _frame_lookup(df, index):
+    # lookup(word) for invert_changes over an in-memory diary
+    def lookup(word):
+        position = index.find(word)
+        if position is None or position >= len(df):
+            return None
+        return {col: None if _is_missing(value) else _cell(value) for col, value in df.iloc[position].items()}
+    return lookup
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and value != value) or value == ""
+
+
+def _cell(value):
+    # NumPy scalars become plain Python values so change sets can be written as JSON
+    return value.item() if hasattr(value, "item") and not isinstance(value, (list, str)) else value
+
+
+# ----------------- CSV Diary Store -----------------
+class CsvDiaryStore:
+    """
+    Diary kept in a single file (CSV, Feather or npz). Every change set rewrites the whole file,
+    which is fine for small diaries. load and save are the frontend's load_csv/save_csv.
+    Change sets are recorded in journal (a DiaryJournal) for undo/redo, if one is given.
+    Writers hold an advisory lock on the file while they read, change and replace it, so
+    concurrent sessions never lose each other's changes; readers take no lock.
+    """
+    def __init__(self, path, key_column, load, save, journal=None):
+        self.path = path
+        self.key_column = key_column
+        self._load = load
+        self._save = save
+        self.journal = journal
+
+    def load(self):
+        return self._load(self.path)
+
+    def read_raw(self):
+        """
+        Reads the diary file as stored, without the frontend's parsing.
+        """
+        return read_table(self.path)
+
+    def version(self):
+        """
+        Changes whenever the diary is written.
+        """
+        return deck_cache.file_signature(self.path) if os.path.exists(self.path) else None
+
+    def lock(self):
+        """
+        The writers' lock of the diary (reentrant, see FileLock).
+        """
+        return FileLock(self.path)
+
+    def apply(self, changes, record=True, expected_version=None):
+        """
+        Applies a change set to the file. Returns the summary of apply_changes.
+        record=False skips the journal (used by undo and redo themselves).
+        expected_version is the version the caller's changes are based on. If the diary has moved on
+        since, the change set is applied to the current diary instead (a row-level merge: changes to
+        words that are gone are skipped) and summary["merged"] is True.
+        """
+        if not changes:
+            return _empty_summary()
+        with self.lock():
+            merged = expected_version is not None and self.version() != expected_version
+            df = self.load().reset_index(drop=True)
+            index = DiaryIndex(df, self.key_column)
+            journal = self.journal if record else None
+            if journal is not None:
+                journal.ensure_base(lambda: df)
+                inverse = invert_changes(changes, self.key_column, _frame_lookup(df, index))
+            df, summary = apply_changes(df, changes, self.key_column, index)
+            self._save(df, self.path)
+            if journal is not None:
+                journal.record(changes, inverse, lambda: df)
+            summary["version"] = self.version()
+        summary["merged"] = merged
+        return summary
+
+
+# ----------------- SQLite Diary Store -----------------
+class SqliteDiaryStore:
+    """
+    Diary kept in SQLite (WAL mode). Each row stores its normalized key in a uniquely indexed column,
+    so a change set touches only the changed rows, inside one transaction.
+    The table columns, the key column and a version counter are kept in a small meta table.
+    Change sets are recorded in journal (a DiaryJournal) for undo/redo, if one is given.
+    SQLite serializes the writers; readers in WAL mode never wait for them.
+    """
+    def __init__(self, path, key_column=None, load=None, journal=None):
+        self.path = path
+        self._load = load
+        self.journal = journal
+        with closing(self._connect()) as conn:
+            self.key_column = self._meta(conn, "key_column") or key_column
+            self.columns = json.loads(self._meta(conn, "columns") or "[]")
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+        return conn
+
+    @staticmethod
+    def _meta(conn, name):
+        row = conn.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def load(self):
+        """
+        Returns the whole diary as a DataFrame, through the frontend loader if one was given.
+        """
+        return self._load(self.path) if self._load else self.read_frame()
+
+    def read_raw(self):
+        """
+        Reads the diary table as stored, without the frontend's parsing.
+        """
+        return self.read_frame()
+
+    def read_frame(self, columns=None):
+        """
+        Reads the diary table (optionally only some columns) in insertion order.
+        """
+        names = [col for col in self.columns if columns is None or col in columns]
+        if not names:
+            return pd.DataFrame(columns=names)
+        with closing(self._connect()) as conn:
+            query = f"SELECT {', '.join(_quote(col) for col in names)} FROM diary ORDER BY rowid"
+            return pd.read_sql_query(query, conn)
+
+    def version(self):
+        """
+        Counter increased by every committed change set.
+        """
+        with closing(self._connect()) as conn:
+            return int(self._meta(conn, "version") or 0)
+
+    def lock(self):
+        """
+        Held around a change set and its journal entry, so both are written in the same order.
+        """
+        return FileLock(self.path)
+
+    def get(self, word):
+        """
+        Returns the row of word as a dictionary, or None.
+        """
+        with closing(self._connect()) as conn:
+            return self._get(conn, word)
+
+    def _get(self, conn, word):
+        query = f"SELECT {', '.join(_quote(col) for col in self.columns)} FROM diary WHERE {KEY_FIELD} = ?"
+        row = conn.execute(query, (normalize_key(word),)).fetchone()
+        return dict(zip(self.columns, row)) if row else None
+
+    def apply(self, changes, record=True, expected_version=None):
+        """
+        Applies a change set with row-level INSERT/UPDATE/DELETE statements in one transaction.
+        record=False skips the journal (used by undo and redo themselves).
+        expected_version works as in CsvDiaryStore.apply: row-level changes are applied to the
+        current diary and summary["merged"] tells whether it had moved on.
+        """
+        summary = _empty_summary()
+        if not changes:
+            return summary
+        with self.lock():
+            self._apply(changes, record, expected_version, summary)
+        return summary
+
+    def _apply(self, changes, record, expected_version, summary):
+        journal = self.journal if record else None
+        if journal is not None:
+            journal.ensure_base(self.read_frame)
+        conn = self._connect()
+        try:
+            with conn:  # Commits on success, rolls back on error
+                conn.execute("BEGIN IMMEDIATE")
+                current_version = int(self._meta(conn, "version") or 0)
+                summary["merged"] = expected_version is not None and current_version != expected_version
+                if journal is not None:
+                    inverse = invert_changes(changes, self.key_column, lambda word: self._get(conn, word))
+                for change in changes:
+                    op = change["op"]
+                    if op == "insert":
+                        row = change["row"]
+                        if _is_missing(row.get(self.key_column)):
+                            summary["skipped"] += 1
+                            continue
+                        self._add_columns(conn, row)
+                        cols = list(row)
+                        cursor = conn.execute(
+                            f"INSERT OR IGNORE INTO diary ({KEY_FIELD}, {', '.join(_quote(c) for c in cols)}) "
+                            f"VALUES ({', '.join('?' * (len(cols) + 1))})",
+                            [normalize_key(row[self.key_column])] + [_sql_value(row[c]) for c in cols])
+                        summary["inserted"] += cursor.rowcount
+                        summary["skipped"] += 1 - cursor.rowcount
+                    elif op == "update":
+                        fields = dict(change["fields"])
+                        self._add_columns(conn, fields)
+                        assignments = [f"{_quote(c)} = ?" for c in fields]
+                        values = [_sql_value(v) for v in fields.values()]
+                        if self.key_column in fields:
+                            assignments.append(f"{KEY_FIELD} = ?")
+                            values.append(normalize_key(fields[self.key_column]))
+                        cursor = conn.execute(
+                            f"UPDATE OR IGNORE diary SET {', '.join(assignments)} WHERE {KEY_FIELD} = ?",
+                            values + [normalize_key(change["key"])])
+                        summary["updated"] += cursor.rowcount
+                        summary["skipped"] += cursor.rowcount == 0
+                    elif op == "delete":
+                        cursor = conn.execute(f"DELETE FROM diary WHERE {KEY_FIELD} = ?", (normalize_key(change["key"]),))
+                        summary["deleted"] += cursor.rowcount
+                        summary["skipped"] += cursor.rowcount == 0
+                self._bump_version(conn)
+                summary["version"] = current_version + 1
+        finally:
+            conn.close()
+        if journal is not None:
+            journal.record(changes, inverse, self.read_frame)
+
+    def replace_all(self, df):
+        """
+        Replaces the whole diary with df (used by the migration and full-file saves).
+        Rows with an empty or repeated key are skipped.
+        """
+        if self.key_column not in df.columns:
+            self.key_column = guess_key_column(df.columns)
+        self.columns = [str(col) for col in df.columns]
+        keys = normalize_series(df[self.key_column]).tolist()
+        rows = [[key] + [_sql_value(v) for v in values]
+                for key, values in zip(keys, df.itertuples(index=False, name=None)) if key]
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("DROP TABLE IF EXISTS diary")
+                conn.execute(f"CREATE TABLE diary ({KEY_FIELD} TEXT NOT NULL, "
+                             f"{', '.join(_quote(c) + ' TEXT' for c in self.columns)})")
+                conn.execute(f"CREATE UNIQUE INDEX diary_key ON diary ({KEY_FIELD})")
+                conn.executemany(
+                    f"INSERT OR IGNORE INTO diary VALUES ({', '.join('?' * (len(self.columns) + 1))})", rows)
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('key_column', ?)", (self.key_column,))
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('columns', ?)", (json.dumps(self.columns),))
+                self._bump_version(conn)
+        finally:
+            conn.close()
+
+    def _add_columns(self, conn, row):
+        # New columns coming from an edited diary are added to the table on the fly
+        for col in row:
+            if col not in self.columns:
+                conn.execute(f"ALTER TABLE diary ADD COLUMN {_quote(col)} TEXT")
+                self.columns.append(col)
+                conn.execute("INSERT OR REPLACE INTO meta VALUES ('columns', ?)", (json.dumps(self.columns),))
+
+    def _bump_version(self, conn):
+        conn.execute("INSERT OR IGNORE INTO meta VALUES ('version', '0')")
+        conn.execute("UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE name = 'version'")
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    # NaN and empty cells become NULL (read back as missing, like empty CSV cells),
+    # lists (verb tenses) are stored as their text form like in CSV
+    if _is_missing(value):
+        return None
+    if isinstance(value, (list, tuple, dict)):
+        return str(value)
+    return _cell(value)
+
+
+def guess_key_column(columns):
+    """
+    The column holding the English word: "english" (web app), "English" (console) or the first column.
+    """
+    for name in ("english", "English"):
+        if name in columns:
+            return name
+    return list(columns)[0]
+
+
+# ----------------- Opening and Migration -----------------
+def find_diary(folder, diary_file):
+    """
+    Returns the path of the diary: the SQLite diary if it has been migrated, the CSV file otherwise.
+    """
+    sqlite_path = os.path.join(folder, os.path.splitext(diary_file)[0] + SQLITE_EXT)
+    return sqlite_path if os.path.exists(sqlite_path) else os.path.join(folder, diary_file)
+
+
+def open_diary_store(path, key_column, load, save):
+    """
+    Returns the store for the diary at path: SQLite for .sqlite files, whole-file otherwise.
+    Every store records its changes in the diary's journal (see vocab_core.diary_journal).
+    """
+    from vocab_core.diary_journal import DiaryJournal  # Imported here, it builds on this module
+
+    journal = DiaryJournal(path, key_column)
+    if os.path.splitext(path)[1].lower() == SQLITE_EXT:
+        return SqliteDiaryStore(path, key_column, load=load, journal=journal)
+    return CsvDiaryStore(path, key_column, load, save, journal)
+
+
+def migrate(csv_path, key_column=None):
+    """
+    Copies a CSV diary into a new SQLite diary next to it and renames the CSV to *.migrated.
+    Returns the path of the SQLite diary.
+    """
+    df = read_table(csv_path)
+    db_path = os.path.splitext(csv_path)[0] + SQLITE_EXT
+    store = SqliteDiaryStore(db_path, key_column or guess_key_column(df.columns))
+    store.replace_all(df)
+    os.replace(csv_path, csv_path + MIGRATED_SUFFIX)
+    return db_path
+
+
+if __name__ == "__main__":
+    # python -m vocab_core.diary_store migrate vocab_data/diary.csv [key column]
+    if len(sys.argv) >= 3 and sys.argv[1] == "migrate":
+        new_path = migrate(sys.argv[2], sys.argv[3] if len(sys.argv) > 3 else None)
+        print(f"Diary migrated to {new_path}.")
+    else:
+        print("Usage: python -m vocab_core.diary_store migrate <diary.csv> [key column]")
@@ -0,0 +1,351 @@
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from vocab_core import library
+from vocab_core.diary_merge import bulk_upsert
+from vocab_core.diary_store import diff_frames
+from vocab_core.grading import PLACEHOLDERS, grade_frames
+from vocab_core.matching import ALMOST, CORRECT, WRONG, default_matcher
+from vocab_core.normalize import normalize_key
+from vocab_core.question_bank import question_bank
+from vocab_core.sampling import sample_frame, sample_positions
+from vocab_core.schema import KEY_COLUMN, expand_deck
+from vocab_core.score_journal import ScoreJournal
+from vocab_core.srs import schedule_for
+
+# ----------------- Constants -----------------
+ANSWER_COLUMNS = 2                 # Sheet columns from this position on are answers (word_class and english are given)
+ACHIEVEMENTS_FILE = "achievements.csv"
+ACHIEVEMENT_COLUMNS = ["Achievement", "DateEarned"]
+PERFECT_STREAK = 5                 # Full-mark games in a row for the streak achievement
+STREAK_ACHIEVEMENT = "Perfect 5 games in a row!"
+FIRST_PERFECT_ACHIEVEMENT = "First 100% score!"
+
+
+# ----------------- Decks -----------------
+class Deck:
+    """
+    A deck opened for learning or testing: its path, the read-only compact frame from the
+    deck cache, its question bank and its review schedule (both built on first use and shared
+    process-wide, see question_bank and srs.schedule_for).
+    """
+    def __init__(self, path, frame=None):
+        self.path = path
+        self.frame = library.load_csv(path, compact=True) if frame is None else frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def bank(self):
+        return question_bank(self.frame, self.path)
+
+    @property
+    def schedule(self):
+        return schedule_for(self.path, self.frame, KEY_COLUMN)
+
+    def of_class(self, word_class):
+        """
+        The words of one word class, renumbered 0..n-1.
+        """
+        return self.frame[self.frame["word_class"] == word_class].reset_index(drop=True)
+
+    def sample(self, k, word_class=None, stratify=False, seed=None):
+        """
+        k random words (of one word class, if given); stratify keeps the word class mix of the deck.
+        """
+        frame = self.frame if word_class is None else self.of_class(word_class)
+        return sample_frame(frame, k, seed=seed, stratify_by="word_class" if stratify else None)
+
+    def rows(self, labels):
+        """
+        Editable copies of the deck rows with the given index labels.
+        """
+        return expand_deck(self.frame.loc[labels])
+
+    def words(self, start, end):
+        """
+        The words at row positions start..end-1, in deck order.
+        """
+        return self.frame.iloc[start:end]
+
+
+# ----------------- Question Plans -----------------
+class QuestionPlan:
+    """
+    The questions of one test: the deck row positions of the words asked, in asking order,
+    and the question bank rows of the forms asked (by default every form of those words, looked
+    up on first use, so a plan graded as a sheet never builds the bank). Built by the plan_*
+    functions below. schedule is the review schedule to update after the test (due-word plans only).
+    """
+    def __init__(self, deck, positions, rows=None, schedule=None):
+        self.deck = deck
+        self.positions = np.asarray(positions, dtype=np.intp)
+        self._rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+        self.schedule = schedule
+
+    def __len__(self):
+        return len(self.positions)
+
+    @property
+    def rows(self):
+        if self._rows is None:
+            self._rows = self.deck.bank.rows_for_words(self.positions)
+        return self._rows
+
+    def questions(self):
+        """
+        The planned questions as Question records, one per form.
+        """
+        return self.deck.bank.questions(self.rows)
+
+    def answer_sheet(self):
+        """
+        The planned words as editable deck rows holding the answers, one row per word.
+        """
+        return expand_deck(self.deck.frame.iloc[self.positions])
+
+    def question_sheet(self, answers=None):
+        """
+        The answer sheet with every answer cell blanked for the user to fill in;
+        cells that have no answer are marked with a placeholder and are not graded.
+        """
+        answers = self.answer_sheet() if answers is None else answers
+        sheet = answers.copy()
+        for col in answers.columns[ANSWER_COLUMNS:]:
+            empty = answers[col].isna() | answers[col].isin(PLACEHOLDERS + [""])
+            sheet[col] = np.where(empty, PLACEHOLDERS[0], "")
+        return sheet
+
+
+def plan_words(deck, k, word_class=None, seed=None):
+    """
+    k random words (of one word class, if given), every form of a word asked together.
+    """
+    if word_class is None:
+        positions = sample_positions(len(deck), k, seed=seed)
+    else:
+        candidates = deck.bank.word_positions(word_class)
+        positions = candidates[sample_positions(len(candidates), k, seed=seed)]
+    return QuestionPlan(deck, positions)
+
+
+def plan_questions(deck, k, word_class=None, seed=None):
+    """
+    k random questions (of one word class, if given): each verb form is a separate question,
+    shuffled with the other words.
+    """
+    candidates = deck.bank.rows(word_class)
+    rows = candidates[sample_positions(len(candidates), k, seed=seed)]
+    return QuestionPlan(deck, deck.bank.words[rows], rows)
+
+
+def plan_range(deck, start, end):
+    """
+    The words at row positions start..end-1, in deck order.
+    """
+    return QuestionPlan(deck, np.arange(max(start, 0), min(end, len(deck))))
+
+
+def plan_due(deck, k):
+    """
+    Up to k words that are due for review (spaced repetition), earliest due first.
+    The plan is empty when nothing is due.
+    """
+    schedule = deck.schedule
+    return QuestionPlan(deck, schedule.due_positions(k), schedule=schedule)
+
+
+def question_count(deck, word_class=None):
+    """
+    Number of questions (one per form) of a deck, or of one word class.
+    """
+    return len(deck.bank.rows(word_class))
+
+
+# ----------------- Test Sessions -----------------
+class TestSession:
+    """
+    One test taken from a QuestionPlan, either one question at a time (answer) or as a whole
+    sheet (grade_sheet). Keeps the score, the correct answers (to add to the diary) and the
+    answers to revise; finish logs the score and reschedules the words of a due-word plan.
+    """
+    def __init__(self, plan, matcher=default_matcher):
+        self.plan = plan
+        self.matcher = matcher
+        self.total = 0
+        self.correct = 0
+        self.almost = 0
+        self.correct_answers = []  # {"english", "form", "german", "word_class"} per correct answer
+        self.revision = []         # [english, word_class, form, answer] per wrong answer
+        self.result = None         # GradeResult of a graded sheet
+
+    def answer(self, question, text):
+        """
+        Grades one answer (see AnswerMatcher) and returns CORRECT, ALMOST or WRONG.
+        Almost correct answers count as wrong and go on the revision list.
+        """
+        verdict = self.matcher.match_normalized(normalize_key(text), question.normalized) if text else WRONG
+        self.total += 1
+        if verdict == CORRECT:
+            self.correct += 1
+            self.correct_answers.append({"english": question.english, "form": question.form,
+                                         "german": question.answer, "word_class": question.word_class})
+        else:
+            if verdict == ALMOST:
+                self.almost += 1
+            self.revision.append([question.english, question.word_class, question.form, question.answer])
+        return verdict
+
+    def grade_sheet(self, answers, responses):
+        """
+        Grades a filled-in question sheet against the plan's answer sheet in one vectorized pass
+        and returns the GradeResult. Every row (word) counts as one question.
+        """
+        self.result = grade_frames(answers, responses, matcher=self.matcher)
+        self.total = len(answers)
+        self.correct = self.result.marks
+        self.almost = len(self.result.almost_ids)
+        return self.result
+
+    @property
+    def percent(self):
+        return round(self.correct / self.total * 100, 1) if self.total else 0
+
+    def revision_frame(self):
+        """
+        The answers to revise as a table.
+        """
+        return pd.DataFrame(self.revision, columns=["English", "Word Class", "Form", "Correct German"])
+
+    def word_results(self):
+        """
+        Whether each planned word was answered correctly (all of its asked forms), in plan order.
+        """
+        if self.result is not None:
+            return self.result.row_correct.to_numpy()
+        wrong = {english for english, _, _, _ in self.revision}
+        return [english not in wrong for english in self.plan.deck.frame[KEY_COLUMN].iloc[self.plan.positions]]
+
+    def finish(self, scores=None):
+        """
+        Records the test: the words of a due-word plan are rescheduled, and the score is logged
+        to scores (a Scores instance) when given. Returns the achievements unlocked.
+        """
+        if self.plan.schedule is not None and self.total:
+            self.plan.schedule.record(self.plan.positions, self.word_results())
+        if scores is None or not self.total:
+            return []
+        return scores.record(self.percent, self.total)
+
+
+# ----------------- Diary -----------------
+def answers_to_rows(correct_answers):
+    """
+    Turns per-form test answers ({"english", "german", "form", "word_class"}) into diary rows:
+    the base form fills 'german', past/perfect fill the tense columns.
+    Returns (rows, insert mask): only base-form answers may add a new word.
+    """
+    results = pd.DataFrame(correct_answers, columns=["english", "german", "form", "word_class"])
+    rows = pd.DataFrame({
+        "english": results["english"],
+        "word_class": results["word_class"],
+        "german": results["german"].where(results["form"] == "Base"),
+        "past_tense": results["german"].where(results["form"] == "Past"),
+        "perfect_tense": results["german"].where(results["form"] == "Perfect"),
+    })
+    return rows, (results["form"] == "Base").to_numpy()
+
+
+def merge_into_diary(diary, rows, fill_columns=None, insert_mask=None):
+    """
+    Merges rows into an in-memory diary (see bulk_upsert): new words are appended, existing
+    words only get their empty cells filled. New words without a word class become nouns.
+    Returns (merged diary, summary, changes), where changes is the change set to write
+    to the diary store (see diary_store.diff_frames).
+    """
+    merged, summary = bulk_upsert(diary, rows, KEY_COLUMN, fill_columns=fill_columns, insert_mask=insert_mask)
+    if not (summary["inserted"] or summary["filled"]):
+        return merged, summary, []
+    new_rows = merged.index >= len(diary)
+    merged.loc[new_rows, "word_class"] = merged.loc[new_rows, "word_class"].fillna("noun")
+    return merged, summary, diff_frames(diary.reset_index(drop=True), merged, KEY_COLUMN)
+
+
+def add_to_diary(diary_path, rows, diary=None, fill_columns=None, insert_mask=None):
+    """
+    Merges rows into the diary file and writes only the new and completed rows through the
+    diary store (so the change can be undone). diary is the caller's copy of the diary, if it has one.
+    Returns (merged diary, summary).
+    """
+    store = library.diary_store(diary_path)
+    diary = library.load_csv(diary_path) if diary is None else diary
+    merged, summary, changes = merge_into_diary(diary, rows, fill_columns, insert_mask)
+    if changes:
+        store.apply(changes)
+    return merged, summary
+
+
+# ----------------- Scores -----------------
+class Scores:
+    """
+    Score history and achievements of a vocabulary folder.
+    The score journal keeps the history and its running statistics (see ScoreJournal);
+    achievements are kept in achievements.csv and loaded on first use.
+    """
+    def __init__(self, folder=library.VOCAB_FOLDER):
+        self.journal = ScoreJournal(folder)
+        self.achievements_file = os.path.join(folder, ACHIEVEMENTS_FILE)
+        self._achievements = None
+
+    def stats(self):
+        """
+        The running score statistics (best, streaks, games per day, ...).
+        """
+        return self.journal.stats.load()
+
+    def history(self):
+        """
+        The full score history as a DataFrame.
+        """
+        return self.journal.read()
+
+    def achievements(self):
+        """
+        The achievements earned so far as a DataFrame (Achievement, DateEarned).
+        Creates the achievements file if there is none.
+        """
+        if self._achievements is None:
+            if os.path.exists(self.achievements_file):
+                self._achievements = pd.read_csv(self.achievements_file)
+            else:
+                self._achievements = pd.DataFrame(columns=ACHIEVEMENT_COLUMNS)
+                self._achievements.to_csv(self.achievements_file, index=False)
+        return self._achievements
+
+    def record(self, score_percent, total_questions):
+        """
+        Logs one game and returns the names of the achievements it unlocked.
+        """
+        self.journal.append(score_percent, total_questions)
+        unlocked = []
+        if self.stats()["current_streak"] >= PERFECT_STREAK and self.unlock(STREAK_ACHIEVEMENT):
+            unlocked.append(STREAK_ACHIEVEMENT)
+        if float(score_percent) == 100 and self.unlock(FIRST_PERFECT_ACHIEVEMENT):
+            unlocked.append(FIRST_PERFECT_ACHIEVEMENT)
+        return unlocked
+
+    def unlock(self, achievement_name):
+        """
+        Adds an achievement and saves the file. Returns False if it was already earned.
+        """
+        achievements = self.achievements()
+        if achievement_name in achievements["Achievement"].values:
+            return False
+        earned = {"Achievement": achievement_name, "DateEarned": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+        self._achievements = pd.concat([achievements, pd.DataFrame([earned])], ignore_index=True)
+        self._achievements.to_csv(self.achievements_file, index=False)
+        return True
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# ----------------- Constants -----------------
+LOCK_SUFFIX = ".lock"  # Lock file kept next to the protected file
+
+# Per lock file: [thread lock, open lock file, nesting depth], shared by every FileLock in this process
+_states = {}
+_states_guard = threading.Lock()
+
+
+# ----------------- Advisory File Lock -----------------
+class FileLock:
+    """
+    Exclusive advisory lock on a file, shared by threads and processes (fcntl.flock on POSIX,
+    msvcrt.locking on Windows) through a separate <file>.lock file.
+    Only writers take it: readers never wait, because writers replace files atomically (see atomic_write).
+    The lock is reentrant within a process, so a writer can call other locking writers.
+    """
+    def __init__(self, path):
+        self.lock_path = os.path.abspath(path) + LOCK_SUFFIX
+        with _states_guard:
+            self._state = _states.setdefault(self.lock_path, [threading.RLock(), None, 0])
+
+    def __enter__(self):
+        state = self._state
+        state[0].acquire()
+        if state[2] == 0:
+            try:
+                os.makedirs(os.path.dirname(self.lock_path), exist_ok=True)
+                f = open(self.lock_path, "a+")
+                _lock_file(f)
+            except BaseException:
+                state[0].release()
+                raise
+            state[1] = f
+        state[2] += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        state = self._state
+        state[2] -= 1
+        if state[2] == 0:
+            f, state[1] = state[1], None
+            _unlock_file(f)
+            f.close()
+        state[0].release()
+
+
+def _lock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # Gives up after ~10 s, so keep trying
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# ----------------- Atomic Writes -----------------
+@contextmanager
+def atomic_write(path):
+    """
+    Yields a temporary path next to path. Once the caller has written it, it is flushed to disk
+    and renamed over path in one step, so readers see either the old or the new file, never a
+    half-written one. On error the temporary file is removed and path is left untouched.
+    """
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        yield temp_path
+        with open(temp_path, "rb+") as f:
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+from vocab_core.matching import ALMOST, CORRECT, default_matcher
+from vocab_core.normalize import normalize_series
+from vocab_core.timing import timed
+
+# ----------------- Constants -----------------
+PLACEHOLDERS = ["–", "-"]  # Cells marked with these have no answer and are not graded
+
+
+# ----------------- Grading -----------------
+class GradeResult:
+    """
+    Outcome of grading a sheet of answers.
+    cell_correct: DataFrame of booleans, one per graded cell (placeholder cells count as correct)
+    graded: DataFrame of booleans, False where the cell was skipped because of a placeholder
+    row_correct: Series of booleans, True where every graded cell of the row is correct
+    revision: the answer rows the user got wrong
+    cell_almost: DataFrame of booleans, True where a graded cell is off by a small typo (see AnswerMatcher)
+    row_almost: Series of booleans, True where the row is not correct but only because of typos
+    """
+    def __init__(self, cell_correct, graded, row_correct, revision, cell_almost=None, row_almost=None):
+        self.cell_correct = cell_correct
+        self.graded = graded
+        self.row_correct = row_correct
+        self.revision = revision
+        self.cell_almost = cell_almost if cell_almost is not None else cell_correct & False
+        self.row_almost = row_almost if row_almost is not None else row_correct & False
+
+    @property
+    def correct_ids(self):
+        return self.row_correct.index[self.row_correct].tolist()
+
+    @property
+    def incorrect_ids(self):
+        return self.row_correct.index[~self.row_correct].tolist()
+
+    @property
+    def almost_ids(self):
+        return self.row_almost.index[self.row_almost].tolist()
+
+    @property
+    def marks(self):
+        return int(self.row_correct.sum())
+
+
+@timed("grade_frames")
+def grade_frames(answers, responses, columns=None, matcher=default_matcher, normalized=False):
+    """
+    Grades a whole sheet at once.
+    Both frames are normalized column by column (NFC, stripped, casefolded, like normalize_string
+    plus case-insensitive matching) and compared cell by cell with matcher (umlaut spellings count
+    as correct, small typos as almost correct). Rows are matched on the index.
+    matcher=None compares exactly. normalized=True skips the normalization, for frames that are
+    already normalized (see normalize_series), e.g. an answer key graded against many sheets.
+    """
+    if columns is None:
+        columns = [col for col in answers.columns if col in responses.columns]
+    responses = responses.reindex(index=answers.index, columns=columns)
+
+    if normalized:
+        expected, given = answers[columns], responses
+    else:
+        expected = pd.DataFrame({col: normalize_series(answers[col]) for col in columns}, index=answers.index)
+        given = pd.DataFrame({col: normalize_series(responses[col]) for col in columns}, index=answers.index)
+
+    graded = ~(expected.isin(PLACEHOLDERS) | given.isin(PLACEHOLDERS))
+    if matcher is None:
+        cell_correct = (expected == given) | ~graded
+        cell_almost = cell_correct & False
+    else:
+        # Placeholder cells are not graded, so they are not matched either
+        verdicts = pd.DataFrame({col: _match_graded(matcher, given[col], expected[col], graded[col].to_numpy())
+                                 for col in columns}, index=answers.index)
+        cell_correct = (verdicts == CORRECT) | ~graded
+        cell_almost = (verdicts == ALMOST) & graded
+    row_correct = cell_correct.all(axis=1)
+    row_almost = ~row_correct & (cell_correct | cell_almost).all(axis=1)
+    return GradeResult(cell_correct, graded, row_correct, answers.loc[~row_correct], cell_almost, row_almost)
+
+
+def _match_graded(matcher, given, expected, graded):
+    verdicts = np.full(len(given), CORRECT, dtype=object)
+    rows = np.flatnonzero(graded)
+    if rows.size:
+        verdicts[rows] = matcher.match_normalized_series(given.iloc[rows], expected.iloc[rows]).to_numpy()
+    return verdicts
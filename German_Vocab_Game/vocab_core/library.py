@@ -0,0 +1,132 @@
+"""
+Helpers shared by the Streamlit pages and the console game: string normalization, the vocabulary file list,
+loading and saving decks, search and the diary store.
+Importing this module has no side effects and is cheap: pandas, NumPy and the deck modules are
+imported by the functions that need them, on first use.
+"""
+import os
+import re
+import unicodedata
+
+from vocab_core import timing
+
+# ----------------- Constants -----------------
+VOCAB_FOLDER = "vocab_data"  # Folder to store all vocabulary-related CSV files
+DIARY_FILE = "diary.csv"     # Main diary CSV file where user's words are stored (diary.sqlite once migrated)
+
+# Regex pattern of a valid typed word (letters, umlauts, ß, hyphens, apostrophes, spaces)
+VALID_WORD = re.compile(r"^[A-Za-zÄÖÜäöüß'\- ]+$")
+
+
+def __getattr__(name):
+    # VOCAB_COLUMNS (the canonical deck columns) lives in vocab_core.schema, which needs pandas
+    if name == "VOCAB_COLUMNS":
+        from vocab_core.schema import COLUMNS
+        return COLUMNS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# ----------------- String Helpers -----------------
+def normalize_string(s):
+    """
+    Normalize string to NFC form (composed Unicode form) for consistent comparison.
+    """
+    return unicodedata.normalize('NFC', str(s))
+
+
+# ----------------- Vocabulary Loader -----------------
+def load_vocab_files(folder=VOCAB_FOLDER, diary_file=DIARY_FILE):
+    """
+    Lists all vocabulary files (CSV, Feather, npz or SQLite) in the folder from its catalog manifest
+    (see vocab_core.catalog): only files that changed since the last call are read.
+    Marks the main diary file (CSV or its migrated SQLite version) as editable.
+    Returns a list of dictionaries with name, path, editable, kind, rows and word_classes.
+    """
+    from vocab_core.catalog import catalog_for
+    return catalog_for(folder, diary_file).refresh()
+
+
+def deck_files(folder=VOCAB_FOLDER, diary_file=DIARY_FILE):
+    """
+    The files that can be learned and tested from (decks and the diary), without the score,
+    achievement and backup files, which the catalog recognizes by type.
+    """
+    from vocab_core.catalog import catalog_for
+    return catalog_for(folder, diary_file).decks()
+
+
+@timing.timed("load_csv")
+def load_csv(file_path, expected_columns=None, compact=False):
+    """
+    Load a deck file (CSV, Feather, npz or SQLite) in the canonical schema (see vocab_core.schema) and ensure
+    any extra expected columns exist. Legacy layouts (e.g. 'Verb Tenses' lists) are converted on load.
+    Creates the CSV file if it does not exist.
+    Parsed decks are shared by the web app and the console through the deck cache until they change on disk.
+    compact=True returns the cache's compact form (categorical/Arrow columns) for read-only use.
+    """
+    from vocab_core.schema import empty_deck, load_deck
+
+    if not os.path.exists(file_path):
+        df = empty_deck()
+        save_csv(df, file_path)
+        return df
+
+    df = load_deck(file_path, compact)
+    missing = [col for col in expected_columns or [] if col not in df.columns]
+    if missing:
+        df = df.assign(**{col: "" for col in missing})
+    return df
+
+
+@timing.timed("save_csv")
+def save_csv(df, file_path):
+    """
+    Saves a pandas DataFrame (as CSV, Feather or npz, by file extension) and drops its stale cached copy.
+    """
+    from vocab_core.deck_cache import deck_cache
+    from vocab_core.storage import write_table
+
+    write_table(df, file_path)
+    deck_cache.invalidate(file_path)
+
+
+# ----------------- Search -----------------
+@timing.timed("search_vocab")
+def search_vocab(query, limit=50, decks=None):
+    """
+    Searches the English and German words of all decks and the diary (or of the files named in decks),
+    prefix and substring matches. Decks that changed on disk since the last search are re-indexed first.
+    """
+    from vocab_core.search_index import search_index
+    return search_index.refresh(deck_files()).search(query, limit, decks=decks)
+
+
+def complete_word(prefix, limit=10, decks=None):
+    """
+    Autocomplete suggestions for prefix from all indexed decks (or the files named in decks).
+    Call search_vocab or refresh_search first.
+    """
+    from vocab_core.search_index import search_index
+    return search_index.complete(prefix, limit, decks=decks)
+
+
+def refresh_search():
+    """
+    Brings the search index up to date with the vocabulary files and returns it.
+    """
+    from vocab_core.search_index import search_index
+    return search_index.refresh(deck_files())
+
+
+# ----------------- Diary -----------------
+def diary_store(diary_path):
+    """
+    Returns the store used to write row-level changes to the diary (SQLite or whole-file CSV).
+    A diary still in a legacy layout is migrated to the canonical schema first.
+    """
+    from vocab_core.diary_store import open_diary_store
+    from vocab_core.schema import KEY_COLUMN, migrate_deck
+
+    migrate_deck(diary_path)
+    return open_diary_store(diary_path, KEY_COLUMN, load_csv, save_csv)
+
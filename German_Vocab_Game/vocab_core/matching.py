@@ -0,0 +1,138 @@
+import numpy as np
+import pandas as pd
+
+from vocab_core.normalize import normalize_key, normalize_series
+
+# ----------------- Constants -----------------
+CORRECT = "correct"
+ALMOST = "almost"        # Off by a small typo: reported separately, not counted as correct
+WRONG = "wrong"
+
+MAX_TYPOS = 1            # Edits (insert, delete, substitute) still counted as "almost correct"
+MIN_TYPO_LENGTH = 4      # Shorter answers must match exactly ("er" vs "es" is not a typo)
+# Umlauts typed without a German keyboard; normalize_key already folds ß to ss
+UMLAUTS = {"ä": "ae", "ö": "oe", "ü": "ue"}
+TRANSLITERATION = str.maketrans(UMLAUTS)
+
+
+# ----------------- Bounded Edit Distance -----------------
+def bounded_levenshtein(a, b, k):
+    """
+    Levenshtein distance between a and b if it is at most k, otherwise k + 1.
+    Bit-parallel (Myers/Hyyrö): one column of the edit-distance table is two bit vectors of
+    len(a) bits (Python ints, so any length works), updated with a few word operations per
+    character of b. Stops as soon as the distance can no longer come back under k.
+    """
+    if a == b:
+        return 0
+    m, n = len(a), len(b)
+    if abs(m - n) > k:
+        return k + 1
+    if m == 0 or n == 0:
+        return max(m, n)
+
+    peq = {}  # Character -> bit mask of its positions in a
+    for i, char in enumerate(a):
+        peq[char] = peq.get(char, 0) | (1 << i)
+    mask = (1 << m) - 1
+    last = 1 << (m - 1)
+    pv, mv, score = mask, 0, m  # Vertical +1/-1 deltas; score is the distance a vs b[:j]
+
+    for j, char in enumerate(b):
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & mask)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & mask
+        mh = (mh << 1) & mask
+        pv = mh | (~(xv | ph) & mask)
+        mv = ph & xv
+        # The remaining n - j - 1 characters can lower the distance by at most one each
+        if score - (n - j - 1) > k:
+            return k + 1
+    return score if score <= k else k + 1
+
+
+def transliterate_series(series):
+    """
+    Column-wise str.translate(TRANSLITERATION), done as vectorized replacements.
+    """
+    for umlaut, spelling in UMLAUTS.items():
+        series = series.str.replace(umlaut, spelling, regex=False)
+    return series
+
+
+# ----------------- Answer Matcher -----------------
+class AnswerMatcher:
+    """
+    Tolerant comparison of answers with expected answers.
+    Both are normalized like normalize_key (NFC, stripped, casefolded, so ß matches ss); with
+    transliterate, ä/ö/ü also match ae/oe/ue, and such spellings count as correct.
+    Answers within max_typos edits of the expected one (for answers of at least min_typo_length
+    characters) are "almost correct"; max_typos=0 turns typo tolerance off.
+    """
+    def __init__(self, max_typos=MAX_TYPOS, transliterate=True, min_typo_length=MIN_TYPO_LENGTH):
+        self.max_typos = max_typos
+        self.transliterate = transliterate
+        self.min_typo_length = min_typo_length
+
+    def fold(self, normalized):
+        """
+        Spelling-insensitive form of an already normalized answer.
+        """
+        return normalized.translate(TRANSLITERATION) if self.transliterate else normalized
+
+    def match_normalized(self, given, expected):
+        """
+        CORRECT, ALMOST or WRONG for two already normalized answers.
+        """
+        if given == expected:
+            return CORRECT
+        given, expected = self.fold(given), self.fold(expected)
+        if given == expected:
+            return CORRECT
+        return self._typo(given, expected)
+
+    def match(self, given, expected):
+        """
+        CORRECT, ALMOST or WRONG for a raw answer and the expected answer.
+        """
+        return self.match_normalized(normalize_key(given), normalize_key(expected))
+
+    def match_series(self, given, expected):
+        """
+        Matches two aligned Series of raw answers at once. Returns a Series of CORRECT/ALMOST/WRONG.
+        Exact and transliterated matches are found with vectorized string operations; the edit
+        distance is only computed for the remaining mismatches.
+        """
+        return self.match_normalized_series(normalize_series(given), normalize_series(expected))
+
+    def match_normalized_series(self, given, expected):
+        """
+        match_series for Series that are already normalized (see normalize_series).
+        """
+        if self.transliterate:
+            given, expected = transliterate_series(given), transliterate_series(expected)
+        equal = (given == expected).to_numpy()
+        result = np.where(equal, CORRECT, WRONG).astype(object)
+        mismatches = np.flatnonzero(~equal)
+        if mismatches.size:
+            given_values, expected_values = given.to_numpy(object), expected.to_numpy(object)
+            result[mismatches] = [self._typo(given_values[i], expected_values[i]) for i in mismatches]
+        return pd.Series(result, index=given.index)
+
+    def _typo(self, given, expected):
+        if self.max_typos <= 0 or not given or len(expected) < self.min_typo_length:
+            return WRONG
+        if bounded_levenshtein(given, expected, self.max_typos) <= self.max_typos:
+            return ALMOST
+        return WRONG
+
+
+# Shared matcher with the default settings, used by the grader and the console test
+default_matcher = AnswerMatcher()
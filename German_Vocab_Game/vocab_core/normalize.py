@@ -0,0 +1,31 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+def normalize_string(s):
+    """
+    Normalize string to NFC form (composed Unicode form) for consistent comparison.
+    """
+    return unicodedata.normalize('NFC', str(s))
+
+
+def normalize_key(s):
+    """
+    Lookup key for a word: NFC-normalized, stripped and casefolded,
+    so "Straße", " straße" and "STRASSE" style variants of the same entry compare equal.
+    """
+    return unicodedata.normalize('NFC', str(s)).strip().casefold()
+
+
+def normalize_series(series):
+    """
+    Column-wise normalize_key for a pandas Series. Missing values become "".
+    Categorical columns are normalized once per category.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Code -1 (missing) picks the trailing ""
+        categories = np.append(normalize_series(pd.Series(series.cat.categories, dtype=object)).to_numpy(), "")
+        return pd.Series(categories[series.cat.codes.to_numpy()], index=series.index, dtype=object)
+    return series.fillna("").astype(str).str.normalize('NFC').str.strip().str.casefold()
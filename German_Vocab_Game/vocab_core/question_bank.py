@@ -0,0 +1,153 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from vocab_core.catalog import content_hash
+from vocab_core.deck_cache import deck_cache
+from vocab_core.normalize import normalize_series
+from vocab_core.questions import Question
+from vocab_core.timing import timed
+
+# ----------------- Constants -----------------
+FORMS = ["Base", "Past", "Perfect"]  # Question forms, in the order they are asked for a word
+FORM_COLUMNS = {"Base": "german", "Past": "past_tense", "Perfect": "perfect_tense"}  # Answer column of each form
+MAX_BANKS = 16                       # Question banks kept in memory at once
+
+# Built banks: content hash -> QuestionBank (least recently used first)
+_banks = OrderedDict()
+# Content hash of deck files: absolute path -> (file signature, hash)
+_file_hashes = {}
+_lock = threading.Lock()
+
+
+# ----------------- Question Bank -----------------
+class QuestionBank:
+    """
+    Every question of a deck, expanded once into a table with one row per question:
+    word (row position in the deck), form, prompt (the English word), word_class, answer
+    and normalized answer (see normalize_series). Verbs get a Past and a Perfect row when the
+    deck has those tenses. Rows are ordered by word, then form, so the questions of a word are adjacent.
+    Test modes select bank rows by position instead of walking the deck.
+    """
+    def __init__(self, table, word_count):
+        self.table = table
+        self.word_count = word_count
+        self.words = table["word"].to_numpy()
+        # Bank rows of deck row w are starts[w]:starts[w + 1]
+        self.starts = np.searchsorted(self.words, np.arange(word_count + 1))
+
+    def __len__(self):
+        return len(self.table)
+
+    def rows(self, word_class=None):
+        """
+        Positions of all bank rows, or of the rows of one word class.
+        """
+        if word_class is None:
+            return np.arange(len(self.table))
+        return np.flatnonzero((self.table["word_class"] == word_class).to_numpy())
+
+    def rows_for_words(self, positions):
+        """
+        Positions of the bank rows of the given deck rows, in the order the words are given.
+        """
+        positions = np.asarray(positions, dtype=np.intp)
+        begin = self.starts[positions]
+        lengths = self.starts[positions + 1] - begin
+        # Run i covers begin[i] .. begin[i] + lengths[i] - 1
+        offsets = np.repeat(begin - (np.cumsum(lengths) - lengths), lengths)
+        return offsets + np.arange(offsets.size)
+
+    def word_positions(self, word_class=None):
+        """
+        Deck row positions of all words, or of the words of one word class.
+        """
+        base = self.rows(word_class)
+        return np.unique(self.words[base])
+
+    def questions(self, rows):
+        """
+        Returns the bank rows at the given positions as Question records.
+        """
+        part = self.table.iloc[np.asarray(rows, dtype=np.intp)]
+        return [Question(english, word_class, form, answer, normalized)
+                for english, word_class, form, answer, normalized in zip(
+                    part["prompt"], part["word_class"], part["form"], part["answer"], part["normalized"])]
+
+
+@timed("build_bank")
+def build_bank(deck):
+    """
+    Expands a canonical deck into a QuestionBank with one vectorized pass per form.
+    """
+    n = len(deck)
+    is_verb = (deck["word_class"] == "verb").to_numpy(dtype=bool, na_value=False)
+    words, forms, answers = [], [], []
+    for code, form in enumerate(FORMS):
+        column = deck[FORM_COLUMNS[form]]
+        if form == "Base":
+            mask = np.ones(n, dtype=bool)
+        else:
+            present = (column.notna() & (column.astype(str).str.strip() != "")).to_numpy(dtype=bool)
+            mask = is_verb & present
+        positions = np.flatnonzero(mask)
+        words.append(positions)
+        forms.append(np.full(positions.size, code, dtype=np.int8))
+        answers.append(column.astype(object).to_numpy()[positions])
+
+    word, form, answer = np.concatenate(words), np.concatenate(forms), np.concatenate(answers)
+    order = np.lexsort((form, word))
+    word, form, answer = word[order], form[order], answer[order]
+    answer = pd.Series(answer, dtype=object)
+    table = pd.DataFrame({
+        "word": word,
+        "form": pd.Categorical.from_codes(form, FORMS),
+        "prompt": deck["english"].to_numpy()[word],
+        "word_class": pd.Categorical(deck["word_class"].to_numpy()[word]),
+        "answer": answer,
+        "normalized": normalize_series(answer),
+    })
+    return QuestionBank(table, n)
+
+
+def question_bank(deck, deck_path=None):
+    """
+    Returns the question bank of deck, building it only once per deck content.
+    Banks are keyed by a hash of the deck content: the file bytes when deck_path is given
+    (hashed once per file version), otherwise the frame itself.
+    """
+    key = _file_hash(deck_path) if deck_path is not None else _frame_hash(deck)
+    with _lock:
+        bank = _banks.get(key)
+        if bank is not None:
+            _banks.move_to_end(key)
+            return bank
+
+    bank = build_bank(deck)
+    with _lock:
+        _banks[key] = bank
+        while len(_banks) > MAX_BANKS:
+            _banks.popitem(last=False)
+    return bank
+
+
+def _file_hash(deck_path):
+    path = os.path.abspath(deck_path)
+    signature = deck_cache.file_signature(path)
+    with _lock:
+        cached = _file_hashes.get(path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    key = "file:" + content_hash(path)
+    with _lock:
+        _file_hashes[path] = (signature, key)
+    return key
+
+
+def _frame_hash(deck):
+    hashes = pd.util.hash_pandas_object(deck, index=False).to_numpy()
+    return "frame:" + hashlib.blake2b(hashes.tobytes(), digest_size=16).hexdigest()
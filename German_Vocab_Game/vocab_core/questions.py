@@ -0,0 +1,33 @@
+from vocab_core.normalize import normalize_key
+
+
+# ----------------- Question Record -----------------
+class Question:
+    """
+    One test question: the English word, its word class, the form asked for ("Base", "Past"
+    or "Perfect"), the expected German answer and its normalized form (see normalize_key),
+    which answers are compared against.
+    __slots__ keeps it as small as a tuple (no per-instance __dict__), which matters when a
+    large deck is turned into one question per verb form. It still unpacks like the old tuples:
+    english, word_class, form, answer = question
+    """
+    __slots__ = ("english", "word_class", "form", "answer", "normalized")
+
+    def __init__(self, english, word_class, form, answer, normalized=None):
+        self.english = english
+        self.word_class = word_class
+        self.form = form
+        self.answer = answer
+        self.normalized = normalize_key(answer) if normalized is None else normalized
+
+    def __iter__(self):
+        return iter((self.english, self.word_class, self.form, self.answer))
+
+    def __eq__(self, other):
+        return isinstance(other, Question) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __repr__(self):
+        return f"Question({self.english!r}, {self.word_class!r}, {self.form!r}, {self.answer!r})"
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from vocab_core.timing import timed
+
+
+# ----------------- Sampling -----------------
+@timed("sample_positions")
+def sample_positions(n, k, replace=False, seed=None, strata=None):
+    """
+    Draws k row positions out of n with NumPy.
+    Without replacement k is capped at n. If strata (one label per row, e.g. the word_class column)
+    is given, every label gets a share of the sample proportional to how often it occurs.
+    A seed makes the draw repeatable.
+    Returns a NumPy array of positions in random order.
+    """
+    rng = np.random.default_rng(seed)
+    if not replace:
+        k = min(k, n)
+    if n == 0 or k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if strata is None:
+        return rng.choice(n, size=k, replace=replace)
+
+    codes, _ = pd.factorize(strata, use_na_sentinel=False)  # Missing labels form their own stratum
+    counts = np.bincount(codes)
+
+    # Largest-remainder allocation of k over the strata
+    exact = k * counts / n
+    alloc = np.floor(exact).astype(np.intp)
+    remainder = k - alloc.sum()
+    if remainder > 0:
+        alloc[np.argsort(alloc - exact, kind="stable")[:remainder]] += 1
+    if not replace:
+        alloc = np.minimum(alloc, counts)
+
+    picks = []
+    for code, size in enumerate(alloc):
+        if size > 0:
+            rows = np.flatnonzero(codes == code)
+            picks.append(rows[rng.choice(rows.size, size=size, replace=replace)])
+    positions = np.concatenate(picks)
+    rng.shuffle(positions)
+    return positions
+
+
+def sample_frame(df, k, replace=False, seed=None, stratify_by=None):
+    """
+    Returns k random rows of df, taken with a single iloc.
+    stratify_by is an optional column name (e.g. "word_class") to keep the mix of that column.
+    """
+    strata = df[stratify_by] if stratify_by else None
+    return df.iloc[sample_positions(len(df), k, replace=replace, seed=seed, strata=strata)]
@@ -0,0 +1,237 @@
+import os
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.storage import has_pyarrow, is_deck_file, read_columns, read_table, write_table
+
+# ----------------- Canonical Deck Schema -----------------
+SCHEMA_VERSION = 1
+COLUMNS = ["word_class", "english", "article", "german", "past_tense", "perfect_tense", "plural"]
+# Every column holds text: Python str values, NaN where a cell is empty
+DTYPES = {col: object for col in COLUMNS}
+KEY_COLUMN = "english"  # Column the diary and the review schedules are keyed on
+WORD_CLASSES = ["noun", "verb", "adjective", "adverb", "pronoun", "preposition", "conjunction", "interjection"]
+CATEGORY_COLUMNS = ["word_class", "article"]  # Few distinct values: held as categorical codes in compact decks
+
+# Legacy console layout: English, German, Word Class, 'Verb Tenses' as a stringified Python list
+LEGACY_TENSES = "verb_tenses"
+
+# One item of a stringified tense list: 'text', "text" or None
+_ITEM = r"""(?:'(?P<{0}1>[^']*)'|"(?P<{0}2>[^"]*)"|None)"""
+_TENSES = re.compile(r"^\s*\[\s*" + _ITEM.format("past") + r"?\s*(?:,\s*" + _ITEM.format("perfect") + r"\s*)?,?\s*\]\s*$")
+
+
+# ----------------- Conversion -----------------
+def column_name(name):
+    """
+    Canonical spelling of a column name: "Word Class" -> "word_class", "English" -> "english".
+    """
+    return re.sub(r"\s+", "_", str(name).strip()).lower()
+
+
+def is_deck_table(columns):
+    """
+    True if a table with these column names is a deck (it has English and German columns, in any
+    known layout), as opposed to score, achievement and other tables kept next to the decks.
+    """
+    names = {column_name(col) for col in columns}
+    return KEY_COLUMN in names and "german" in names
+
+
+def to_canonical(df):
+    """
+    Converts a deck in any known layout (web app columns, legacy console columns, or a mix)
+    into the canonical schema, without evaluating any cell as Python:
+    - column names are normalized ("Word Class" -> word_class),
+    - the legacy 'Verb Tenses' lists are split into past_tense/perfect_tense with one regex pass,
+    - word classes are lower case, missing columns are added and everything gets the schema dtypes
+      (empty cells are NaN whatever the file format).
+    Columns that are not part of the schema are kept after the canonical ones.
+    """
+    df = df.rename(columns=column_name)
+    df = df.loc[:, ~df.columns.duplicated()]
+
+    if LEGACY_TENSES in df.columns:
+        past, perfect = split_tenses(df[LEGACY_TENSES])
+        for col, values in (("past_tense", past), ("perfect_tense", perfect)):
+            df[col] = df[col].where(_present(df[col]), values) if col in df.columns else values
+        df = df.drop(columns=LEGACY_TENSES)
+
+    for col in COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    extra = [col for col in df.columns if col not in DTYPES]
+    df = df[COLUMNS + extra].astype(DTYPES)
+    df[COLUMNS] = df[COLUMNS].where(df[COLUMNS].notna(), np.nan)  # None (SQLite, Feather) -> NaN like CSV
+    df["word_class"] = df["word_class"].str.strip().str.lower()
+    return df.reset_index(drop=True)
+
+
+def split_tenses(values):
+    """
+    Splits stringified tense lists ("['ging', 'gegangen']", "['ging', None]") into two Series
+    (past, perfect) with one vectorized regex pass (Arrow compute if pyarrow is installed).
+    Cells that are already lists are handled the same way. Unparseable or empty cells give NaN.
+    """
+    text = values.astype(object).where(values.notna(), "").astype(str)
+    if has_pyarrow():
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        parts = pc.extract_regex(pa.array(text, type=pa.string()), _TENSES.pattern)
+        result = []
+        for name in ("past", "perfect"):
+            # Unmatched groups are "" in Arrow: take whichever quote style matched, "" means no value
+            first, second = parts.field(name + "1"), parts.field(name + "2")
+            value = pc.if_else(pc.equal(first, ""), second, first)
+            value = pc.if_else(pc.equal(value, ""), pa.scalar(None, pa.string()), value)
+            result.append(pd.Series(value.to_numpy(zero_copy_only=False), index=values.index, dtype=object))
+    else:
+        parts = text.str.extract(_TENSES)
+        result = [parts[name + "1"].fillna(parts[name + "2"]) for name in ("past", "perfect")]
+    past, perfect = [part.where(part.notna() & (part != "")) for part in result]
+    return past.set_axis(values.index).rename("past_tense"), perfect.set_axis(values.index).rename("perfect_tense")
+
+
+def _present(values):
+    return values.notna() & (values.astype(str).str.strip() != "")
+
+
+def empty_deck():
+    """
+    An empty deck with the canonical columns and dtypes.
+    """
+    return pd.DataFrame(columns=COLUMNS).astype(DTYPES)
+
+
+def read_deck(file_path):
+    """
+    Reads a deck file in any supported format and layout straight into the canonical schema.
+    Used by both frontends as the deck cache loader, so they share parsed decks.
+    """
+    try:
+        df = read_table(file_path, memory_map=True)
+    except pd.errors.ParserError:
+        df = read_table(file_path)
+    return to_canonical(df)
+
+
+def load_deck(file_path, compact=False):
+    """
+    Returns the canonical deck at file_path from the shared deck cache (parsed once per file version,
+    whichever frontend asks first). The cache holds the compact form (see compact_deck), which read-only
+    callers take with compact=True, and the plain object columns everyone else gets to edit, expanded
+    from it once per file version.
+    """
+    if compact:
+        return deck_cache.get(file_path, lambda path: compact_deck(read_deck(path)), variant=("compact", SCHEMA_VERSION))
+    return deck_cache.get(file_path, lambda path: expand_deck(load_deck(path, compact=True)),
+                          variant=("expanded", SCHEMA_VERSION))
+
+
+# ----------------- Compact Representation -----------------
+def compact_deck(df):
+    """
+    Returns df with a smaller memory footprint:
+    - word_class and article become categoricals (one small integer code per row),
+    - the word columns become Arrow-backed strings when pyarrow is installed (one buffer per column
+      instead of a Python object per cell); otherwise repeated strings are interned so they are stored once.
+    Missing cells stay NaN, so comparisons and filters behave as on the object columns.
+    """
+    df = df.copy()
+    string_dtype = _string_dtype()
+    for col in COLUMNS:
+        if col not in df.columns:
+            continue
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype("category")
+        elif string_dtype is not None:
+            df[col] = df[col].astype(string_dtype)
+        else:
+            df[col] = pd.Series([sys.intern(v) if isinstance(v, str) else v for v in df[col]],
+                                index=df.index, dtype=object)
+    return df
+
+
+def expand_deck(df):
+    """
+    Inverse of compact_deck: plain object columns with NaN for empty cells, safe to edit in place.
+    """
+    columns = [col for col in COLUMNS if col in df.columns and df[col].dtype != object]
+    if not columns:
+        return df
+    df = df.astype({col: object for col in columns})
+    df[columns] = df[columns].where(df[columns].notna(), np.nan)
+    return df
+
+
+def memory_usage(df):
+    """
+    Bytes held by df, including the strings themselves.
+    """
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def _string_dtype():
+    if not has_pyarrow():
+        return None
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:  # pandas < 2.3 has no NaN-semantics string dtype
+        return None
+
+
+# ----------------- Migration -----------------
+def migrate_deck(file_path):
+    """
+    Rewrites one deck file in the canonical schema (same format). Returns True if it was changed.
+    The change journal of a migrated diary is cleared, since its entries use the old columns.
+    Only the header is read when the file is already canonical, so this is cheap to call on every start.
+    """
+    if not os.path.exists(file_path) or read_columns(file_path) == COLUMNS:
+        return False
+    write_table(to_canonical(read_table(file_path)), file_path)
+    if os.path.exists(_journal_state(file_path)):
+        from vocab_core.diary_journal import DiaryJournal
+        DiaryJournal(file_path, KEY_COLUMN).clear()
+    return True
+
+
+def _journal_state(file_path):
+    from vocab_core.diary_journal import JOURNAL_FOLDER
+    folder, file_name = os.path.split(file_path)
+    return os.path.join(folder, JOURNAL_FOLDER, os.path.splitext(file_name)[0] + ".json")
+
+
+def migrate_folder(folder):
+    """
+    Migrates every deck file in folder (score and achievement tables are recognized by their
+    columns and left alone). Returns the names of the files that were rewritten.
+    """
+    migrated = []
+    for file_name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, file_name)
+        if is_deck_file(file_name) and is_deck_table(read_columns(path)):
+            if migrate_deck(path):
+                migrated.append(file_name)
+    return migrated
+
+
+if __name__ == "__main__":
+    # python -m vocab_core.schema migrate [folder or deck file]
+    # python -m vocab_core.schema memory <deck file>
+    if len(sys.argv) == 3 and sys.argv[1] == "memory":
+        deck = read_deck(sys.argv[2])
+        before, after = memory_usage(deck), memory_usage(compact_deck(deck))
+        print(f"{len(deck)} words: {before / 1e6:.1f} MB as objects, {after / 1e6:.1f} MB compact "
+              f"({100 * (1 - after / before) if before else 0:.0f}% less)")
+    elif len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        target = sys.argv[2] if len(sys.argv) > 2 else "vocab_data"
+        names = migrate_folder(target) if os.path.isdir(target) else [target] if migrate_deck(target) else []
+        print(f"Migrated to schema version {SCHEMA_VERSION}: {', '.join(names) if names else 'nothing to do'}")
+    else:
+        print("Usage: python -m vocab_core.schema migrate [folder or deck file] | memory <deck file>")
@@ -0,0 +1,207 @@
+import csv
+import os
+import threading
+from datetime import datetime
+
+import pandas as pd
+
+from vocab_core.file_lock import FileLock, atomic_write
+from vocab_core.score_stats import ScoreStats, add_score
+from vocab_core.storage import has_pyarrow
+
+# ----------------- Constants -----------------
+SCORE_COLUMNS = ["Date", "ScorePercent", "TotalQuestions"]  # Columns of the score history
+SCORE_FILE = "score_history.csv"          # Snapshot of all scores as CSV (without pyarrow, or not compacted yet)
+COLUMNAR_FILE = "score_history.parquet"   # Columnar snapshot of all scores (with pyarrow)
+JOURNAL_FILE = "score_history.journal"    # Scores appended since the last compaction
+COMPACT_BYTES = 64 * 1024                 # Journal size that triggers a background compaction
+MIGRATED_SUFFIX = ".migrated"             # A CSV snapshot replaced by the columnar one is kept under this suffix
+
+# ----------------- Score Journal -----------------
+class ScoreJournal:
+    """
+    Append-only score history.
+    Each result is appended as one line to the journal file, so logging a score costs the same
+    no matter how long the history is. The journal is merged into the snapshot in the background
+    once it grows past COMPACT_BYTES. The snapshot is Parquet when pyarrow is installed
+    (score_history.parquet, written and read column-wise, its row count read from the file footer),
+    CSV otherwise; the first compaction with pyarrow moves a CSV history into Parquet and keeps the
+    CSV as score_history.csv.migrated. Readers get snapshot plus journal.
+    Every append also updates the running aggregates in score_stats.json (see ScoreStats).
+    Writers (appends and compaction) take an advisory file lock, so several sessions or processes
+    can log scores at once; readers take no lock.
+    """
+    def __init__(self, folder, snapshot_file=None, journal_file=JOURNAL_FILE):
+        self.csv_path = os.path.join(folder, SCORE_FILE)
+        self.snapshot_path = os.path.join(folder, snapshot_file or (COLUMNAR_FILE if has_pyarrow() else SCORE_FILE))
+        self.journal_path = os.path.join(folder, journal_file)
+        self.compacting_path = self.journal_path + ".compacting"
+        self._lock = FileLock(self.journal_path)
+        self._compact_lock = FileLock(self.compacting_path)  # One compaction at a time, across processes
+        self.stats = ScoreStats(folder)
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def lock(self):
+        """
+        The writers' lock of the score history (reentrant, see FileLock).
+        """
+        return self._lock
+
+    def append(self, score_percent, total_questions, date=None):
+        """
+        Appends one result to the journal and flushes it to disk.
+        Returns the entry that was written.
+        """
+        return self.append_many([(score_percent, total_questions, date)])[0]
+
+    def append_many(self, results, wait=False):
+        """
+        Appends many results, (score percent, total questions) or (score percent, total questions, date)
+        each, with one write, one flush and one update of the aggregates.
+        A compaction this triggers runs in the background, or in this thread with wait=True
+        (for scripts that exit right after).
+        Returns the entries that were written.
+        """
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        entries = [{"Date": (result[2] if len(result) > 2 else None) or now,
+                    "ScorePercent": result[0],
+                    "TotalQuestions": result[1]} for result in results]
+        if not entries:
+            return entries
+        with self._lock:
+            # Load (or rebuild) the aggregates before the new lines are in the journal
+            stats = self.stats.load()
+            with open(self.journal_path, "a", newline="", encoding="utf-8") as f:
+                csv.writer(f).writerows([entry[col] for col in SCORE_COLUMNS] for entry in entries)
+                f.flush()
+                os.fsync(f.fileno())
+            journal_size = os.path.getsize(self.journal_path)
+            for entry in entries:
+                add_score(stats, entry["Date"], entry["ScorePercent"])
+            self.stats.save(stats)
+
+        if journal_size >= COMPACT_BYTES:
+            if wait:
+                self.compact()
+            else:
+                self.compact_in_background()
+        return entries
+
+    def read(self):
+        """
+        Returns the full score history (snapshot followed by the journal) as a DataFrame.
+        Does not wait for writers: if a compaction finishes while reading, the read is simply repeated.
+        """
+        while True:
+            before = self._layout()
+            frames = [self._read_snapshot()]
+            for path in (self.compacting_path, self.journal_path):
+                if os.path.exists(path) and os.path.getsize(path) > 0:
+                    frames.append(pd.read_csv(path, names=SCORE_COLUMNS, header=None, encoding="utf-8"))
+            if self._layout() == before:
+                return pd.concat(frames, ignore_index=True)
+
+    def count_rows(self, snapshot=None):
+        """
+        Counts the scores in the history without parsing it: the journal by its line breaks, the
+        snapshot from its Parquet footer (or line breaks, for CSV).
+        snapshot is the [size, rows] pair of an earlier count: the snapshot is only counted again
+        when its size changed, so this reads little more than the journal.
+        Returns the number of scores and the [size, rows] pair of the snapshot.
+        """
+        while True:
+            before = self._layout()
+            source = self._snapshot_source()
+            size = os.path.getsize(source) if source else 0
+            if not snapshot or snapshot[0] != size:
+                snapshot = [size, _snapshot_rows(source)]
+            rows = snapshot[1] + _count_lines(self.compacting_path) + _count_lines(self.journal_path)
+            if self._layout() == before:
+                return rows, snapshot
+
+    def _snapshot_source(self):
+        # The snapshot file to read: the current one, else a CSV history not yet moved to Parquet
+        for path in (self.snapshot_path, self.csv_path):
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _layout(self):
+        # Changes whenever a compaction moves the journal aside or replaces the snapshot
+        source = self._snapshot_source()
+        return source, os.stat(source).st_mtime_ns if source else None, os.path.exists(self.compacting_path)
+
+    def compact(self):
+        """
+        Merges the journal into the snapshot and starts a new, empty journal.
+        The new snapshot is written to a temporary file first, so a crash leaves the old one intact.
+        """
+        with self._compact_lock:
+            # Move the journal aside; new scores go to a fresh journal while we merge
+            with self._lock:
+                if not os.path.exists(self.compacting_path):
+                    if not os.path.exists(self.journal_path):
+                        return
+                    os.replace(self.journal_path, self.compacting_path)
+
+            merged = _typed(pd.concat(
+                [self._read_snapshot(), pd.read_csv(self.compacting_path, names=SCORE_COLUMNS, header=None, encoding="utf-8")],
+                ignore_index=True,
+            ))
+            with self._lock:
+                with atomic_write(self.snapshot_path) as temp_path:
+                    if self.snapshot_path.endswith(COLUMNAR_FILE):
+                        merged.to_parquet(temp_path, index=False)
+                    else:
+                        merged.to_csv(temp_path, index=False, encoding="utf-8")
+                if self.snapshot_path != self.csv_path and _snapshot_rows(self.csv_path):
+                    os.replace(self.csv_path, self.csv_path + MIGRATED_SUFFIX)  # Its scores are in the new snapshot
+                os.remove(self.compacting_path)
+                self.stats.set_snapshot([os.path.getsize(self.snapshot_path), len(merged)])
+
+    def compact_in_background(self):
+        """
+        Runs compact() in a daemon thread so the caller does not wait for it.
+        """
+        thread = threading.Thread(target=self.compact, name="score-journal-compaction", daemon=True)
+        thread.start()
+        return thread
+
+    def _read_snapshot(self):
+        source = self._snapshot_source()
+        if source is None or os.path.getsize(source) == 0:
+            return pd.DataFrame(columns=SCORE_COLUMNS)
+        df = pd.read_parquet(source) if source.endswith(COLUMNAR_FILE) else pd.read_csv(source, encoding="utf-8")
+        for col in SCORE_COLUMNS:
+            if col not in df.columns:
+                df[col] = None
+        return df[SCORE_COLUMNS]
+
+
+def _typed(history):
+    # One type per column, as the columnar snapshot needs
+    return history.astype({"Date": str, "ScorePercent": float}).assign(
+        TotalQuestions=pd.to_numeric(history["TotalQuestions"], errors="coerce").astype("Int64"))
+
+
+def _snapshot_rows(path):
+    # Scores in a snapshot file: from the Parquet footer, or the CSV lines minus the header
+    if path is None or not os.path.exists(path) or os.path.getsize(path) == 0:
+        return 0
+    if path.endswith(COLUMNAR_FILE):
+        import pyarrow.parquet as pq
+        return pq.read_metadata(path).num_rows
+    return max(_count_lines(path) - 1, 0)
+
+
+def _count_lines(path):
+    # Lines of a CSV file, counting a last line without a line break
+    if not os.path.exists(path):
+        return 0
+    lines, last = 0, b"\n"
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            lines += block.count(b"\n")
+            last = block[-1:]
+    return lines + (last != b"\n")
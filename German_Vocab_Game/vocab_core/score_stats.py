@@ -0,0 +1,171 @@
+import json
+import os
+import sys
+
+from vocab_core.file_lock import atomic_write
+
+# ----------------- Constants -----------------
+STATS_FILE = "score_stats.json"   # Running aggregates of the score history
+FULL_MARKS = 100                  # Score counted towards the full-marks streak
+
+
+def empty_stats():
+    """
+    Returns the aggregate record of an empty score history.
+    """
+    return {
+        "games": 0,
+        "score_sum": 0.0,
+        "best": None,
+        "current_streak": 0,
+        "max_streak": 0,
+        "days": {},  # "YYYY-MM-DD" -> {"games", "score_sum", "best"}
+        "snapshot": None,  # [size in bytes, rows] of the score history snapshot when last counted
+    }
+
+
+# ----------------- Score Statistics -----------------
+class ScoreStats:
+    """
+    Running aggregates of the score history (best, mean, full-marks streaks, per-day rollups),
+    stored in score_stats.json. Each new score updates the record in constant time,
+    so the Achievements page never has to read the whole history.
+    """
+    def __init__(self, folder, stats_file=STATS_FILE):
+        self.folder = folder
+        self.path = os.path.join(folder, stats_file)
+
+    def load(self):
+        """
+        Returns the aggregate record. Rebuilds it from the score history if the file is missing
+        or stale, i.e. its game count differs from the number of scores in the history
+        (a history copied in from elsewhere, a stats file from another checkout).
+        The check counts the journal's lines; the snapshot is only counted when its size differs
+        from the [size, rows] pair in the record, which compaction keeps up to date.
+        Readers take no lock unless the record needs fixing: then they wait for the writers' lock
+        and check again, so a reader that lands in the middle of an append never rebuilds.
+        """
+        from vocab_core.score_journal import ScoreJournal
+
+        journal = ScoreJournal(self.folder)
+        stats = self._read()
+        if stats is not None:
+            rows, snapshot = journal.count_rows(stats.get("snapshot"))
+            if rows == stats["games"] and snapshot == stats.get("snapshot"):
+                return stats
+        with journal.lock():
+            stats = self._read()
+            if stats is None:
+                return self.rebuild()
+            rows, snapshot = journal.count_rows(stats.get("snapshot"))
+            if rows != stats["games"]:
+                return self.rebuild()
+            if snapshot != stats.get("snapshot"):
+                stats["snapshot"] = snapshot
+                self.save(stats)
+            return stats
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, stats):
+        """
+        Writes the record to a temporary file and renames it, so readers never see half a file.
+        """
+        with atomic_write(self.path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(stats, f)
+
+    def rebuild(self):
+        """
+        Recomputes the aggregates from the full score history and saves them, under the writers' lock.
+        Used for recovery and when the stats file does not exist yet.
+        """
+        from vocab_core.score_journal import ScoreJournal
+
+        journal = ScoreJournal(self.folder)
+        with journal.lock():
+            stats = stats_from_history(journal.read())
+            stats["snapshot"] = journal.count_rows()[1]
+            self.save(stats)
+        return stats
+
+    def set_snapshot(self, snapshot):
+        """
+        Stores the [size, rows] pair of a newly compacted snapshot, so load does not count it again.
+        Called by the compaction, under the writers' lock.
+        """
+        stats = self._read()
+        if stats is not None:
+            stats["snapshot"] = snapshot
+            self.save(stats)
+
+
+def add_score(stats, date, score_percent):
+    """
+    Updates an aggregate record in place with a single score.
+    """
+    score_percent = float(score_percent)
+    stats["games"] += 1
+    stats["score_sum"] += score_percent
+    if stats["best"] is None or score_percent > stats["best"]:
+        stats["best"] = score_percent
+
+    if score_percent == FULL_MARKS:
+        stats["current_streak"] += 1
+        stats["max_streak"] = max(stats["max_streak"], stats["current_streak"])
+    else:
+        stats["current_streak"] = 0
+
+    day = stats["days"].setdefault(str(date)[:10], {"games": 0, "score_sum": 0.0, "best": None})
+    day["games"] += 1
+    day["score_sum"] += score_percent
+    if day["best"] is None or score_percent > day["best"]:
+        day["best"] = score_percent
+
+
+def stats_from_history(history):
+    """
+    Builds the aggregate record from a score history DataFrame using column-wise operations.
+    """
+    stats = empty_stats()
+    scores = history["ScorePercent"].astype(float)
+    if scores.empty:
+        return stats
+
+    stats["games"] = int(scores.size)
+    stats["score_sum"] = float(scores.sum())
+    stats["best"] = float(scores.max())
+
+    # Every score that is not full marks starts a new run; count full marks inside each run
+    full = scores == FULL_MARKS
+    runs = full.groupby((~full).cumsum()).cumsum()
+    stats["max_streak"] = int(runs.max())
+    stats["current_streak"] = int(runs.iloc[-1])
+
+    days = scores.groupby(history["Date"].astype(str).str[:10]).agg(["count", "sum", "max"])
+    stats["days"] = {
+        day: {"games": int(row["count"]), "score_sum": float(row["sum"]), "best": float(row["max"])}
+        for day, row in days.iterrows()
+    }
+    return stats
+
+
+def average_score(stats):
+    """
+    Returns the mean score of an aggregate record, rounded to one decimal.
+    """
+    return round(stats["score_sum"] / stats["games"], 1) if stats["games"] else 0
+
+
+if __name__ == "__main__":
+    # Recovery: python -m vocab_core.score_stats --rebuild [vocab folder]
+    if len(sys.argv) >= 2 and sys.argv[1] == "--rebuild":
+        folder = sys.argv[2] if len(sys.argv) > 2 else "vocab_data"
+        rebuilt = ScoreStats(folder).rebuild()
+        print(f"Rebuilt score statistics from {rebuilt['games']} games.")
+    else:
+        print("Usage: python -m vocab_core.score_stats --rebuild [vocab folder]")
@@ -0,0 +1,213 @@
+import os
+import threading
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.matching import TRANSLITERATION, transliterate_series
+from vocab_core.normalize import normalize_key, normalize_series
+from vocab_core.schema import load_deck
+
+# ----------------- Constants -----------------
+SEARCH_FIELDS = ["english", "german"]  # Deck columns that are searchable
+NGRAM = 3                              # Substring lookups use an index of 3-character n-grams
+MAX_RESULTS = 50                       # Default number of results returned by a search
+_END = "\U0010ffff"                    # Sorts after every character, closes a prefix range
+
+
+def search_term(text):
+    """
+    Form in which words are indexed and queried: normalize_key plus umlaut transliteration,
+    so "Mueller", "müller" and "MÜLLER" all find the same entry.
+    """
+    return normalize_key(text).translate(TRANSLITERATION)
+
+
+def filter_rows(deck, word_class=None, query=None):
+    """
+    Row positions of deck entries of one word class (None for all) whose English or German form
+    contains query (compared as search terms). Vectorized, so it is cheap enough to run on every
+    rerun of a page that shows a filtered slice of a large deck.
+    """
+    mask = np.ones(len(deck), dtype=bool)
+    if word_class:
+        mask &= (deck["word_class"] == word_class).to_numpy(dtype=bool, na_value=False)
+    term = search_term(query) if query else ""
+    if term:
+        found = np.zeros(len(deck), dtype=bool)
+        for field in SEARCH_FIELDS:
+            folded = transliterate_series(normalize_series(deck[field]))
+            found |= folded.str.contains(term, regex=False).to_numpy(dtype=bool)
+        mask &= found
+    return np.flatnonzero(mask)
+
+
+# ----------------- Deck Index -----------------
+class DeckIndex:
+    """
+    Search index over one deck.
+    The distinct search terms of every English and German form are kept in a sorted array, so a
+    prefix lookup is two binary searches; each term points to its deck rows (term i owns
+    rows[bounds[i]:bounds[i + 1]]). Substring lookups go through an n-gram index (n-gram ->
+    sorted term ids), built on the first substring query only, then intersected and verified.
+    """
+    def __init__(self, name, deck):
+        self.name = name
+        self.entries = deck[["english", "german", "word_class"]].reset_index(drop=True)
+        terms, rows, fields = [], [], []
+        for field in SEARCH_FIELDS:
+            folded = transliterate_series(normalize_series(self.entries[field]))
+            keep = (folded != "").to_numpy()
+            terms.append(folded.to_numpy(object)[keep])
+            rows.append(np.flatnonzero(keep))
+            fields.append(np.full(int(keep.sum()), field, dtype=object))
+        terms, rows, fields = np.concatenate(terms), np.concatenate(rows), np.concatenate(fields)
+        order = np.argsort(terms, kind="stable")
+        terms, self.rows, self.fields = terms[order], rows[order], fields[order]
+        first = np.flatnonzero(np.r_[True, terms[1:] != terms[:-1]]) if terms.size else np.empty(0, dtype=np.intp)
+        self.terms = terms[first].tolist()
+        self.bounds = np.r_[first, terms.size]
+        self._ngrams = None
+        self._ngrams_lock = threading.Lock()
+
+    def prefix(self, term, limit=MAX_RESULTS):
+        """
+        Ids of the distinct terms starting with term (already a search_term), alphabetically.
+        """
+        lo = bisect_left(self.terms, term)
+        hi = bisect_left(self.terms, term + _END, lo)
+        return range(lo, min(hi, lo + limit))
+
+    def substring(self, term, limit=MAX_RESULTS):
+        """
+        Ids of the distinct terms containing term anywhere. Terms shorter than the n-gram length
+        are looked up as prefixes.
+        """
+        if len(term) < NGRAM:
+            return self.prefix(term, limit)
+        ngrams = self._ngram_index()
+        candidates = None
+        for gram in {term[i:i + NGRAM] for i in range(len(term) - NGRAM + 1)}:
+            postings = ngrams.get(gram)
+            if postings is None:
+                return []
+            candidates = postings if candidates is None else np.intersect1d(candidates, postings, assume_unique=True)
+        return [i for i in candidates.tolist() if term in self.terms[i]][:limit]
+
+    def results(self, term_ids, limit=MAX_RESULTS):
+        """
+        The deck entries behind term ids, one dict per distinct (english, german) pair
+        (decks can hold the same word several times).
+        """
+        results, seen = [], set()
+        for term_id in term_ids:
+            for position in range(self.bounds[term_id], self.bounds[term_id + 1]):
+                row = int(self.rows[position])
+                english, german, word_class = (self.entries[col].iat[row] for col in ("english", "german", "word_class"))
+                if (english, german) in seen:
+                    continue
+                seen.add((english, german))
+                results.append({"deck": self.name, "row": row, "english": english, "german": german,
+                                "word_class": word_class, "match": self.fields[position]})
+                if len(results) >= limit:
+                    return results
+        return results
+
+    def completions(self, term, limit):
+        """
+        Words (as written in the deck) whose search term starts with term, one per distinct term.
+        """
+        words = []
+        for term_id in self.prefix(term, limit):
+            position = self.bounds[term_id]
+            words.append(self.entries[self.fields[position]].iat[int(self.rows[position])])
+        return words
+
+    def _ngram_index(self):
+        with self._ngrams_lock:
+            if self._ngrams is None:
+                postings = {}
+                for term_id, term in enumerate(self.terms):
+                    for gram in {term[i:i + NGRAM] for i in range(len(term) - NGRAM + 1)}:
+                        postings.setdefault(gram, []).append(term_id)
+                # Term ids are added in increasing order, so every posting list is already sorted
+                self._ngrams = {gram: np.asarray(ids, dtype=np.intp) for gram, ids in postings.items()}
+            return self._ngrams
+
+
+# ----------------- Search Index -----------------
+class SearchIndex:
+    """
+    Search across several decks (normally everything load_vocab_files finds, plus the diary).
+    Each deck has its own DeckIndex, rebuilt only when that file changes on disk, so refreshing
+    after an edit costs one deck, not all of them.
+    """
+    def __init__(self):
+        self._decks = {}  # absolute path -> (file signature, DeckIndex)
+        self._lock = threading.Lock()
+
+    def refresh(self, files):
+        """
+        Brings the index up to date with files, a list of {"name", "path"} dicts (as returned by
+        load_vocab_files). New and changed decks are (re)indexed, decks that are gone are dropped.
+        """
+        wanted = {}
+        for file_info in files:
+            path = os.path.abspath(file_info["path"])
+            if os.path.exists(path):
+                wanted[path] = file_info["name"]
+        with self._lock:
+            for path in [p for p in self._decks if p not in wanted]:
+                del self._decks[path]
+            stale = [p for p in wanted if p not in self._decks
+                     or self._decks[p][0] != deck_cache.file_signature(p)]
+        for path in stale:
+            signature = deck_cache.file_signature(path)
+            index = DeckIndex(wanted[path], load_deck(path, compact=True))
+            with self._lock:
+                self._decks[path] = (signature, index)
+        return self
+
+    def search(self, query, limit=MAX_RESULTS, substring=True, decks=None):
+        """
+        Entries of all indexed decks (or of the decks named in decks) whose English or German form
+        contains query (or starts with it, with substring=False). Prefix matches come first.
+        Returns a DataFrame with deck, row, english, german, word_class and match (the matching field).
+        """
+        term = search_term(query)
+        results = []
+        if term:
+            for index in self._indexes(decks):
+                found = index.results(index.prefix(term, limit), limit)
+                if substring and len(found) < limit:
+                    pairs = {(r["english"], r["german"]) for r in found}
+                    more = index.results(index.substring(term, limit * 2), limit * 2)
+                    found += [r for r in more if (r["english"], r["german"]) not in pairs]
+                results += found[:limit]
+                if len(results) >= limit:
+                    break
+        return pd.DataFrame(results[:limit], columns=["deck", "row", "english", "german", "word_class", "match"])
+
+    def complete(self, prefix, limit=10, decks=None):
+        """
+        Autocomplete: up to limit distinct words from all decks (or the decks named in decks)
+        starting with prefix.
+        """
+        term = search_term(prefix)
+        words = []
+        if term:
+            for index in self._indexes(decks):
+                for word in index.completions(term, limit):
+                    if word not in words:
+                        words.append(word)
+        return sorted(words, key=search_term)[:limit]
+
+    def _indexes(self, decks=None):
+        with self._lock:
+            return [index for _, index in self._decks.values() if decks is None or index.name in decks]
+
+
+# Shared instance used by main_page.py, the Streamlit pages and the console game
+search_index = SearchIndex()
@@ -0,0 +1,160 @@
+import heapq
+import itertools
+import json
+import os
+import threading
+import time
+
+from vocab_core.deck_cache import deck_cache
+from vocab_core.file_lock import atomic_write
+from vocab_core.normalize import normalize_series
+
+# ----------------- Constants -----------------
+SRS_FOLDER = "srs"          # Sub-folder (next to the deck) holding the review state of each deck
+DAY = 24 * 60 * 60          # Seconds in a day; intervals are counted in days
+START_EASE = 2.5            # SM-2 starting ease factor
+MIN_EASE = 1.3              # SM-2 lowest ease factor
+CORRECT_QUALITY = 4         # SM-2 answer quality used for a correct answer
+WRONG_QUALITY = 1           # SM-2 answer quality used for a wrong answer
+
+# Loaded schedules: (deck path, key column) -> (deck signature, DeckSchedule)
+_schedules = {}
+_schedules_lock = threading.Lock()
+
+
+# ----------------- SM-2 Scheduler -----------------
+class SrsScheduler:
+    """
+    SM-2 spaced-repetition state for one deck.
+    Every card (a normalized word) keeps its interval in days, ease factor, repetition count and
+    due timestamp. A heap ordered by due time serves the next due cards in O(log n) each.
+    """
+    def __init__(self, state_path):
+        self.state_path = state_path
+        self.cards = {}  # key -> [interval, ease, repetitions, due]
+        self._heap = []  # (due, order, key); outdated entries are skipped when popped
+        self._order = itertools.count()
+        if os.path.exists(state_path):
+            with open(state_path, encoding="utf-8") as f:
+                self.cards = json.load(f)
+        self._heap = [(card[3], next(self._order), key) for key, card in self.cards.items()]
+        heapq.heapify(self._heap)
+
+    def sync(self, keys):
+        """
+        Adds cards for keys that have never been reviewed. New cards are due immediately,
+        in the order the keys are given.
+        """
+        new_entries = []
+        for key in keys:
+            if key and key not in self.cards:
+                self.cards[key] = [0, START_EASE, 0, 0]
+                new_entries.append((0, next(self._order), key))
+        if new_entries:
+            self._heap.extend(new_entries)
+            heapq.heapify(self._heap)
+
+    def next_due(self, limit, now=None, accept=None):
+        """
+        Returns up to limit keys that are due at time now (default: current time), earliest first.
+        accept is an optional filter (e.g. "key is still in the deck").
+        """
+        now = time.time() if now is None else now
+        due, popped = [], []
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            card = self.cards.get(entry[2])
+            if card is None or card[3] != entry[0]:
+                continue  # Outdated entry, the card was reviewed since
+            popped.append(entry)
+            if accept is None or accept(entry[2]):
+                due.append(entry[2])
+        # Cards stay scheduled until they are actually reviewed
+        for entry in popped:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def review(self, key, correct, now=None):
+        """
+        Records one answer for a card and schedules its next review (SM-2).
+        """
+        now = time.time() if now is None else now
+        interval, ease, repetitions, _ = self.cards.get(key, [0, START_EASE, 0, 0])
+        quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+
+        if quality < 3:
+            repetitions = 0
+            interval = 1
+        else:
+            repetitions += 1
+            interval = 1 if repetitions == 1 else 6 if repetitions == 2 else round(interval * ease)
+        ease = max(MIN_EASE, ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+
+        due = now + interval * DAY
+        self.cards[key] = [interval, ease, repetitions, due]
+        heapq.heappush(self._heap, (due, next(self._order), key))
+
+    def save(self):
+        """
+        Writes the review state to disk (temporary file plus rename).
+        """
+        with atomic_write(self.state_path) as temp_path:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps(self.cards))
+
+
+# ----------------- Deck Schedules -----------------
+class DeckSchedule:
+    """
+    Connects an SrsScheduler to the rows of a deck: cards are keyed by the normalized word
+    in key_column, and due cards are returned as row positions of the deck.
+    """
+    def __init__(self, deck_path, deck, key_column):
+        self.keys = normalize_series(deck[key_column]).tolist()
+        self.positions = {}
+        for position, key in enumerate(self.keys):
+            self.positions.setdefault(key, position)
+        self.scheduler = SrsScheduler(state_path_for(deck_path))
+        self.scheduler.sync(self.positions)
+        self._lock = threading.Lock()
+
+    def due_positions(self, limit, now=None):
+        """
+        Returns the row positions of up to limit due words, earliest due first.
+        """
+        with self._lock:
+            keys = self.scheduler.next_due(limit, now, accept=self.positions.__contains__)
+        return [self.positions[key] for key in keys]
+
+    def record(self, positions, correct, now=None):
+        """
+        Records the result of a review session (row positions and whether each was answered correctly)
+        and saves the state.
+        """
+        with self._lock:
+            for position, ok in zip(positions, correct):
+                self.scheduler.review(self.keys[position], bool(ok), now)
+            self.scheduler.save()
+
+
+def state_path_for(deck_path):
+    """
+    Returns the file holding the review state of a deck, e.g. vocab_data/srs/diary.json.
+    """
+    folder, file_name = os.path.split(deck_path)
+    return os.path.join(folder, SRS_FOLDER, os.path.splitext(file_name)[0] + ".json")
+
+
+def schedule_for(deck_path, deck, key_column):
+    """
+    Returns the (process-wide) DeckSchedule of a deck, rebuilt only when the deck file changes.
+    """
+    cache_key = (os.path.abspath(deck_path), key_column)
+    signature = deck_cache.file_signature(deck_path)
+    with _schedules_lock:
+        cached = _schedules.get(cache_key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+        schedule = DeckSchedule(deck_path, deck, key_column)
+        _schedules[cache_key] = (signature, schedule)
+        return schedule
@@ -0,0 +1,179 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from vocab_core.file_lock import atomic_write
+
+# ----------------- Constants -----------------
+CSV_EXT = ".csv"          # Plain text, used for import/export and hand editing
+FEATHER_EXT = ".feather"  # Arrow/Feather columnar format (needs pyarrow)
+NPZ_EXT = ".npz"          # NumPy fallback columnar format when pyarrow is missing
+SQLITE_EXT = ".sqlite"    # SQLite diary (see vocab_core.diary_store)
+DECK_EXTENSIONS = (CSV_EXT, FEATHER_EXT, NPZ_EXT, SQLITE_EXT)
+
+_COLUMNS_KEY = "__columns__"  # Column order inside an .npz deck
+
+
+def has_pyarrow():
+    """
+    True when pyarrow is installed, so Feather files can be read and written.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def binary_extension():
+    """
+    Preferred binary deck format: Feather if pyarrow is available, npz otherwise.
+    """
+    return FEATHER_EXT if has_pyarrow() else NPZ_EXT
+
+
+def is_deck_file(file_name):
+    """
+    True for files in one of the supported deck formats.
+    """
+    return os.path.splitext(file_name)[1].lower() in DECK_EXTENSIONS
+
+
+# ----------------- Reading -----------------
+def read_table(file_path, columns=None, memory_map=False):
+    """
+    Reads a deck in any supported format into a DataFrame.
+    columns limits loading to those columns (missing ones are ignored);
+    memory_map maps Feather files instead of copying them into memory.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == FEATHER_EXT:
+        return _read_feather(file_path, columns, memory_map)
+    if ext == NPZ_EXT:
+        return _read_npz(file_path, columns)
+    if ext == SQLITE_EXT:
+        from vocab_core.diary_store import SqliteDiaryStore
+        return SqliteDiaryStore(file_path).read_frame(columns)
+    usecols = (lambda col: col in columns) if columns is not None else None
+    return pd.read_csv(file_path, encoding='utf-8', on_bad_lines='skip', usecols=usecols)
+
+
+def read_columns(file_path):
+    """
+    Returns the column names of a deck without reading its rows.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == FEATHER_EXT:
+        import pyarrow as pa
+        with pa.memory_map(file_path) as source:
+            return pa.ipc.open_file(source).schema.names
+    if ext == NPZ_EXT:
+        with np.load(file_path, allow_pickle=False) as data:
+            return data[_COLUMNS_KEY].tolist()
+    if ext == SQLITE_EXT:
+        from vocab_core.diary_store import SqliteDiaryStore
+        return SqliteDiaryStore(file_path).columns
+    return pd.read_csv(file_path, encoding='utf-8', nrows=0).columns.tolist()
+
+
+def _read_feather(file_path, columns, memory_map):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    if columns is not None:
+        with pa.memory_map(file_path) as source:
+            available = pa.ipc.open_file(source).schema.names
+        columns = [col for col in columns if col in available]
+    return feather.read_table(file_path, columns=columns, memory_map=memory_map).to_pandas()
+
+
+def _read_npz(file_path, columns):
+    # NpzFile loads arrays lazily, so only the requested columns are read from disk
+    with np.load(file_path, allow_pickle=False) as data:
+        names = data[_COLUMNS_KEY].tolist()
+        if columns is not None:
+            names = [name for name in names if name in columns]
+        df = pd.DataFrame({name: _npz_column(data, name) for name in names}, columns=names)
+    return df
+
+
+def _npz_column(data, name):
+    if f"col:{name}" in data.files:
+        return data[f"col:{name}"]
+    # Text columns are dictionary encoded: distinct values plus one code per row (-1 = missing)
+    uniques = np.append(data[f"values:{name}"].astype(object), np.nan)
+    return uniques[data[f"codes:{name}"]]
+
+
+# ----------------- Writing -----------------
+def write_table(df, file_path):
+    """
+    Writes a DataFrame in the format given by the file extension (.csv, .feather, .npz or .sqlite).
+    Object columns holding lists (e.g. verb tenses) are stored as their text form, like in CSV.
+    Files are written to a temporary file and renamed, so a crash never leaves a truncated deck.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == SQLITE_EXT:
+        from vocab_core.diary_store import SqliteDiaryStore
+        SqliteDiaryStore(file_path).replace_all(df)
+        return
+    if ext not in DECK_EXTENSIONS:
+        raise ValueError(f"Unsupported deck format: {file_path}")
+    with atomic_write(file_path) as temp_path:
+        if ext == CSV_EXT:
+            df.to_csv(temp_path, index=False, encoding='utf-8')
+        elif ext == FEATHER_EXT:
+            _as_text_columns(df).to_feather(temp_path)
+        else:
+            _write_npz(df, temp_path)
+
+
+def _as_text_columns(df):
+    # Typed binary formats need one type per column: keep numbers, store everything else as text
+    df = df.reset_index(drop=True).copy()
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(_text_value)
+    return df
+
+
+def _text_value(value):
+    if value is None or isinstance(value, str) or (isinstance(value, float) and value != value):
+        return value
+    return str(value)
+
+
+def _write_npz(df, file_path):
+    df = _as_text_columns(df)
+    arrays = {_COLUMNS_KEY: np.array(df.columns.tolist(), dtype=str)}
+    for col in df.columns:
+        values = df[col]
+        if values.dtype.kind in "biufcM":
+            arrays[f"col:{col}"] = values.to_numpy()
+        else:
+            codes, uniques = pd.factorize(values)
+            arrays[f"codes:{col}"] = codes.astype(np.int32)
+            arrays[f"values:{col}"] = np.asarray(uniques, dtype=str)
+    # Write through a file object so numpy does not append a second ".npz"
+    with open(file_path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def convert(source_path, target_path):
+    """
+    Converts a deck between formats, e.g. diary.csv -> diary.feather (import) or back (export).
+    """
+    write_table(read_table(source_path), target_path)
+
+
+if __name__ == "__main__":
+    # python -m vocab_core.storage <source> <target>
+    if len(sys.argv) != 3:
+        print("Usage: python -m vocab_core.storage <source deck> <target deck>")
+        print(f"Supported formats: {', '.join(DECK_EXTENSIONS)}")
+    else:
+        convert(sys.argv[1], sys.argv[2])
+        print(f"Converted {sys.argv[1]} to {sys.argv[2]}.")
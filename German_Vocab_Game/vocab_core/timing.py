@@ -0,0 +1,262 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+from collections import deque
+
+# ----------------- Constants -----------------
+ENV_FLAG = "VOCAB_TIMING"  # Set to 1 to record timings from the start (the Performance page can switch it on too)
+MAX_RECORDS = 20_000       # Timed calls kept in memory (oldest dropped first)
+MAX_RUNS = 500             # Reruns (page runs, console actions) kept in memory
+PROFILE_LINES = 40         # Functions listed in the text summary of a profile
+PERCENTILES = [50, 90, 99]
+
+_enabled = os.environ.get(ENV_FLAG, "") not in ("", "0")
+_records = deque(maxlen=MAX_RECORDS)  # (run id, name, start, seconds)
+_runs = deque(maxlen=MAX_RUNS)        # {"run", "label", "start", "seconds"}
+_lock = threading.Lock()
+_local = threading.local()            # Current run and profiler of this thread (one per Streamlit session)
+_run_ids = iter(range(1, 1 << 62))
+_profile_requested = False
+_last_profile = None                  # {"label", "start", "text", "data"} of the last profiled run
+_NULL = contextlib.nullcontext()
+
+
+def enabled():
+    """
+    True while timings are recorded.
+    """
+    return _enabled
+
+
+def enable(on=True):
+    """
+    Switches recording on or off for the whole process.
+    """
+    global _enabled
+    _enabled = on
+
+
+# ----------------- Timers -----------------
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start, time.perf_counter() - self.start)
+        return False
+
+
+def timer(name):
+    """
+    Context manager timing the enclosed block under name:
+        with timing.timer("load_csv"):
+            ...
+    When recording is off this returns a shared no-op context, so it costs one flag check.
+    """
+    return _Timer(name) if _enabled else _NULL
+
+
+def timed(name=None):
+    """
+    Decorator timing every call of a function (under name, or the function's qualified name).
+    When recording is off the wrapper only checks a flag before calling through.
+    """
+    def decorate(func):
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, start, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def record(name, start, seconds):
+    """
+    Stores one timed call, attributed to the current run of this thread.
+    """
+    with _lock:
+        _records.append((getattr(_local, "run", None), name, start, seconds))
+
+
+# ----------------- Runs -----------------
+def begin_run(label):
+    """
+    Starts a new run (one rerun of a Streamlit page, one console action) in this thread.
+    Timed calls until end_run, or the next begin_run, belong to it. A run that was not ended
+    (e.g. cut short by st.rerun) is closed first. Profiles the run if profile_next_run was called.
+    """
+    global _profile_requested
+    end_run()
+    if not _enabled:
+        return
+    with _lock:
+        run = next(_run_ids)
+        _local.run, _local.label, _local.start = run, label, time.perf_counter()
+        profile, _profile_requested = _profile_requested, False
+    if profile:
+        import cProfile  # Only when a profile was asked for: the profiling modules are slow to import
+
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:  # Another profiler is already active in this thread
+            return
+        _local.profiler = profiler
+
+
+def end_run():
+    """
+    Closes the current run of this thread and records its total time (and its profile).
+    """
+    global _last_profile
+    run = getattr(_local, "run", None)
+    if run is None:
+        return
+    seconds = time.perf_counter() - _local.start
+    profiler = getattr(_local, "profiler", None)
+    if profiler is not None:
+        profiler.disable()
+        _local.profiler = None
+        profile = _profile_summary(profiler)
+        with _lock:
+            _last_profile = dict(profile, label=_local.label, start=_local.start)
+    with _lock:
+        _runs.append({"run": run, "label": _local.label, "start": _local.start, "seconds": seconds})
+    _local.run = None
+
+
+@contextlib.contextmanager
+def run(label):
+    """
+    begin_run/end_run as a context manager, for code with a clear end (console actions, scripts).
+    """
+    begin_run(label)
+    try:
+        yield
+    finally:
+        end_run()
+
+
+def profile_next_run():
+    """
+    Asks for the next run (in any thread or session) to be profiled with cProfile.
+    """
+    global _profile_requested
+    with _lock:
+        _profile_requested = True
+
+
+def _profile_summary(profiler):
+    import io
+    import marshal
+    import pstats
+
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    stats.sort_stats("cumulative").print_stats(PROFILE_LINES)
+    # Same bytes as Stats.dump_stats writes, readable with pstats or snakeviz
+    return {"text": stats.stream.getvalue(), "data": marshal.dumps(stats.stats)}
+
+
+# ----------------- Reports -----------------
+# pandas and NumPy are imported by the report functions only, so timing adds nothing to start-up
+def records():
+    """
+    All kept timed calls as a DataFrame: run, name, start and seconds.
+    """
+    import pandas as pd
+
+    with _lock:
+        rows = list(_records)
+    return pd.DataFrame(rows, columns=["run", "name", "start", "seconds"])
+
+
+def runs():
+    """
+    All kept runs as a DataFrame: run, label, start and seconds (total wall time), newest first.
+    """
+    import pandas as pd
+
+    with _lock:
+        rows = list(_runs)
+    return pd.DataFrame(rows, columns=["run", "label", "start", "seconds"]).iloc[::-1].reset_index(drop=True)
+
+
+def summary(frame=None):
+    """
+    Per timed name: calls, total, mean, percentiles and max seconds, slowest total first.
+    """
+    import numpy as np
+    import pandas as pd
+
+    frame = records() if frame is None else frame
+    columns = ["name", "calls", "total", "mean"] + [f"p{p}" for p in PERCENTILES] + ["max"]
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+    rows = []
+    for name, seconds in frame.groupby("name")["seconds"]:
+        values = seconds.to_numpy()
+        rows.append([name, values.size, values.sum(), values.mean(), *np.percentile(values, PERCENTILES), values.max()])
+    return pd.DataFrame(rows, columns=columns).sort_values("total", ascending=False, ignore_index=True)
+
+
+def breakdown(run_id):
+    """
+    Time per timed name within one run, slowest first.
+    """
+    frame = records()
+    return summary(frame[frame["run"] == run_id])
+
+
+def slowest(n=20):
+    """
+    The n slowest single calls.
+    """
+    return records().nlargest(n, "seconds").reset_index(drop=True)
+
+
+def last_profile():
+    """
+    The last profiled run: {"label", "start", "text" (pstats summary), "data" (.prof bytes)}, or None.
+    """
+    with _lock:
+        return _last_profile
+
+
+def reset():
+    """
+    Forgets every recorded call, run and profile.
+    """
+    global _last_profile
+    with _lock:
+        _records.clear()
+        _runs.clear()
+        _last_profile = None
+
+
+def report(limit=15):
+    """
+    Text table of the summary, for the console.
+    """
+    table = summary().head(limit)
+    if table.empty:
+        return "No timings recorded."
+    lines = [f"{'name':<28}{'calls':>7}{'total ms':>11}{'p50 ms':>10}{'p90 ms':>10}{'max ms':>10}"]
+    for row in table.itertuples(index=False):
+        lines.append(f"{row.name:<28}{row.calls:>7}{row.total * 1000:>11.1f}{row.p50 * 1000:>10.2f}"
+                     f"{row.p90 * 1000:>10.2f}{row.max * 1000:>10.2f}")
+    return "\n".join(lines)
@@ -1,30 +1,21 @@
-import unicodedata
-import random
-import pandas as pd
-import shutil
+import atexit
 import os
-import ast
-import re
+try:
+    import readline
+except ImportError:  # Windows: no tab completion
+    readline = None
+from vocab_core import timing
+from vocab_core.library import (DIARY_FILE, VALID_WORD, VOCAB_FOLDER, complete_word, deck_files, load_csv,
+                                normalize_string, refresh_search, save_csv, search_vocab)
 
 # ----------------- Constants -----------------
-VOCAB_FOLDER = "vocab_data"       # Folder to store all vocabulary-related CSV files
-DIARY_FILE = "diary.csv"          # Main diary CSV file where user's words are stored
-DIARY_BACKUP = "diary_backup.csv" # Backup of the diary
-VOCAB_COLUMNS = ['English', 'German', 'Word Class', 'Verb Tenses'] # Columns used in CSV files
+ACTION_LABELS = {"l": "Console: Learn", "a": "Console: Add", "t": "Console: Test", "m": "Console: Modify",
+                 "f": "Console: Find", "s": "Console: Achievements", "e": "Console: Exit"}  # Timing run per menu action
 
-# Regex pattern to validate words (letters, umlauts, ß, hyphens, apostrophes, spaces)
-VALID_WORD = re.compile(r"^[A-Za-zÄÖÜäöüß'\- ]+$")
-
-# Global flag to ensure diary backup is created only once per session
-backup_created = False
-
-# ----------------- Helper Functions -----------------
-def normalize_string(s):
-    """
-    Normalize string to NFC form (composed Unicode form) for consistent comparison.
-    """
-    return unicodedata.normalize('NFC', str(s))
+# pandas, NumPy and the deck modules are imported where they are first needed (see vocab_core.library),
+# so the menu comes up without waiting for them.
 
+# ----------------- Input Helpers -----------------
 def check_char_input(word):
     """
     Validates character input from user.
@@ -61,117 +52,130 @@ def count(maximum):
     Ensures input is between 1 and maximum allowed.
     """
     while True:
-        user_input = check_num_input(input(f"\nHow many words would you like to take now? Enter a number between 1 and {maximum}: "))
+        user_input = check_num_input(
+            input(f"\nHow many words would you like to take now? Enter a number between 1 and {maximum}: "))
         if user_input is not None and 1 <= user_input <= maximum:
             return user_input
         else:
             print(f"Please enter a valid number between 1 and {maximum}.")
 
-def backup_diary_once():
+# ----------------- Helper Functions -----------------
+def has_value(value):
     """
-    Creates a backup of the diary CSV file if not already done.
-    Ensures backup is created only once per session.
+    True if a deck cell holds text (not NaN/None and not blank).
     """
-    global backup_created
-    diary_path = os.path.join(VOCAB_FOLDER, DIARY_FILE)
-    backup_path = os.path.join(VOCAB_FOLDER, DIARY_BACKUP)
-    if not backup_created and os.path.exists(diary_path):
-        shutil.copy(diary_path, backup_path)
-        print("\nBackup of your Diary has been created.")
-        backup_created = True
-
-# ----------------- Vocabulary Loader -----------------
-def load_vocab_files(folder=VOCAB_FOLDER, diary_file=DIARY_FILE):
+    import pandas as pd
+    return pd.notna(value) and str(value).strip() != ""
+
+# ----------------- Search -----------------
+@timing.timed("find_words")
+def find_words(query, decks=None):
     """
-    Loads all CSV vocabulary files from the folder.
-    Marks the main diary file as editable.
-    Returns a list of dictionaries containing file info.
+    Searches the English and German words of all vocabulary files (or of the files named in decks).
+    Files that changed on disk since the last search are re-indexed first.
     """
-    vocab_files = []
-    if not os.path.exists(folder):
-        os.makedirs(folder)
-    for file_name in os.listdir(folder):
-        if file_name.endswith(".csv"):
-            full_path = os.path.join(folder, file_name)
-            editable = (file_name == diary_file)
-            vocab_files.append({
-                "name": file_name,
-                "path": full_path,
-                "editable": editable
-            })
-    return vocab_files
-
-def load_csv(file_path):
+    return search_vocab(query, decks=decks)
+
+def suggest_words(prefix, decks=None, limit=5):
     """
-    Loads a CSV file into a pandas DataFrame.
-    Ensures all columns are present and verb tenses are parsed correctly.
-    Creates the CSV file if it does not exist.
+    Autocomplete suggestions for prefix, e.g. to offer when a word was not found.
     """
-    if not os.path.exists(file_path):
-        df = pd.DataFrame(columns=VOCAB_COLUMNS)
-        df.to_csv(file_path, index=False, encoding='utf-8')
-        return df
-
-    df = pd.read_csv(file_path, encoding='utf-8')
-    for col in VOCAB_COLUMNS:
-        if col not in df.columns:
-            df[col] = None
-
-    # Parse 'Verb Tenses' column safely
-    def parse_tenses(x):
-        if isinstance(x, str) and x.startswith('['):
-            try:
-                tenses = ast.literal_eval(x)
-                if isinstance(tenses, list):
-                    tenses += [None]*(2 - len(tenses))  # Ensure list has length 2
-                    return tenses
-            except:
-                return [None, None]
-        return [None, None] if x is None else x
-
-    df['Verb Tenses'] = df['Verb Tenses'].apply(parse_tenses)
-    return df
-
-def save_csv(df, file_path):
+    refresh_search()
+    return complete_word(prefix, limit, decks=decks)
+
+def enable_autocomplete(decks=None):
     """
-    Saves a pandas DataFrame to a CSV file.
+    Turns on Tab completion of words from the search index at the input prompts (where readline exists).
     """
-    df.to_csv(file_path, index=False, encoding='utf-8')
+    if readline is None:
+        return
+    refresh_search()
+    matches = []
+
+    def completer(text, state):
+        if state == 0:
+            matches[:] = complete_word(text, 20, decks=decks)
+        return matches[state] if state < len(matches) else None
+
+    readline.set_completer(completer)
+    readline.set_completer_delims("")  # Complete the whole input, words may contain spaces
+    readline.parse_and_bind("tab: complete")
+
+def disable_autocomplete():
+    if readline is not None:
+        readline.set_completer(None)
 
 # ----------------- Words Class -----------------
 class Words:
     """
     Handles all operations related to user's diary words:
     loading, adding, and saving vocabulary.
+    Changes are written to the diary store row by row (see commit).
     """
-    def __init__(self, diary_path=os.path.join(VOCAB_FOLDER, "diary.csv")):
-        self.diary_path = diary_path
+    def __init__(self, diary_path=None):
+        from vocab_core.diary_store import find_diary, open_diary_store
+        from vocab_core.schema import KEY_COLUMN, migrate_deck
+
+        self.diary_path = diary_path or find_diary(VOCAB_FOLDER, DIARY_FILE)
+        migrate_deck(self.diary_path)  # A diary in a legacy layout is rewritten in the canonical schema once
+        self.store = open_diary_store(self.diary_path, KEY_COLUMN, load_csv, save_csv)
         self.vocab = self.load_diary()
 
     def load_diary(self):
         """
         Loads the diary CSV file into a DataFrame.
         Creates it if it does not exist.
+        Also builds the index used to look up English words.
         """
-        if os.path.exists(self.diary_path):
-            return pd.read_csv(self.diary_path, encoding='utf-8')
-        else:
-            diary = pd.DataFrame(columns=VOCAB_COLUMNS)
-            diary.to_csv(self.diary_path, index=False, encoding='utf-8')
-            return diary
+        from vocab_core.diary_index import DiaryIndex
+        from vocab_core.schema import KEY_COLUMN
+
+        diary = load_csv(self.diary_path)
+        self.index = DiaryIndex(diary, KEY_COLUMN)
+        self.version = self.store.version()
+        return diary
+
+    def refresh(self):
+        """
+        Reloads the diary if it was saved elsewhere since we last read or wrote it.
+        """
+        if self.store.version() != self.version:
+            self.vocab = self.load_diary()
+
+    def commit(self, changes, diary=None):
+        """
+        Writes a change set (see vocab_core.diary_store) to the diary and applies it to the in-memory diary.
+        diary is the already-changed in-memory diary, when the caller has built it itself.
+        If the diary was changed by someone else since we read it, the store merges our changes
+        into the current diary and we reload the result.
+        """
+        from vocab_core.diary_store import apply_changes
+        from vocab_core.schema import KEY_COLUMN
+
+        if diary is None:
+            diary, _ = apply_changes(self.vocab, changes, KEY_COLUMN, self.index)
+        self.vocab = diary
+        with timing.timer("save_diary"):
+            summary = self.store.apply(changes, expected_version=self.version)
+        if summary["merged"]:
+            self.vocab = self.load_diary()
+        elif summary["version"] is not None:
+            self.version = summary["version"]
 
     def add_words(self):
         """
         Allows the user to add new words to the diary.
         Handles Noun, Verb, Adjective and verb tense updates.
         """
+        from vocab_core.schema import WORD_CLASSES
+
         main_add_list = []
         while True:
             # Ask user for word class
             class_choice = None
             while class_choice not in [1, 2, 3, 4, 5, 6, 7, 8]:
                 class_choice = check_num_input(input("\nSelect word class to add:\n1. Noun\n2. Verb\n3. Adjective\n4. Adverb\n5. Pronoun\n6. Preposition\n7. Conjunction\n8. Interjection\nYour choice: "))
-            word_class = {1: "Noun", 2: "Verb", 3: "Adjective", 4: "Adverb", 5: "Pronoun", 6: "Preposition",7: "Conjunction", 8: "Interjection"}[class_choice]
+            word_class = WORD_CLASSES[class_choice - 1]
             x = 'c'
             while x == 'c':
                 # Ask English word
@@ -180,38 +184,36 @@ class Words:
                     continue
 
                 # Check if word exists
-                existing_index = None
-                mask_existing = self.vocab['English'].apply(lambda x: normalize_string(x) == normalize_string(english_word))
-                if mask_existing.any():
-                    existing_index = self.vocab.index[mask_existing][0]
+                self.refresh()
+                existing_index = self.index.find(english_word)
 
                 # Handle verb tense updates for existing verbs
-                if word_class == "Verb" and existing_index is not None:
-                    existing_tenses = self.vocab.at[existing_index, 'Verb Tenses']
-                    if existing_tenses is None or len(existing_tenses) < 2 or any(t is None for t in existing_tenses):
+                if word_class == "verb" and existing_index is not None:
+                    existing_tenses = self.vocab.loc[existing_index, ['past_tense', 'perfect_tense']]
+                    if not all(has_value(t) for t in existing_tenses):
                         print(f"The verb '{english_word}' exists but has incomplete tenses.")
                         verb_tense_choice = check_char_input(input("Do you want to add missing past and perfect tenses? (Y/N): "))
                         if verb_tense_choice and verb_tense_choice.upper() == "Y":
                             past_tense = check_char_input(input(f"Enter the Past tense of '{english_word}': "))
                             perf_tense = check_char_input(input(f"Enter the Perfect tense of '{english_word}': "))
-                            self.vocab.at[existing_index, 'Verb Tenses'] = [past_tense, perf_tense]
-                            save_csv(self.vocab, self.diary_path)
+                            self.commit([{"op": "update", "key": english_word,
+                                          "fields": {'past_tense': past_tense, 'perfect_tense': perf_tense}}])
                             print(f"Verb tenses updated for '{english_word}'.")
                         continue  # Skip adding as new word
 
                 # Ask German translation
                 german_word = check_char_input(input(f"Enter the German {word_class}: "))
-                temp_list = [english_word, german_word, word_class, None]
+                new_row = {'word_class': word_class, 'english': english_word, 'german': german_word}
 
                 # Ask verb tenses if new verb
-                if word_class == "Verb" and existing_index is None:
+                if word_class == "verb" and existing_index is None:
                     verb_tense_choice = check_char_input(input(f"Do you wish to add past and perfect tenses? (Y/N): ")).strip().upper()
                     if verb_tense_choice == 'Y':
                         past_tense = check_char_input(input(f"Enter the Past tense of '{german_word}': "))
                         perf_tense = check_char_input(input(f"Enter the Perfect tense of '{german_word}': "))
-                        temp_list[3] = [past_tense, perf_tense]
+                        new_row.update(past_tense=past_tense, perfect_tense=perf_tense)
 
-                main_add_list.append(temp_list)
+                main_add_list.append(new_row)
 
                 # Ask user to continue, switch class, or stop
                 while True:
@@ -235,42 +237,20 @@ class Words:
         Adds correctly answered words from a test into the diary.
         Handles adding missing verb tenses for existing verbs.
         """
-        words_added = 0
-        diary = self.vocab.copy()
-        for entry in correct_results:
-            english_word = entry['English']
-            german_word = entry['German']
-            form = entry['Form']
-            word_class = entry.get('Word Class', 'Noun')
-
-            mask_existing = diary['English'].apply(lambda x: normalize_string(x) == normalize_string(english_word))
-
-            # Update existing word's verb tenses
-            if mask_existing.any():
-                existing_index = diary.index[mask_existing][0]
-                existing_tenses = diary.at[existing_index, 'Verb Tenses']
-                if existing_tenses is None or not isinstance(existing_tenses, list):
-                    existing_tenses = [None, None]
-
-                if form == "Past" and existing_tenses[0] is None:
-                    existing_tenses[0] = german_word
-                    diary.at[existing_index, 'Verb Tenses'] = existing_tenses
-                    words_added += 1
-                elif form == "Perfect" and existing_tenses[1] is None:
-                    existing_tenses[1] = german_word
-                    diary.at[existing_index, 'Verb Tenses'] = existing_tenses
-                    words_added += 1
-                continue
+        from vocab_core import engine
+        from vocab_core.schema import KEY_COLUMN
 
-            # Add new word to diary
-            if form == "Base":
-                temp_list = [english_word, german_word, word_class, None]
-                diary = pd.concat([diary, pd.DataFrame([temp_list], columns=diary.columns)], ignore_index=True)
-                words_added += 1
+        self.refresh()
+        # Existing words only get missing tenses; new words are added from their base form
+        rows, insert_mask = engine.answers_to_rows(correct_results)
+        diary, summary, changes = engine.merge_into_diary(self.vocab, rows, fill_columns=['past_tense', 'perfect_tense'],
+                                                          insert_mask=insert_mask)
+        words_added = summary['inserted'] + summary['filled']
 
         if words_added > 0:
-            save_csv(diary, self.diary_path)
-            self.vocab = diary
+            for english_word in diary.loc[diary.index >= len(self.vocab), KEY_COLUMN]:
+                self.index.append(english_word)
+            self.commit(changes, diary)
             print(f"\n{words_added} words/verb tenses added or updated in your Diary.")
         else:
             print("\nNo new words or tenses were added.")
@@ -278,90 +258,103 @@ class Words:
     def save_vocabulary(self, main_add_list):
         """
         Saves newly added words to the diary.
-        Creates backup before saving.
         """
-        backup_diary_once()
-        diary = load_csv(self.diary_path)
-        new_vocab = pd.DataFrame(main_add_list, columns=diary.columns)
-        final_vocab = pd.concat([diary, new_vocab], ignore_index=True)
-        save_csv(final_vocab, self.diary_path)
-        self.vocab = final_vocab
+        self.refresh()
+        self.commit([{"op": "insert", "row": row} for row in main_add_list])
 
 # ----------------- Modification Class -----------------
 class Modification:
     """
-    Handles modifications in the diary: delete, update, undo.
+    Handles modifications in the diary: delete, update, undo and redo.
+    Every change is recorded in the diary's journal, so any number of changes can be undone.
     """
-    def __init__(self):
-        self.diary_path = os.path.join(VOCAB_FOLDER, DIARY_FILE)
-        self.backup_path = os.path.join(VOCAB_FOLDER, DIARY_BACKUP)
+    def __init__(self, words=None):
+        from vocab_core.diary_store import find_diary
 
-    def create_backup_once(self):
-        backup_diary_once()
+        self.diary_path = find_diary(VOCAB_FOLDER, DIARY_FILE)
+        self.words = words if words is not None else Words(self.diary_path)  # Shares the diary and its index
 
     def undo_last_change(self):
         """
-        Restores diary from last backup.
+        Undoes the most recent change to the diary.
         """
-        if os.path.exists(self.backup_path):
-            shutil.copy(self.backup_path, self.diary_path)
-            print("Your Diary has been restored from the last backup.")
+        if self.words.store.journal.undo(self.words.store):
+            self.words.refresh()
+            print("Your last change to the Diary has been undone.")
         else:
-            print("No backup found to restore.")
+            print("There is nothing to undo.")
+
+    def redo_last_change(self):
+        """
+        Re-applies the most recently undone change.
+        """
+        if self.words.store.journal.redo(self.words.store):
+            self.words.refresh()
+            print("The change has been applied to your Diary again.")
+        else:
+            print("There is nothing to redo.")
+
+    def not_found(self, english_word):
+        """
+        Tells the user a word is not in the diary and suggests diary words starting the same way.
+        """
+        print(f"The word '{english_word}' was not found in your Diary.")
+        suggestions = suggest_words(english_word[:3], decks=[os.path.basename(self.words.diary_path)])
+        if suggestions:
+            print("Did you mean: " + ", ".join(suggestions) + "?")
 
     def delete_word(self, english_word):
         """
         Deletes a word from diary.
         """
-        self.create_backup_once()
-        diary = load_csv(self.diary_path)
+        self.words.refresh()
         english_word = normalize_string(english_word)
-        if english_word in diary['English'].values:
-            diary = diary[diary['English'] != english_word]
-            save_csv(diary, self.diary_path)
+        if english_word in self.words.index:
+            self.words.commit([{"op": "delete", "key": english_word}])
             print(f"The word '{english_word}' has been deleted from your Diary.")
         else:
-            print(f"The word '{english_word}' was not found in your Diary.")
+            self.not_found(english_word)
 
     def update_word(self, english_word, new_german=None, new_class=None, new_tenses=None):
         """
         Updates a word in the diary: translation, class, or verb tenses.
         """
-        self.create_backup_once()
-        diary = load_csv(self.diary_path)
-        mask_existing = diary['English'].apply(lambda x: normalize_string(x) == normalize_string(english_word))
-        if not mask_existing.any():
-            print(f"The word '{english_word}' was not found in your Diary.")
+        self.words.refresh()
+        index_existing = self.words.index.find(english_word)
+        if index_existing is None:
+            self.not_found(english_word)
             return
-        index_existing = diary.index[mask_existing][0]
+        fields = {}
         if new_german:
-            diary.at[index_existing, 'German'] = normalize_string(new_german)
+            fields['german'] = normalize_string(new_german)
         if new_class:
-            diary.at[index_existing, 'Word Class'] = new_class
+            fields['word_class'] = new_class.strip().lower()
         if new_tenses is not None:
-            # Ensure verb tenses is a list of length 2
-            if isinstance(new_tenses, list):
-                new_tenses += [None]*(2-len(new_tenses))
-                diary.at[index_existing, 'Verb Tenses'] = new_tenses
-        save_csv(diary, self.diary_path)
+            # Past tense first, then perfect tense; a missing one is left empty
+            new_tenses = [normalize_string(t.strip()) if t and t.strip() else None for t in new_tenses]
+            new_tenses += [None]*(2-len(new_tenses))
+            fields['past_tense'], fields['perfect_tense'] = new_tenses[:2]
+        self.words.commit([{"op": "update", "key": english_word, "fields": fields}])
         print(f"The word '{english_word}' has been updated in your Diary.")
 
 # ----------------- Test Class -----------------
 class Test:
     """
     Handles testing vocabulary from available CSV files.
+    Questions, grading and scheduling come from vocab_core.engine; this class asks and prints.
     """
     def test_choice(self):
         """
         Allows user to choose which vocabulary file to test and test mode.
         """
-        vocab_files = load_vocab_files()
-        vocab_files = [f for f in vocab_files if f['name'] not in ['diary_backup.csv', 'score_history.csv', 'achievements.csv']]
+        from vocab_core import engine
+
+        vocab_files = deck_files()
 
         print("\nAvailable vocabulary files to test:")
         for i, file_info in enumerate(vocab_files, start=1):
             access = "Editable (Diary)" if file_info["editable"] else "Read-only"
-            print(f"{i}. {file_info['name']} ({access})")
+            print(f"{i}. {file_info['name']} ({file_info['rows']} words, {access})")
 
         # User selects file
         file_choice = None
@@ -369,8 +362,8 @@ class Test:
             user_input = check_num_input(input("Select a file by number: "))
             if user_input is not None and 1 <= user_input <= len(vocab_files):
                 file_choice = user_input
-        vocab_path = vocab_files[file_choice - 1]['path']
-        vocab_data = load_csv(vocab_path)
+        with timing.timer("open_deck"):
+            deck = engine.Deck(vocab_files[file_choice - 1]['path'])  # Read-only here, so the compact deck
 
         # Select test mode
         print("\nSelect test mode:")
@@ -378,168 +371,156 @@ class Test:
         print("2. Test by word class")
         print("3. Verb and tenses")
         print("4. Test in order")
+        print("5. Spaced repetition (words due for review)")
         test_mode = None
-        while test_mode not in [1, 2, 3, 4]:
+        while test_mode not in [1, 2, 3, 4, 5]:
             test_mode = check_num_input(input("Your choice: "))
 
+        # Every mode picks its questions from the deck's question bank (built once per deck content)
         if test_mode == 1:
-            return self.test_random(vocab_data)
+            return self.test_random(deck)
         elif test_mode == 2:
-            return self.test_word_class(vocab_data)
+            return self.test_word_class(deck)
         elif test_mode == 3:
-            return self.test_verb_tense(vocab_data)
+            return self.test_verb_tense(deck)
         elif test_mode == 4:
-            return self.test_in_order(vocab_data)
+            return self.test_in_order(deck)
+        elif test_mode == 5:
+            return self.test_due(deck)
         return None
 
-    import random
-
-    def test_random(self, vocab):
+    def test_random(self, deck, word_class=None):
         """
-        Tests a random selection of words from the vocabulary.
-        Each verb form becomes a separate question, shuffled with other words.
+        Tests a random selection of questions from the deck (all of it, or one word class).
+        Each verb form is a separate question, shuffled with other words.
         """
-        all_words = [
-            [index, row['English'], row['Word Class'], row['German'], row['Verb Tenses']]
-            for index, row in vocab.iterrows()
-        ]
-        words_available = len(all_words)
-        num_questions = count(words_available)  # Number of questions user wants
+        from vocab_core import engine
 
-        # Build a flat list of (English, Word Class, Form Name, Correct Answer) questions
-        all_questions = []
-        for word_data in all_words:
-            _, english_word, word_class, german_word, verb_tenses = word_data
+        available = engine.question_count(deck, word_class)
+        if available == 0:
+            print("\n⚠️ No words found for this test.")
+            return [], 0
+        num_questions = count(available)  # Number of questions user wants
 
-            if word_class.lower() == "verb" and isinstance(verb_tenses, list):
-                # Add each verb form as a separate question
-                all_questions.append((english_word, word_class, "Base", german_word))
-                if verb_tenses[0]:
-                    all_questions.append((english_word, word_class, "Past", verb_tenses[0]))
-                if verb_tenses[1]:
-                    all_questions.append((english_word, word_class, "Perfect", verb_tenses[1]))
-            else:
-                # Single question for non-verbs
-                all_questions.append((english_word, word_class, "Base", german_word))
+        # Pick only the number of questions the user requested, in random order
+        with timing.timer("plan_questions"):
+            plan = engine.plan_questions(deck, num_questions, word_class)
+        session = self.ask_questions(plan)
+        return session.correct_answers, session.total
 
-        # Shuffle all individual questions
-        random.shuffle(all_questions)
+    def test_due(self, deck):
+        """
+        Spaced-repetition test: asks the words that are due for review (SM-2 schedule),
+        then reschedules each word depending on whether all its forms were answered correctly.
+        """
+        from vocab_core import engine
 
-        # Pick only the number of questions the user requested (or fewer if not enough)
-        selected_questions = all_questions[:num_questions]
+        num_words = count(len(deck))
+        with timing.timer("plan_due"):
+            plan = engine.plan_due(deck, num_words)
+        if len(plan) == 0:
+            print("\n🎉 No words are due for review in this file. Come back later!")
+            return [], 0
 
-        total_score = 0
-        total_questions = 0
-        revision_list = []
-        correct_answers = []
+        session = self.ask_questions(plan)
+        session.finish()
+        return session.correct_answers, session.total
 
-        for english_word, word_class, form_name, correct_german in selected_questions:
-            user_input = check_char_input(input(f"\n{form_name} form of '{english_word}': "))
-            total_questions += 1
-            if user_input and normalize_string(user_input).casefold() == normalize_string(correct_german).casefold():
+    def ask_questions(self, plan):
+        """
+        Asks the questions of a plan one by one and prints the score and the words to revise.
+        Answers with a small typo are reported as almost correct; they still count as wrong and go on the revision list.
+        Returns the TestSession (correct answers, number of questions, revision list).
+        """
+        from vocab_core import engine
+        from vocab_core.matching import ALMOST, CORRECT
+
+        session = engine.TestSession(plan)
+        for question in plan.questions():
+            user_input = check_char_input(input(f"\n{question.form} form of '{question.english}': "))
+            with timing.timer("grade_answer"):
+                verdict = session.answer(question, user_input)
+            if verdict == CORRECT:
                 print("✔ Correct!")
-                correct_answers.append({
-                    'English': english_word,
-                    'Form': form_name,
-                    'German': correct_german,
-                    'Word Class': word_class
-                })
-                total_score += 1
+            elif verdict == ALMOST:
+                print(f"✏️ Almost correct, check the spelling: {question.answer}")
             else:
-                print(f"✘ Wrong. Correct answer: {correct_german}")
-                revision_list.append([english_word, word_class, form_name, correct_german])
+                print(f"✘ Wrong. Correct answer: {question.answer}")
 
-        if total_questions > 0:
-            print(f"\nYour total score: {(total_score / total_questions) * 100:.2f}%")
+        if session.total > 0:
+            print(f"\nYour total score: {(session.correct / session.total) * 100:.2f}%"
+                  + (f" ({session.almost} almost correct)" if session.almost else ""))
 
-        if revision_list:
-            revision_df = pd.DataFrame(revision_list, columns=["English", "Word Class", "Form", "Correct German"])
-            print("\nWords to revise:\n", revision_df)
+        if session.revision:
+            print("\nWords to revise:\n", session.revision_frame())
 
-        return correct_answers, total_questions
+        return session
 
-    def test_in_order(self, vocab):
+    def test_in_order(self, deck):
         """
         Tests all words in the vocab file in order (no shuffling).
         Also handles verbs with tenses.
         """
-        print("\nMaximum number of words available in the chosen vocabulary file is:", vocab.shape[0])
+        from vocab_core import engine
+        from vocab_core.matching import ALMOST, CORRECT
+
+        print("\nMaximum number of words available in the chosen vocabulary file is:", len(deck))
         print("\nWords will be tested in order from the starting index to the ending index you choose.")
         start = check_num_input(input("Select a starting index: "))
         end = check_num_input(input("Select an ending index: "))
 
-        # slice the vocab DataFrame
-        selected_range = vocab.iloc[start - 1:end]  # user-friendly: 1-based indexing
+        # Questions of words start..end (user-friendly: 1-based indexing), in deck order
+        with timing.timer("plan_range"):
+            plan = engine.plan_range(deck, start - 1, end)
+        session = engine.TestSession(plan)
+        labels = {"Base": "base form", "Past": "past tense", "Perfect": "perfect tense"}
 
         print("\n📝 In-order test started!\n")
 
-        score = 0
-        total = 0
-
-        for _, row in selected_range.iterrows():
-            english_word = row['English']
-            word_class = row['Word Class']
-            german_word = row['German']
-            verb_tenses = row['Verb Tenses']
-
+        for question in plan.questions():
             # === Non-verbs ===
-            if word_class != "Verb":
-                user_answer = input(f"➡️  Translate '{english_word}' ({word_class}): ").strip()
-                if user_answer.lower() == str(german_word).lower():
+            if question.word_class != "verb":
+                user_answer = input(f"➡️  Translate '{question.english}' ({question.word_class}): ").strip()
+                with timing.timer("grade_answer"):
+                    verdict = session.answer(question, user_answer)
+                if verdict == CORRECT:
                     print("✅ Correct!\n")
-                    score += 1
+                elif verdict == ALMOST:
+                    print(f"✏️ Almost correct, check the spelling: {question.answer}\n")
                 else:
-                    print(f"❌ Incorrect. Correct answer: {german_word}\n")
-                total += 1
+                    print(f"❌ Incorrect. Correct answer: {question.answer}\n")
 
-            # === Verbs ===
+            # === Verbs: base form, then the past and perfect tenses the deck has ===
             else:
-                print(f"\n➡️  Verb: {english_word}")
-                # Base form
-                user_base = input("   Base form: ").strip()
-                if user_base.lower() == str(german_word).lower():
-                    print("   ✅ Correct base form")
-                    score += 1
+                if question.form == "Base":
+                    print(f"\n➡️  Verb: {question.english}")
+                label = labels[question.form]
+                user_answer = input(f"   {label.capitalize()}: ").strip()
+                with timing.timer("grade_answer"):
+                    verdict = session.answer(question, user_answer)
+                if verdict == CORRECT:
+                    print(f"   ✅ Correct {label}")
+                elif verdict == ALMOST:
+                    print(f"   ✏️ Almost correct, check the spelling. Correct {label}: {question.answer}")
                 else:
-                    print(f"   ❌ Incorrect. Correct base form: {german_word}")
-                total += 1
-
-                # Verb tenses (Past, Perfect)
-                if isinstance(verb_tenses, list):
-                    if len(verb_tenses) > 0 and verb_tenses[0]:
-                        user_past = input("   Past tense: ").strip()
-                        if user_past.lower() == str(verb_tenses[0]).lower():
-                            print("   ✅ Correct past tense")
-                            score += 1
-                        else:
-                            print(f"   ❌ Incorrect. Correct past tense: {verb_tenses[0]}")
-                        total += 1
-                    if len(verb_tenses) > 1 and verb_tenses[1]:
-                        user_perf = input("   Perfect tense: ").strip()
-                        if user_perf.lower() == str(verb_tenses[1]).lower():
-                            print("   ✅ Correct perfect tense")
-                            score += 1
-                        else:
-                            print(f"   ❌ Incorrect. Correct perfect tense: {verb_tenses[1]}")
-                        total += 1
+                    print(f"   ❌ Incorrect. Correct {label}: {question.answer}")
 
+        score, total = session.correct, session.total
         print(f"\n🏆 Test finished! Your score: {score}/{total} ({(score/total*100):.1f}%)")
 
 
-    def test_word_class(self, vocab):
+    def test_word_class(self, deck):
         """
-        Tests words filtered by a specific word class.
+        Tests words of a specific word class.
         """
-        word_class = check_char_input(input("\nEnter the word class to test (Noun/Verb/Adjective): ")).capitalize()
-        filtered_vocab = vocab[vocab['Word Class'] == word_class].reset_index(drop=True)
-        return self.test_random(filtered_vocab)
+        word_class = check_char_input(input("\nEnter the word class to test (Noun/Verb/Adjective): ")).lower()
+        return self.test_random(deck, word_class)
 
-    def test_verb_tense(self, vocab):
+    def test_verb_tense(self, deck):
         """
         Tests only verbs and their tenses.
         """
-        filtered_vocab = vocab[vocab['Word Class'] == "Verb"].reset_index(drop=True)
-        return self.test_random(filtered_vocab)
+        return self.test_random(deck, "verb")
 
 # ----------------- Learn -----------------
 class Learn:
@@ -547,13 +528,14 @@ class Learn:
         """
         Allows user to choose which vocabulary file to learn from.
         """
-        vocab_files = load_vocab_files()
-        vocab_files = [f for f in vocab_files if f['name'] not in ['diary_backup.csv', 'score_history.csv', 'achievements.csv']]
+        from vocab_core import engine
+
+        vocab_files = deck_files()
 
         print("\nAvailable vocabulary files to learn from:")
         for i, file_info in enumerate(vocab_files, start=1):
             access = "Editable (Diary)" if file_info["editable"] else "Read-only"
-            print(f"{i}. {file_info['name']} ({access})")
+            print(f"{i}. {file_info['name']} ({file_info['rows']} words, {access})")
 
         # User selects file
         file_choice = None
@@ -561,8 +543,8 @@ class Learn:
             user_input = check_num_input(input("Select a file by number: "))
             if user_input is not None and 1 <= user_input <= len(vocab_files):
                 file_choice = user_input
-        vocab_path = vocab_files[file_choice - 1]['path']
-        vocab_data = load_csv(vocab_path)
+        with timing.timer("open_deck"):
+            deck = engine.Deck(vocab_files[file_choice - 1]['path'])  # Read-only here, so the compact deck
 
         # Select learning mode
         print("\nSelect learning mode:")
@@ -575,91 +557,86 @@ class Learn:
             learn_mode = check_num_input(input("Your choice: "))
 
         if learn_mode == 1:
-            return self.learn_random(vocab_data)
+            return self.learn_random(deck)
         elif learn_mode == 2:
-            return self.learn_word_class(vocab_data)
+            return self.learn_word_class(deck)
         elif learn_mode == 3:
-            return self.learn_verb_tense(vocab_data)
+            return self.learn_verb_tense(deck)
         elif learn_mode == 4:
-            return self.learn_in_order(vocab_data)
+            return self.learn_in_order(deck)
 
-    def learn_in_order(self, vocab):
+    def learn_in_order(self, deck):
         """
         Lets the user learn words in order by displaying their translation.
         """
-        print("\nMaximum number of words available in the chosen vocabulary file is: ", vocab.shape[0])
+        print("\nMaximum number of words available in the chosen vocabulary file is: ", len(deck))
         print("\nWords will be shown in order from the starting index to the ending index you choose. Example: words 51 to 70 in the vocab file")
         start = check_num_input(input("Select a starting index: "))
         end = check_num_input(input("Select a ending index: "))
-        selected_range = vocab.iloc[start-1:end]
+        with timing.timer("sample_words"):
+            selected_range = deck.words(start-1, end)
         print("\n📖 Learning session started!\n")
-        for _, row in selected_range.iterrows():
-            english_word = row['English']
-            word_class = row['Word Class']
-            german_word = row['German']
+        for english_word, word_class, german_word in zip(
+                selected_range['english'], selected_range['word_class'], selected_range['german']):
             print(f"➡️  {english_word} ({word_class}) translates to {german_word}")
             input("Press Enter to continue...")
 
         print("\n✅ End of learning session.")
 
 
-    def learn_random(self, vocab):
+    def learn_random(self, deck, word_class=None):
         """
-        Lets the user review random words by displaying their translation.
+        Lets the user review random words (of one word class, if given) by displaying their translation.
         """
-        num_of_words = count(vocab.shape[0])
-        all_words = [
-            [index, row['English'], row['Word Class'], row['German']]
-            for index, row in vocab.iterrows()
-        ]
-        selected_words = random.sample(all_words, num_of_words)
+        available = len(deck) if word_class is None else len(deck.of_class(word_class))
+        num_of_words = count(available)
+        with timing.timer("sample_words"):
+            selected_words = deck.sample(num_of_words, word_class)
 
         print("\n📖 Learning session started!\n")
-        for _, english_word, word_class, german_word in selected_words:
+        for english_word, word_class, german_word in zip(
+                selected_words['english'], selected_words['word_class'], selected_words['german']):
             print(f"➡️  {english_word} ({word_class}) translates to {german_word}")
             input("Press Enter to continue...")
 
         print("\n✅ End of learning session.")
 
-    def learn_word_class(self, vocab):
+    def learn_word_class(self, deck):
         """
         Lets the user review words of a specific word class.
         """
-        word_class = check_char_input(input("\nEnter the word class to learn (Noun/Verb/Adjective/...): ")).capitalize()
-        filtered_vocab = vocab[vocab['Word Class'] == word_class].reset_index(drop=True)
+        word_class = check_char_input(input("\nEnter the word class to learn (Noun/Verb/Adjective/...): ")).lower()
 
-        if filtered_vocab.empty:
+        if deck.of_class(word_class).empty:
             print(f"\n⚠️ No words found for the class '{word_class}'.")
             return None
 
-        return self.learn_random(filtered_vocab)
+        return self.learn_random(deck, word_class)
 
-    def learn_verb_tense(self, vocab):
+    def learn_verb_tense(self, deck):
         """
         Lets the user review verbs and their different tenses.
         """
-        filtered_vocab = vocab[vocab['Word Class'] == "Verb"].reset_index(drop=True)
+        verbs = deck.of_class("verb")
 
-        if filtered_vocab.empty:
+        if verbs.empty:
             print("\n⚠️ No verbs found in the selected file.")
             return
 
-        num_of_words = count(filtered_vocab.shape[0])
-        all_verbs = [
-            [row['English'], row['German'], row['Verb Tenses']]
-            for _, row in filtered_vocab.iterrows()
-        ]
-        selected_verbs = random.sample(all_verbs, num_of_words)
+        num_of_words = count(verbs.shape[0])
+        with timing.timer("sample_words"):
+            selected_verbs = deck.sample(num_of_words, "verb")
 
         print("\n📖 Learning verbs and their tenses!\n")
-        for english_word, german_base, tenses in selected_verbs:
+        for english_word, german_base, past_tense, perfect_tense in zip(
+                selected_verbs['english'], selected_verbs['german'],
+                selected_verbs['past_tense'], selected_verbs['perfect_tense']):
             print(f"➡️  {english_word} (Verb):")
             print(f"    - Base: {german_base}")
-            if isinstance(tenses, list):
-                if tenses[0]:
-                    print(f"    - Past: {tenses[0]}")
-                if tenses[1]:
-                    print(f"    - Perfect: {tenses[1]}")
+            if has_value(past_tense):
+                print(f"    - Past: {past_tense}")
+            if has_value(perfect_tense):
+                print(f"    - Perfect: {perfect_tense}")
             input("Press Enter to continue...")
 
         print("✅ End of verb learning session.")
@@ -667,78 +644,36 @@ class Learn:
 # ----------------- Gameplay -----------------
 class ScoreManager:
     """
-    Handles storing scores, checking achievements, and unlocking new achievements.
+    Stores scores and announces and shows achievements.
+    Scores and achievements are kept by vocab_core.engine.Scores, loaded on first use.
     """
     def __init__(self):
-        self.score_file = os.path.join(VOCAB_FOLDER, "score_history.csv")
-        self.achievements_file = os.path.join(VOCAB_FOLDER, "achievements.csv")
-        if not os.path.exists(VOCAB_FOLDER):
-            os.makedirs(VOCAB_FOLDER)
-        self.load_scores()
-        self.load_achievements()
+        self._scores = None
 
-    def load_scores(self):
-        """
-        Loads score history from CSV or creates new CSV if none exists.
-        """
-        if os.path.exists(self.score_file):
-            self.score_history = pd.read_csv(self.score_file)
-        else:
-            self.score_history = pd.DataFrame(columns=["Date", "ScorePercent", "TotalQuestions"])
-            self.score_history.to_csv(self.score_file, index=False)
-
-    def load_achievements(self):
-        """
-        Loads achievements from CSV or creates new CSV if none exists.
-        """
-        if os.path.exists(self.achievements_file):
-            self.achievements = pd.read_csv(self.achievements_file)
-        else:
-            self.achievements = pd.DataFrame(columns=["Achievement", "DateEarned"])
-            self.achievements.to_csv(self.achievements_file, index=False)
+    @property
+    def scores(self):
+        if self._scores is None:
+            from vocab_core.engine import Scores
+            self._scores = Scores(VOCAB_FOLDER)
+        return self._scores
 
     def add_score(self, score_percent, total_questions):
         """
-        Adds new score entry and checks for achievements.
-        """
-        from datetime import datetime
-        new_entry = {"Date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "ScorePercent": score_percent, "TotalQuestions": total_questions}
-        self.score_history = pd.concat([self.score_history, pd.DataFrame([new_entry])], ignore_index=True)
-        self.score_history.to_csv(self.score_file, index=False)
-        self.check_achievements(score_percent)
-
-    def check_achievements(self, score_percent):
-        """
-        Checks if any achievement conditions are met after a new score.
-        """
-        perfect_score_streak = 5
-        perfect_games = self.score_history.tail(perfect_score_streak)
-        if len(perfect_games) == perfect_score_streak and (perfect_games['ScorePercent'] == 100).all():
-            self.unlock_achievement(f"Perfect 5 games in a row!")
-
-        if score_percent == 100 and "First 100% score" not in self.achievements['Achievement'].values:
-            self.unlock_achievement("First 100% score!")
-
-    def unlock_achievement(self, achievement_name):
+        Logs a new score and announces the achievements it unlocked.
         """
-        Unlocks a new achievement and saves it to CSV.
-        """
-        from datetime import datetime
-        if achievement_name not in self.achievements['Achievement'].values:
-            new_ach = {"Achievement": achievement_name, "DateEarned": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-            self.achievements = pd.concat([self.achievements, pd.DataFrame([new_ach])], ignore_index=True)
-            self.achievements.to_csv(self.achievements_file, index=False)
+        for achievement_name in self.scores.record(score_percent, total_questions):
             print(f"\n🎉 Achievement unlocked: {achievement_name} 🎉")
 
     def show_achievements(self):
         """
         Displays user's achievements.
         """
-        if self.achievements.empty:
+        achievements = self.scores.achievements()
+        if achievements.empty:
             print("No achievements earned yet.")
         else:
             print("\nYour Achievements:")
-            print(self.achievements)
+            print(achievements)
 
 class Gameplay:
     """
@@ -753,79 +688,103 @@ class Gameplay:
     def start(self):
         """
         Main loop to interact with the user.
+        The diary is opened the first time an action needs it.
         """
-        diary_words = Words()
+        diary_words = None
         tester = Test()
 
         while True:
             action = check_char_input(input(
-                "\nWhat would you like to do?\nL - Learn words from vocab files\nA - Add words to Diary\nT - Test your vocabulary\nM - Modify Diary\nS - Show Achievements\nE - Exit\nYour choice: ")).lower().strip()
+                "\nWhat would you like to do?\nL - Learn words from vocab files\nA - Add words to Diary\nT - Test your vocabulary\nM - Modify Diary\nF - Find words in all files\nS - Show Achievements\nE - Exit\nYour choice: ")).lower().strip()
 
             if action is None:
                 continue
 
-            if action == 'a':
-                diary_words.add_words()
-
-            elif action == 't':
-                tester.test_choice()
-                '''
-                correct_results, total_questions = tester.test_choice()
-                if correct_results:
-                    add_to_diary = input(
-                        "\nDo you want to add the correct answers to your Diary? (Y/N): ").strip().upper()
-                    if add_to_diary == 'Y':
-                        diary_words.add_from_test(correct_results)
-
-                score_percent = (len(correct_results) / total_questions * 100) if total_questions > 0 else 0
-                self.score_manager.add_score(score_percent, total_questions)
-                '''
-
-            elif action == 'l':
-                learner = Learn()
-                learner.learn_choice()
-
-            elif action == 'm':
-                mod = Modification()
-                while True:
-                    modify_choice = check_char_input(input(
-                        "\nD - Delete a word\nU - Update a word\nR - Undo last change\nE - Exit Modify\nYour choice: ")).lower().strip()
-                    if modify_choice is None:
-                        continue
-                    if modify_choice == 'd':
-                        word_to_delete = check_char_input(input("Enter the English word to delete: "))
-                        if word_to_delete:
-                            mod.delete_word(word_to_delete)
-                    elif modify_choice == 'u':
-                        word_to_update = check_char_input(input("Enter the English word to update: "))
-                        if word_to_update:
-                            new_german = input("Enter new German translation (leave blank to skip): ").strip() or None
-                            new_class = input("Enter new Word Class (leave blank to skip): ").strip() or None
-                            new_tenses = input("Enter new Verb Tenses (comma-separated, leave blank to skip): ").strip()
-                            new_tenses = new_tenses.split(",") if new_tenses else None
-                            mod.update_word(word_to_update, new_german, new_class, new_tenses)
-                    elif modify_choice == 'r':
-                        mod.undo_last_change()
-                    elif modify_choice == 'e':
-                        break
-                    else:
-                        print("Invalid input. Please try again.")
+            # Each action is one timing run (see vocab_core.timing), time spent waiting for input included
+            with timing.run(ACTION_LABELS.get(action, "Console")):
+                if action in ('a', 'm') and diary_words is None:
+                    diary_words = Words()
+
+                if action == 'a':
+                    diary_words.add_words()
+
+                elif action == 't':
+                    tester.test_choice()
+                    '''
+                    correct_results, total_questions = tester.test_choice()
+                    if correct_results:
+                        add_to_diary = input(
+                            "\nDo you want to add the correct answers to your Diary? (Y/N): ").strip().upper()
+                        if add_to_diary == 'Y':
+                            diary_words.add_from_test(correct_results)
+
+                    score_percent = (len(correct_results) / total_questions * 100) if total_questions > 0 else 0
+                    self.score_manager.add_score(score_percent, total_questions)
+                    '''
+
+                elif action == 'l':
+                    learner = Learn()
+                    learner.learn_choice()
+
+                elif action == 'm':
+                    mod = Modification(diary_words)
+                    enable_autocomplete(decks=[os.path.basename(diary_words.diary_path)])  # Tab completes diary words
+                    while True:
+                        modify_choice = check_char_input(input(
+                            "\nD - Delete a word\nU - Update a word\nR - Undo last change\nY - Redo last undone change\nE - Exit Modify\nYour choice: ")).lower().strip()
+                        if modify_choice is None:
+                            continue
+                        if modify_choice == 'd':
+                            word_to_delete = check_char_input(input("Enter the English word to delete: "))
+                            if word_to_delete:
+                                mod.delete_word(word_to_delete)
+                        elif modify_choice == 'u':
+                            word_to_update = check_char_input(input("Enter the English word to update: "))
+                            if word_to_update:
+                                new_german = input("Enter new German translation (leave blank to skip): ").strip() or None
+                                new_class = input("Enter new Word Class (leave blank to skip): ").strip() or None
+                                new_tenses = input("Enter new Verb Tenses (comma-separated, leave blank to skip): ").strip()
+                                new_tenses = new_tenses.split(",") if new_tenses else None
+                                mod.update_word(word_to_update, new_german, new_class, new_tenses)
+                        elif modify_choice == 'r':
+                            mod.undo_last_change()
+                        elif modify_choice == 'y':
+                            mod.redo_last_change()
+                        elif modify_choice == 'e':
+                            disable_autocomplete()
+                            break
+                        else:
+                            print("Invalid input. Please try again.")
+
+                elif action == 'f':
+                    enable_autocomplete()
+                    query = input("Enter a word or part of a word (English or German, Tab completes): ").strip()
+                    disable_autocomplete()
+                    if query:
+                        results = find_words(query)
+                        if results.empty:
+                            print(f"No words found for '{query}'.")
+                        else:
+                            print(results.drop(columns=['row', 'match']).to_string(index=False))
 
-            elif action == 's':
-                self.score_manager.show_achievements()
+                elif action == 's':
+                    self.score_manager.show_achievements()
 
-            elif action == 'e':
-                print("\nThank you for using the German Vocabulary Game! Goodbye!")
-                exit()
+                elif action == 'e':
+                    print("\nThank you for using the German Vocabulary Game! Goodbye!")
+                    exit()
 
-            else:
-                print("Invalid input. Please enter A, T, M, S, or E.")
+                else:
+                    print("Invalid input. Please enter L, A, T, M, F, S, or E.")
 
 # ----------------- Main -----------------
 def main():
     """
     Entry point of the program.
     """
+    if timing.enabled():
+        # VOCAB_TIMING=1: print where the time went when the game ends
+        atexit.register(lambda: print("\n" + timing.report()))
     game = Gameplay()
     game.welcome()
 